@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.accounts'
-    verbose_name = "User Accounts"
\ No newline at end of file
+    verbose_name = "User Accounts"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,15 +1,39 @@
 import jwt
+import time
+import hashlib
 import logging
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
 from apps.common.utils.responses import ResponseMessages
+from apps.common.utils.cache import LocalTTLCache
+from .cache import get_cached_user, build_user_from_claims, is_user_disabled
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Verified token payloads keyed by token digest, each kept until the token's exp
+token_cache = LocalTTLCache(maxsize=getattr(settings, 'JWT_DECODE_CACHE_SIZE', 50000))
+
+
+def decode_token(token):
+    """Decode and verify a JWT, reusing the payload of an already verified token"""
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+
+    exp = payload.get('exp')
+    if exp is not None:
+        # The entry dies with the token, so expired tokens always hit jwt.decode again
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return dict(payload)
+
 
 class JWTCookieAuthentication(BaseAuthentication):
     """Custom JWT authentication using cookies"""
@@ -23,12 +47,16 @@ class JWTCookieAuthentication(BaseAuthentication):
             
         try:
             # Decode and validate token
-            payload = jwt.decode(
-                access_token,
-                settings.SECRET_KEY,
-                algorithms=['HS256']
-            )
-            user = User.objects.get(id=payload['user_id'])
+            payload = decode_token(access_token)
+            if (getattr(settings, 'JWT_CLAIMS_ONLY_AUTH', False) and payload.get('type') == 'access'
+                    and request.method in SAFE_METHODS):
+                # Trust the signed claims and skip the users table; writes and
+                # password checks below always get the real row
+                if is_user_disabled(payload['user_id']):
+                    raise AuthenticationFailed(ResponseMessages.ACCOUNT_DISABLED)
+                return (build_user_from_claims(payload), access_token)
+
+            user = get_cached_user(payload['user_id'])
             
             if not user.is_active:
                 logger.warning(f"Disabled user attempted login: {user.email}")
@@ -60,11 +88,7 @@ class JWTCookieAuthentication(BaseAuthentication):
         """Attempt to refresh expired access token"""
         try:
             # Validate refresh token
-            refresh_payload = jwt.decode(
-                refresh_token,
-                settings.SECRET_KEY,
-                algorithms=['HS256']
-            )
+            refresh_payload = decode_token(refresh_token)
             
             user = User.objects.get(id=refresh_payload['user_id'])
             
@@ -95,6 +119,7 @@ class JWTCookieAuthentication(BaseAuthentication):
         payload = {
             'user_id': str(user.id),
             'email': user.email,
+            'is_staff': user.is_staff,
             'exp': datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_LIFETIME),
             'iat': datetime.now(),
             'type': 'access'
@@ -121,10 +146,12 @@ class AuthenticationService:
     @staticmethod
     def generate_token_pair(user):
         """Generate access and refresh token pair"""
+        active_role = user.get_active_role()
         access_payload = {
             'user_id': str(user.id),
             'email': user.email,
-            'role': user.get_active_role().role.name if user.get_active_role() else None,
+            'role': active_role.role.name if active_role else None,
+            'is_staff': user.is_staff,
             'exp': datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_LIFETIME),
             'iat': datetime.utcnow(),
             'type': 'access'
@@ -178,7 +205,7 @@ class AuthenticationService:
     def validate_token(token, token_type='access'):
         """Validate JWT token"""
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+            payload = decode_token(token)
             
             if payload.get('type') != token_type:
                 return None, ResponseMessages.TOKEN_INVALID
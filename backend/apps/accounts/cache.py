@@ -0,0 +1,112 @@
+import copy
+import logging
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.common.utils.cache import LocalTTLCache, VersionStamp
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Process-local cache of authenticated users, keyed by user id
+user_cache = LocalTTLCache(maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 10000))
+# Process-local copies of the shared disabled flags read by claims-only requests
+disabled_cache = LocalTTLCache(maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 10000))
+# Bumped whenever a user is disabled or enabled again, so other processes drop both caches
+disabled_version = VersionStamp('accounts:disabled:version')
+_seen_disabled_version = None
+
+
+def _drop_stale_users():
+    """Empty this process's caches if a user was disabled or enabled anywhere since they were filled"""
+    global _seen_disabled_version
+    version = disabled_version.get(max_age=settings.JWT_DISABLED_CHECK_INTERVAL)
+    if version != _seen_disabled_version:
+        user_cache.clear()
+        disabled_cache.clear()
+        _seen_disabled_version = version
+
+
+def get_cached_user(user_id):
+    """Return the user for user_id, loading it from the database on a cache miss"""
+    ttl = getattr(settings, 'JWT_USER_CACHE_TTL', 0)
+    _drop_stale_users()
+    key = str(user_id)
+
+    if ttl:
+        user = user_cache.get(key)
+        if user is not None:
+            # Hand out a copy so per-request state never leaks between requests
+            return copy.copy(user)
+
+    user = User.objects.get(id=user_id)
+
+    if ttl:
+        user_cache.set(key, user, ttl=ttl)
+        return copy.copy(user)
+    return user
+
+
+def invalidate_user(user_id):
+    """Evict a user from the cache (called when the user or its roles change)"""
+    if user_id is None:
+        return
+    user_cache.delete(str(user_id))
+    logger.debug(f"Evicted cached user: {user_id}")
+
+
+def _disabled_key(user_id):
+    return f'accounts:disabled:{user_id}'
+
+
+def mark_user_disabled(user_id, disabled):
+    """
+    Record in the shared cache that a user was deactivated (or deleted), for as
+    long as an access token issued before that can live. Claims-only requests
+    never read the users table, so this is how they learn about it; bumping
+    disabled_version makes every process drop its cached users as well.
+    """
+    if disabled:
+        cache.set(_disabled_key(user_id), True, timeout=settings.JWT_ACCESS_TOKEN_LIFETIME * 60)
+    elif not cache.delete(_disabled_key(user_id)):
+        return  # the usual case: an active user was saved
+    disabled_version.bump()
+
+
+def is_user_disabled(user_id):
+    """The shared disabled flag, read once per process until a user is disabled or enabled again"""
+    _drop_stale_users()
+    key = str(user_id)
+    disabled = disabled_cache.get(key)
+    if disabled is None:
+        disabled = cache.get(_disabled_key(user_id), False)
+        disabled_cache.set(key, disabled, ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 0) or None)
+    return disabled
+
+
+def build_user_from_claims(payload):
+    """
+    Build a lightweight, unsaved-looking user from access token claims.
+
+    It carries only the id, email and staff flag; authentication hands it out
+    for safe methods only, and views that show other fields use full_user().
+    """
+    user = User(
+        id=payload['user_id'],
+        email=payload.get('email', ''),
+        username=payload.get('email', ''),
+        is_staff=payload.get('is_staff', False),
+        is_active=True,
+    )
+    # Mark the instance as loaded so relations and FK filters treat it as persisted
+    user._state.adding = False
+    user._state.db = 'default'
+    user._from_claims = True
+    return user
+
+
+def full_user(user):
+    """The complete user row behind a claims-only user, or the user itself"""
+    if getattr(user, '_from_claims', False):
+        return get_cached_user(user.pk)
+    return user
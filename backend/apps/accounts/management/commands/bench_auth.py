@@ -0,0 +1,62 @@
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.accounts.authentication import AuthenticationService, decode_token, token_cache
+from apps.accounts.cache import user_cache
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cookie JWT authentication with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+
+        with rolled_back():
+            user = User.objects.create_user(email='bench-auth@example.com', password='password123')
+            access_token, _ = AuthenticationService.generate_token_pair(user)
+
+            client = APIClient(SERVER_NAME='localhost')
+            client.cookies['access_token'] = access_token
+
+            def hit():
+                response = client.get('/api/v1/auth/me/')
+                assert response.status_code == 200, response.status_code
+
+            scenarios = [
+                ('no user cache (before)', {'JWT_USER_CACHE_TTL': 0, 'JWT_CLAIMS_ONLY_AUTH': False}),
+                ('user cache (after)', {'JWT_USER_CACHE_TTL': 60, 'JWT_CLAIMS_ONLY_AUTH': False}),
+                ('claims-only', {'JWT_USER_CACHE_TTL': 60, 'JWT_CLAIMS_ONLY_AUTH': True}),
+            ]
+
+            self.stdout.write(f'GET /api/v1/auth/me/ x {iterations}')
+            for label, overrides in scenarios:
+                user_cache.clear()
+                token_cache.clear()
+                with override_settings(**overrides):
+                    result = measure(hit, iterations=iterations)
+                self.stdout.write(format_result(label, result))
+            self.stdout.write(f"token cache: {token_cache.stats()}")
+
+            self.stdout.write(f'Token decode x {iterations * 10}')
+            token_cache.clear()
+            result = measure(
+                lambda: jwt.decode(access_token, settings.SECRET_KEY, algorithms=['HS256']),
+                iterations=iterations * 10,
+            )
+            self.stdout.write(format_result('jwt.decode', result))
+            result = measure(lambda: decode_token(access_token), iterations=iterations * 10)
+            self.stdout.write(format_result('decode_token (cached)', result))
+            self.stdout.write(f"token cache: {token_cache.stats()}")
+
+            user_cache.clear()
+            token_cache.clear()
@@ -45,8 +45,11 @@ class UserRoleManager(models.Manager):
         
         # Create new role assignment
         user_role = self.create(user=user, role=role, is_active=True)
+
+        # Refresh the memoized role on this instance; the user cache is evicted by signals
+        user._active_role_cache = user_role
         return user_role
     
     def get_active_role(self, user):
         """Get user's active role"""
-        return self.filter(user=user, is_active=True).first()
+        return self.select_related('role').filter(user=user, is_active=True).first()
@@ -46,8 +46,17 @@ class User(AbstractUser, UUIDMixin, TimestampMixin):
         return self.is_email_verified or self.is_phone_verified
 
     def get_active_role(self):
-        """Get the user's primary active role"""
-        return self.user_roles.filter(is_active=True).first()
+        """Get the user's primary active role, resolved once per user instance (i.e. per request)"""
+        try:
+            return self._active_role_cache
+        except AttributeError:
+            pass
+        self._active_role_cache = self.user_roles.select_related('role').filter(is_active=True).first()
+        return self._active_role_cache
+
+    def clear_active_role_cache(self):
+        """Forget the memoized active role so the next call re-reads it"""
+        self.__dict__.pop('_active_role_cache', None)
     
     def get_full_name(self):
         """Return the user's full name"""
@@ -0,0 +1,63 @@
+import time
+import logging
+import threading
+from types import MappingProxyType
+from django.conf import settings
+from apps.common.utils import VersionStamp
+
+logger = logging.getLogger(__name__)
+
+# Shared by every process when the cache backend is (see CACHES) and read at most
+# every PERMISSION_MATRIX_VERSION_CHECK_INTERVAL seconds. A process-local backend
+# cannot see other processes' bumps, which is why a matrix is also rebuilt after
+# PERMISSION_MATRIX_MAX_AGE.
+matrix_version = VersionStamp('accounts:permission_matrix:version')
+
+
+class PermissionMatrix:
+    """Immutable (role, resource, action) -> access level lookup table"""
+
+    __slots__ = ('version', 'levels', 'built_at')
+
+    def __init__(self, version, levels):
+        self.version = version
+        self.levels = MappingProxyType(dict(levels))
+        self.built_at = time.monotonic()
+
+    def is_fresh(self, version):
+        """Whether this matrix may still answer checks at the given version stamp"""
+        return self.version == version and time.monotonic() - self.built_at < settings.PERMISSION_MATRIX_MAX_AGE
+
+    def access_level(self, role_id, resource, action):
+        """Return the access level granted to role_id, or None"""
+        return self.levels.get((role_id, resource, action))
+
+    @classmethod
+    def build(cls, version):
+        """Compile the matrix from RolePermission/Permission rows"""
+        from .models import RolePermission
+
+        rows = RolePermission.objects.values_list(
+            'role_id', 'permission__resource_type', 'permission__action', 'access_level'
+        )
+        levels = {(role_id, resource, action): level for role_id, resource, action, level in rows}
+        logger.debug(f"Permission matrix compiled: {len(levels)} entries (version {version})")
+        return cls(version, levels)
+
+
+_matrix = None
+_build_lock = threading.Lock()
+
+
+def get_permission_matrix():
+    """Return the compiled matrix, rebuilding it when the version changed or it got too old"""
+    global _matrix
+    version = matrix_version.get(max_age=settings.PERMISSION_MATRIX_VERSION_CHECK_INTERVAL)
+    matrix = _matrix
+    if matrix is not None and matrix.is_fresh(version):
+        return matrix
+
+    with _build_lock:
+        if _matrix is None or not _matrix.is_fresh(version):
+            _matrix = PermissionMatrix.build(version)
+        return _matrix
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth import get_user_model
+from .models import UserRole, Permission, RolePermission
+from .cache import invalidate_user, mark_user_disabled
+from .permission_matrix import matrix_version
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def evict_cached_user(sender, instance, signal, **kwargs):
+    """Drop the cached copy whenever the user row changes"""
+    invalidate_user(instance.pk)
+    mark_user_disabled(instance.pk, signal is post_delete or not instance.is_active)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def evict_cached_user_on_role_change(sender, instance, **kwargs):
+    """Drop the cached user whenever one of its role assignments changes"""
+    invalidate_user(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Permission)
+@receiver([post_save, post_delete], sender=RolePermission)
+def invalidate_permission_matrix(sender, instance, **kwargs):
+    """Bump the matrix version now and again once the change is committed"""
+    matrix_version.bump_on_commit()
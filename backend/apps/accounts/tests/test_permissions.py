@@ -1,6 +1,8 @@
-from django.test import TestCase
+from django.conf import settings
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from apps.accounts.models import Role, UserRole, Permission, RolePermission
+from apps.accounts.permission_matrix import get_permission_matrix
 from apps.common.permissions import IsAuthenticatedAndVerified, HasModelPermission
 
 User = get_user_model()
@@ -69,3 +71,68 @@ class PermissionTests(TestCase):
         ).exists()
         
         self.assertFalse(has_perm)
+
+
+class PermissionMatrixTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='matrix@example.com',
+            password='StrongPassword123!',
+            is_email_verified=True
+        )
+        self.role = Role.objects.create(
+            name=Role.RoleName.RESTAURANT_ADMIN,
+            role_type=Role.RoleType.RESTAURANT
+        )
+        self.permission = Permission.objects.create(
+            name='Read Restaurant',
+            resource_type='RESTAURANT',
+            action='READ'
+        )
+        self.role_permission = RolePermission.objects.create(
+            role=self.role,
+            permission=self.permission,
+            access_level='READ_ONLY'
+        )
+        self.user_role = UserRole.objects.create(user=self.user, role=self.role, is_active=True)
+
+    @override_settings(CACHES=settings.SHARED_CACHES)
+    def test_matrix_lookup_runs_no_queries(self):
+        """A warm matrix answers permission checks without touching the database, cache table included"""
+        check = HasModelPermission().check_permission
+        check(self.user_role, 'RESTAURANT', 'READ')
+
+        with self.assertNumQueries(0):
+            self.assertTrue(check(self.user_role, 'RESTAURANT', 'READ'))
+            self.assertFalse(check(self.user_role, 'RESTAURANT', 'DELETE'))
+
+    def test_matrix_is_immutable(self):
+        matrix = get_permission_matrix()
+        with self.assertRaises(TypeError):
+            matrix.levels[(self.role.id, 'RESTAURANT', 'DELETE')] = 'FULL'
+
+    def test_matrix_expires_without_a_version_bump(self):
+        """Another process's change is picked up even if its bump never reaches this process"""
+        matrix = get_permission_matrix()
+        self.assertIs(get_permission_matrix(), matrix)
+        with override_settings(PERMISSION_MATRIX_MAX_AGE=0):
+            self.assertIsNot(get_permission_matrix(), matrix)
+
+    def test_role_permission_change_bumps_version(self):
+        """Changing a RolePermission row is visible to the next check"""
+        check = HasModelPermission().check_permission
+        version = get_permission_matrix().version
+        self.assertTrue(check(self.user_role, 'RESTAURANT', 'READ'))
+
+        self.role_permission.access_level = 'NONE'
+        self.role_permission.save()
+
+        self.assertNotEqual(get_permission_matrix().version, version)
+        self.assertFalse(check(self.user_role, 'RESTAURANT', 'READ'))
+
+    def test_permission_delete_bumps_version(self):
+        check = HasModelPermission().check_permission
+        self.assertTrue(check(self.user_role, 'RESTAURANT', 'READ'))
+
+        self.permission.delete()
+        self.assertFalse(check(self.user_role, 'RESTAURANT', 'READ'))
@@ -0,0 +1,78 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from apps.accounts.authentication import AuthenticationService
+from apps.accounts.cache import user_cache
+from apps.accounts.models import Role, UserRole, Permission, RolePermission
+from apps.accounts.serializers import UserProfileSerializer
+from apps.common.permissions import HasModelPermission, IsObjectOwnerOrRolePermission
+
+User = get_user_model()
+
+
+class ProfileProbeView(APIView):
+    """Exercises auth, both permission classes and the profile serializer in one request"""
+    permission_classes = [HasModelPermission, IsObjectOwnerOrRolePermission]
+    permission_resource = 'USER_PROFILE'
+
+    def get(self, request):
+        self.check_object_permissions(request, request.user)
+        return Response(UserProfileSerializer(request.user).data)
+
+
+@override_settings(JWT_USER_CACHE_TTL=60, JWT_CLAIMS_ONLY_AUTH=False)
+class ActiveRoleMemoizationTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(email='memo@example.com', password='StrongPassword123!')
+        self.role = Role.objects.create(name=Role.RoleName.CUSTOMER, role_type=Role.RoleType.PLATFORM)
+        permission = Permission.objects.create(name='Read Profile', resource_type='USER_PROFILE', action='READ')
+        RolePermission.objects.create(role=self.role, permission=permission, access_level='FULL')
+        UserRole.objects.create(user=self.user, role=self.role, is_active=True)
+
+        access_token, _ = AuthenticationService.generate_token_pair(self.user)
+        self.cookies = {'access_token': access_token}
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def get(self):
+        request = self.factory.get('/probe/')
+        request.COOKIES.update(self.cookies)
+        return ProfileProbeView.as_view()(request)
+
+    def test_active_role_resolved_once_per_request(self):
+        """Auth, both permission classes and the serializer share a single role lookup"""
+        self.get()  # warm the user cache and the permission matrix
+
+        with self.assertNumQueries(1):
+            response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['active_role']['name'], Role.RoleName.CUSTOMER)
+
+    def test_memo_does_not_leak_between_requests(self):
+        self.get()
+        UserRole.objects.filter(user=self.user).update(is_active=False)
+        user_cache.clear()
+
+        response = self.get()
+        self.assertEqual(response.status_code, 403)
+
+    def test_generate_token_pair_reads_role_once(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            AuthenticationService.generate_token_pair(user)
+
+    def test_assign_role_refreshes_memo(self):
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.get_active_role().role, self.role)
+
+        admin_role = Role.objects.create(name=Role.RoleName.SUPER_ADMIN, role_type=Role.RoleType.SYSTEM)
+        UserRole.objects.assign_role(user, admin_role)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.get_active_role().role.name, Role.RoleName.SUPER_ADMIN)
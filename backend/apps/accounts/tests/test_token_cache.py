@@ -0,0 +1,47 @@
+import jwt
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.test import SimpleTestCase
+from apps.accounts.authentication import decode_token, token_cache
+
+
+class TokenCacheTests(SimpleTestCase):
+    def setUp(self):
+        token_cache.clear()
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def make_token(self, **delta):
+        payload = {
+            'user_id': 'abc',
+            'type': 'access',
+            'exp': datetime.utcnow() + timedelta(**delta),
+        }
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+
+    def test_repeated_decode_hits_cache(self):
+        token = self.make_token(minutes=15)
+        first = decode_token(token)
+        second = decode_token(token)
+
+        self.assertEqual(first, second)
+        self.assertEqual(token_cache.hits, 1)
+        self.assertEqual(token_cache.misses, 1)
+
+    def test_cached_payload_is_not_shared(self):
+        token = self.make_token(minutes=15)
+        decode_token(token)['user_id'] = 'tampered'
+        self.assertEqual(decode_token(token)['user_id'], 'abc')
+
+    def test_expired_token_is_rejected_and_not_cached(self):
+        token = self.make_token(minutes=-1)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            decode_token(token)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_invalid_signature_is_rejected(self):
+        token = jwt.encode({'user_id': 'abc'}, 'not-the-secret', algorithm='HS256')
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_token(token)
+        self.assertEqual(len(token_cache), 0)
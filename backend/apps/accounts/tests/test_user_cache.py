@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.accounts.authentication import AuthenticationService
+from apps.accounts.cache import disabled_cache, disabled_version, user_cache, get_cached_user
+from apps.accounts.models import Role, UserRole
+
+User = get_user_model()
+
+
+@override_settings(JWT_USER_CACHE_TTL=60, JWT_CLAIMS_ONLY_AUTH=False)
+class UserCacheTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        disabled_cache.clear()
+        self.client = APIClient()
+        self.profile_url = '/api/v1/auth/me/'
+        self.user = User.objects.create_user(
+            email='cached@example.com',
+            password='StrongPassword123!',
+            first_name='Cached'
+        )
+        access_token, _ = AuthenticationService.generate_token_pair(self.user)
+        self.client.cookies['access_token'] = access_token
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def test_repeated_requests_reuse_cached_user(self):
+        """Only the first request should load the user row"""
+        self.client.get(self.profile_url)
+
+        with self.assertNumQueries(1):  # active role lookup only
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cache_returns_copies(self):
+        """Mutating a cached user must not leak into the next lookup"""
+        first = get_cached_user(self.user.id)
+        first.first_name = 'Changed'
+        second = get_cached_user(self.user.id)
+        self.assertEqual(second.first_name, 'Cached')
+
+    def test_user_save_evicts_cache(self):
+        """Deactivating a user takes effect on the next request"""
+        self.client.get(self.profile_url)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_role_change_evicts_cache(self):
+        get_cached_user(self.user.id)
+        self.assertEqual(len(user_cache), 1)
+
+        role = Role.objects.create(name=Role.RoleName.CUSTOMER, role_type=Role.RoleType.PLATFORM)
+        UserRole.objects.assign_role(self.user, role)
+        self.assertEqual(len(user_cache), 0)
+
+    @override_settings(JWT_USER_CACHE_TTL=0)
+    def test_cache_disabled(self):
+        get_cached_user(self.user.id)
+        self.assertEqual(len(user_cache), 0)
+
+    @override_settings(JWT_CLAIMS_ONLY_AUTH=True, CACHES=settings.SHARED_CACHES)
+    def test_claims_only_mode_skips_users_table(self):
+        self.client.get('/api/v1/cart/')
+        with self.assertNumQueries(2):  # the cart and its lines: no users row, no cache table read
+            response = self.client.get('/api/v1/cart/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(user_cache), 0)
+
+    @override_settings(JWT_CLAIMS_ONLY_AUTH=True)
+    def test_claims_only_mode_loads_the_row_for_profile_and_writes(self):
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['data']['email'], 'cached@example.com')
+        self.assertEqual(response.data['data']['first_name'], 'Cached')
+
+        response = self.client.patch(self.profile_url, {'first_name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'Renamed')
+
+        response = self.client.patch('/api/v1/auth/me/password/', {
+            'old_password': 'StrongPassword123!',
+            'new_password': 'EvenStronger456!',
+            'new_password_confirm': 'EvenStronger456!',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(JWT_CLAIMS_ONLY_AUTH=True)
+    def test_claims_only_mode_rejects_deactivated_users(self):
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get('/api/v1/cart/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_active = True
+        self.user.save()
+        response = self.client.get('/api/v1/cart/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def deactivate_elsewhere(self):
+        """What another process's deactivation leaves behind: the row and the shared keys, no local eviction"""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.set(f'accounts:disabled:{self.user.pk}', True)
+        cache.incr(disabled_version.key)
+
+    @override_settings(JWT_DISABLED_CHECK_INTERVAL=0)
+    def test_deactivation_in_another_process_drops_cached_users(self):
+        self.client.get(self.profile_url)
+        self.deactivate_elsewhere()
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(JWT_CLAIMS_ONLY_AUTH=True, JWT_DISABLED_CHECK_INTERVAL=0)
+    def test_deactivation_in_another_process_reaches_claims_only_requests(self):
+        self.assertEqual(self.client.get('/api/v1/cart/').status_code, status.HTTP_200_OK)
+        self.deactivate_elsewhere()
+        response = self.client.get('/api/v1/cart/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
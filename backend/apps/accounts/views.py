@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 
 from apps.common.utils import APIResponse, ResponseMessages
 from .authentication import AuthenticationService
+from .cache import full_user
 from .serializers import (
     UserRegistrationSerializer, 
     UserUpdateSerializer, 
@@ -119,7 +120,7 @@ class ProfileView(APIView):
     
     def get(self, request):
         """Get user profile"""
-        serializer = UserProfileSerializer(request.user)
+        serializer = UserProfileSerializer(full_user(request.user))
 
         return APIResponse.success(
             message=ResponseMessages.PROFILE_RETRIEVED,
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.cart.models import Cart
+
+
+class Command(BaseCommand):
+    help = 'Report carts whose stored item_count/subtotal drifted from their lines, optionally fixing them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Recompute the totals of drifted carts')
+        parser.add_argument('--limit', type=int, default=20, help='Drifted carts to list')
+
+    def handle(self, *args, **options):
+        drifted = Cart.objects.drifted().order_by('pk')
+        total = drifted.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS('All cart totals match their lines'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'{total} cart(s) drifted'))
+        for cart in drifted[:options['limit']]:
+            self.stdout.write(
+                f'  cart {cart.pk}: items {cart.item_count} != {cart.computed_item_count} '
+                f'or subtotal {cart.subtotal} != {cart.computed_subtotal}'
+            )
+
+        if options['fix']:
+            fixed = Cart.objects.filter(pk__in=drifted.values('pk')).recalculate_totals()
+            self.stdout.write(self.style.SUCCESS(f'Recalculated {fixed} cart(s)'))
@@ -0,0 +1,188 @@
+from decimal import Decimal
+from django.db import connection, models, transaction
+from django.db.models import DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Round
+from django.utils import timezone
+
+# Single-statement upsert; SQLite (3.35+) and PostgreSQL share this syntax
+UPSERT_SQL = """
+    INSERT INTO {table} (cart_id, menu_item_id, quantity, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (cart_id, menu_item_id) DO UPDATE
+    SET quantity = {table}.quantity + excluded.quantity, updated_at = excluded.updated_at
+    RETURNING id, quantity
+"""
+
+
+class CartQuerySet(models.QuerySet):
+    """Maintenance of the stored item_count/subtotal columns"""
+
+    def apply_delta(self, count_delta, subtotal_delta):
+        """Shift the stored totals in place; used inside the transaction that changed the lines"""
+        return self.update(
+            item_count=F('item_count') + count_delta,
+            subtotal=F('subtotal') + subtotal_delta,
+            updated_at=timezone.now(),
+            version=F('version') + 1,
+        )
+
+    def _lines(self):
+        return self.model._meta.get_field('items').related_model.objects
+
+    def containing_item(self, menu_item_id):
+        return self.filter(pk__in=self._lines().filter(menu_item_id=menu_item_id).values('cart_id'))
+
+    def _line_totals(self):
+        lines = self._lines().filter(cart=OuterRef('pk')).order_by().values('cart')
+        count = Subquery(lines.annotate(total=Sum('quantity')).values('total'), output_field=IntegerField())
+        subtotal = Subquery(
+            lines.annotate(total=Sum(F('quantity') * F('menu_item__price'))).values('total'),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+        return Coalesce(count, 0), Coalesce(subtotal, Decimal('0.00'), output_field=DecimalField())
+
+    def with_computed_totals(self):
+        """Annotate the totals recomputed from the cart lines"""
+        count, subtotal = self._line_totals()
+        return self.annotate(computed_item_count=count, computed_subtotal=subtotal)
+
+    def drifted(self):
+        """Carts whose stored totals disagree with their lines"""
+        # Rounded on both sides: SQLite does decimal arithmetic in floating point
+        return self.with_computed_totals().alias(
+            subtotal_rounded=Round('subtotal', 2),
+            computed_subtotal_rounded=Round('computed_subtotal', 2),
+        ).filter(
+            ~Q(item_count=F('computed_item_count')) | ~Q(subtotal_rounded=F('computed_subtotal_rounded'))
+        )
+
+    def recalculate_totals(self):
+        """Recompute the stored totals from the lines in a single UPDATE"""
+        count, subtotal = self._line_totals()
+        return self.update(
+            item_count=count, subtotal=Round(subtotal, 2), updated_at=timezone.now(), version=F('version') + 1
+        )
+
+
+class CartItemManager(models.Manager):
+    """
+    Manager for cart lines; every write also moves the cart's stored totals.
+
+    Writers lock the cart row before any of its lines, as checkout does, so a
+    checkout holding the cart sees no half-applied change and never deadlocks.
+    """
+
+    def _carts(self):
+        return self.model._meta.get_field('cart').related_model.objects
+
+    def _lock_cart(self, cart_id):
+        list(self._carts().select_for_update().filter(pk=cart_id).values_list('pk'))
+
+    def add_quantity(self, cart_id, menu_item_id, quantity, unit_price):
+        """
+        Atomically insert a cart line or increment the existing one.
+
+        Returns (id, new_quantity, created). Concurrent adds of the same item
+        never lose an increment or trip the (cart, menu_item) unique constraint.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            # The totals update comes first: it is what locks the cart row
+            self._carts().filter(pk=cart_id).apply_delta(quantity, unit_price * quantity)
+            if connection.vendor in ('sqlite', 'postgresql'):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        UPSERT_SQL.format(table=connection.ops.quote_name(self.model._meta.db_table)),
+                        [cart_id, menu_item_id, quantity, now, now],
+                    )
+                    line_id, new_quantity = cursor.fetchone()
+                # An existing line always ends up above the requested quantity
+                created = new_quantity == quantity
+            else:
+                line, created = self.get_or_create(
+                    cart_id=cart_id, menu_item_id=menu_item_id, defaults={'quantity': quantity}
+                )
+                if not created:
+                    self.filter(pk=line.pk).update(quantity=F('quantity') + quantity, updated_at=now)
+                    line.refresh_from_db(fields=['quantity'])
+                line_id, new_quantity = line.pk, line.quantity
+        return line_id, new_quantity, created
+
+    def set_quantity(self, line, quantity):
+        """Set a line's quantity and move the cart totals by the difference"""
+        with transaction.atomic():
+            self._lock_cart(line.cart_id)
+            previous = self.select_for_update().values_list('quantity', flat=True).get(pk=line.pk)
+            self.filter(pk=line.pk).update(quantity=quantity, updated_at=timezone.now())
+            delta = quantity - previous
+            self._carts().filter(pk=line.cart_id).apply_delta(delta, line.menu_item.price * delta)
+        line.quantity = quantity
+        return line
+
+    def remove_lines(self, cart_id, lines):
+        """Delete the given lines of one cart and take them out of its totals"""
+        with transaction.atomic():
+            self._lock_cart(cart_id)
+            # Re-read under lock so the totals move by exactly what gets deleted
+            removed = list(
+                self.select_for_update(of=('self',))
+                .filter(cart_id=cart_id, id__in=[line.id for line in lines])
+                .values_list('quantity', 'menu_item__price')
+            )
+            self.filter(cart_id=cart_id, id__in=[line.id for line in lines]).delete()
+            self._carts().filter(pk=cart_id).apply_delta(
+                -sum(quantity for quantity, _ in removed),
+                -sum((quantity * price for quantity, price in removed), Decimal('0.00')),
+            )
+
+    def apply_batch(self, cart_id, operations, prices):
+        """
+        Apply add/set/remove operations to one cart in a single transaction.
+
+        operations are (op, menu_item_id, quantity) tuples applied in order;
+        prices maps menu_item_id to unit price. Each affected line is written
+        at most once and the cart totals move by the net difference.
+        """
+        menu_item_ids = {menu_item_id for _, menu_item_id, _ in operations}
+        now = timezone.now()
+        with transaction.atomic():
+            self._lock_cart(cart_id)
+            existing = {
+                line.menu_item_id: line
+                for line in self.select_for_update().filter(cart_id=cart_id, menu_item_id__in=menu_item_ids)
+                .only('id', 'menu_item_id', 'quantity')
+            }
+            quantities = {menu_item_id: line.quantity for menu_item_id, line in existing.items()}
+            for op, menu_item_id, quantity in operations:
+                if op == 'add':
+                    quantities[menu_item_id] = quantities.get(menu_item_id, 0) + quantity
+                elif op == 'set':
+                    quantities[menu_item_id] = quantity
+                else:
+                    quantities[menu_item_id] = 0
+
+            created, updated, removed = [], [], []
+            count_delta, subtotal_delta = 0, Decimal('0.00')
+            for menu_item_id, quantity in quantities.items():
+                line = existing.get(menu_item_id)
+                previous = line.quantity if line else 0
+                if quantity == previous:
+                    continue
+                count_delta += quantity - previous
+                subtotal_delta += prices[menu_item_id] * (quantity - previous)
+                if line is None:
+                    created.append(self.model(cart_id=cart_id, menu_item_id=menu_item_id, quantity=quantity))
+                elif quantity == 0:
+                    removed.append(line.id)
+                else:
+                    line.quantity, line.updated_at = quantity, now
+                    updated.append(line)
+
+            if created:
+                self.bulk_create(created)
+            if updated:
+                self.bulk_update(updated, ['quantity', 'updated_at'])
+            if removed:
+                self.filter(id__in=removed).delete()
+            if count_delta or subtotal_delta:
+                self._carts().filter(pk=cart_id).apply_delta(count_delta, subtotal_delta)
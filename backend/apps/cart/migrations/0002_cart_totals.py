@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:25
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Cart = apps.get_model('cart', 'Cart')
+    CartItem = apps.get_model('cart', 'CartItem')
+    lines = CartItem.objects.filter(cart=OuterRef('pk')).order_by().values('cart')
+    Cart.objects.update(
+        item_count=Coalesce(
+            Subquery(lines.annotate(total=Sum('quantity')).values('total'), output_field=IntegerField()), 0
+        ),
+        subtotal=Coalesce(
+            Subquery(
+                lines.annotate(total=Sum(F('quantity') * F('menu_item__price'))).values('total'),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+            Decimal('0.00'),
+            output_field=DecimalField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
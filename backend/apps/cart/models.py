@@ -1,18 +1,25 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from apps.restaurants.models import MenuItem
+from apps.common.mixins import VersionMixin
+from .managers import CartQuerySet, CartItemManager
 
-class Cart(models.Model):
+class Cart(VersionMixin):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='cart')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from the lines; kept in step by CartItemManager in the same transaction
+    item_count = models.PositiveIntegerField(default=0)
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    objects = CartQuerySet.as_manager()
 
     def __str__(self):
         return f"Cart for {self.user}"
 
     @property
     def total_price(self):
-        return sum(item.subtotal for item in self.items.all())
+        return self.subtotal
 
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
@@ -21,12 +28,41 @@ class CartItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartItemManager()
+
     class Meta:
         unique_together = ('cart', 'menu_item')
 
     def __str__(self):
         return f"{self.quantity} x {self.menu_item.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_quantity = instance.__dict__.get('quantity')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Save the line and move the cart totals by the quantity change"""
+        previous = 0 if self._state.adding else getattr(self, '_loaded_quantity', None)
+        with transaction.atomic():
+            if previous is None:
+                previous = CartItem.objects.filter(pk=self.pk).values_list('quantity', flat=True).first() or 0
+            # Totals first, so the cart row is locked before the line (see CartItemManager)
+            delta = self.quantity - previous
+            if delta:
+                Cart.objects.filter(pk=self.cart_id).apply_delta(delta, self.menu_item.price * delta)
+            super().save(*args, **kwargs)
+        self._loaded_quantity = self.quantity
+
+    def delete(self, *args, **kwargs):
+        """Delete the line and take it out of the cart totals"""
+        with transaction.atomic():
+            quantity = getattr(self, '_loaded_quantity', self.quantity)
+            Cart.objects.filter(pk=self.cart_id).apply_delta(-quantity, -self.menu_item.price * quantity)
+            result = super().delete(*args, **kwargs)
+        return result
+
     @property
     def subtotal(self):
         return self.menu_item.price * self.quantity
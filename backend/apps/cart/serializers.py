@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from apps.common.serializers import FlexFieldsModelSerializer
 from .models import Cart, CartItem
 from apps.restaurants.models import MenuItem
 
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(FlexFieldsModelSerializer):
     menu_item_name = serializers.ReadOnlyField(source='menu_item.name')
     menu_item_price = serializers.ReadOnlyField(source='menu_item.price')
     restaurant_name = serializers.ReadOnlyField(source='menu_item.menu.branch.restaurant.name')
@@ -12,15 +13,16 @@ class CartItemSerializer(serializers.ModelSerializer):
         model = CartItem
         fields = ['id', 'menu_item', 'menu_item_name', 'menu_item_price', 'restaurant_name', 'quantity', 'subtotal']
         read_only_fields = ['id', 'menu_item_name', 'menu_item_price', 'restaurant_name', 'subtotal']
+        field_relations = {'subtotal': ['menu_item']}
 
-class CartSerializer(serializers.ModelSerializer):
+class CartSerializer(FlexFieldsModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
     total_price = serializers.ReadOnlyField()
 
     class Meta:
         model = Cart
-        fields = ['id', 'items', 'total_price', 'updated_at']
-        read_only_fields = ['id', 'items', 'total_price', 'updated_at']
+        fields = ['id', 'items', 'item_count', 'subtotal', 'total_price', 'updated_at']
+        read_only_fields = ['id', 'items', 'item_count', 'subtotal', 'total_price', 'updated_at']
 
 class CartItemCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,3 +43,30 @@ class CartItemUpdateSerializer(serializers.ModelSerializer):
         if value < 1:
             raise serializers.ValidationError("Quantity must be at least 1")
         return value
+
+class CartOperationSerializer(serializers.Serializer):
+    OP_ADD = 'add'
+    OP_SET = 'set'
+    OP_REMOVE = 'remove'
+
+    op = serializers.ChoiceField(choices=[OP_ADD, OP_SET, OP_REMOVE])
+    menu_item = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, attrs):
+        if attrs['op'] != self.OP_REMOVE and 'quantity' not in attrs:
+            raise serializers.ValidationError({'quantity': "Quantity is required for add and set"})
+        return attrs
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartOperationSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_operations(self, operations):
+        """Resolve every referenced menu item with a single query"""
+        ids = {operation['menu_item'] for operation in operations}
+        menu_items = MenuItem.objects.only('id', 'price').in_bulk(ids)
+        missing = sorted(ids - menu_items.keys())
+        if missing:
+            raise serializers.ValidationError(f"Invalid menu items: {missing}")
+        self.context['menu_items'] = menu_items
+        return operations
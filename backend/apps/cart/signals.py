@@ -0,0 +1,62 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from apps.restaurants.models import MenuItem, Restaurant
+from .models import Cart
+
+# Menu item fields a cart renders or depends on; changing one changes the cart's ETag
+CART_ITEM_FIELDS = ('price', 'name', 'is_available')
+
+
+@receiver(pre_save, sender=MenuItem)
+def remember_previous_values(sender, instance, **kwargs):
+    """Note the stored values of CART_ITEM_FIELDS so post_save can tell which changed"""
+    if instance.pk is None or instance._state.adding:
+        instance._previous_cart_values = None
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(field in loaded for field in CART_ITEM_FIELDS):
+        instance._previous_cart_values = tuple(loaded[field] for field in CART_ITEM_FIELDS)
+    else:
+        instance._previous_cart_values = sender.objects.filter(pk=instance.pk).values_list(*CART_ITEM_FIELDS).first()
+
+
+@receiver(post_save, sender=MenuItem)
+def refresh_carts(sender, instance, created, **kwargs):
+    """Reprice the carts holding the item after a price change, or just bump their versions"""
+    previous = getattr(instance, '_previous_cart_values', None)
+    if created or previous is None:
+        return
+    price, name, is_available = previous
+    if price != instance.price:
+        Cart.objects.containing_item(instance.pk).recalculate_totals()
+    elif name != instance.name or is_available != instance.is_available:
+        Cart.bump_versions(items__menu_item=instance.pk)
+
+
+@receiver(pre_save, sender=Restaurant)
+def remember_previous_restaurant_name(sender, instance, **kwargs):
+    if instance.pk is None or instance._state.adding:
+        instance._previous_name = None
+        return
+    instance._previous_name = sender.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+
+
+@receiver(post_save, sender=Restaurant)
+def refresh_carts_for_restaurant(sender, instance, created, **kwargs):
+    """Carts show the restaurant name of each line"""
+    previous = getattr(instance, '_previous_name', None)
+    if not created and previous is not None and previous != instance.name:
+        Cart.bump_versions(items__menu_item__menu__branch__restaurant=instance.pk)
+
+
+@receiver(pre_delete, sender=MenuItem)
+def remember_affected_carts(sender, instance, **kwargs):
+    """Cart lines go with the item (CASCADE); note their carts before they disappear"""
+    instance._affected_cart_ids = list(Cart.objects.containing_item(instance.pk).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=MenuItem)
+def recalculate_affected_carts(sender, instance, **kwargs):
+    cart_ids = getattr(instance, '_affected_cart_ids', None)
+    if cart_ids:
+        Cart.objects.filter(pk__in=cart_ids).recalculate_totals()
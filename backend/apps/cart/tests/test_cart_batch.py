@@ -0,0 +1,83 @@
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem
+from apps.cart.models import Cart, CartItem
+
+User = get_user_model()
+
+
+class CartBatchTests(APITestCase):
+    batch_url = '/api/v1/cart/batch/'
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=restaurant, name='Main Branch', phone='123')
+        menu = Menu.objects.create(branch=branch, name='Main Menu')
+        self.items = MenuItem.objects.bulk_create([
+            MenuItem(menu=menu, name=f'Item {n}', price=Decimal('2.00') + n) for n in range(12)
+        ])
+        self.cart = Cart.objects.create(user=self.customer)
+        self.client.force_authenticate(user=self.customer)
+
+    def batch(self, operations):
+        return self.client.post(self.batch_url, {'operations': operations}, format='json')
+
+    def test_mixed_operations_return_one_snapshot(self):
+        a, b, c = self.items[:3]
+        CartItem.objects.create(cart=self.cart, menu_item=b, quantity=5)
+        CartItem.objects.create(cart=self.cart, menu_item=c, quantity=1)
+
+        response = self.batch([
+            {'op': 'add', 'menu_item': a.id, 'quantity': 1},
+            {'op': 'add', 'menu_item': a.id, 'quantity': 2},
+            {'op': 'set', 'menu_item': b.id, 'quantity': 2},
+            {'op': 'remove', 'menu_item': c.id},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cart = response.data['data']
+        self.assertEqual({line['menu_item']: line['quantity'] for line in cart['items']}, {a.id: 3, b.id: 2})
+        self.assertEqual(cart['item_count'], 5)
+        self.assertEqual(Decimal(cart['subtotal']), a.price * 3 + b.price * 2)
+        self.assertFalse(Cart.objects.drifted().exists())
+
+    def test_invalid_menu_item_rejects_whole_batch(self):
+        response = self.batch([
+            {'op': 'add', 'menu_item': self.items[0].id, 'quantity': 1},
+            {'op': 'add', 'menu_item': 999999, 'quantity': 1},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+    def test_quantity_required_for_add_and_set(self):
+        response = self.batch([{'op': 'set', 'menu_item': self.items[0].id}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reorder_query_count_independent_of_size(self):
+        counts = {}
+        for size in (2, 10):
+            CartItem.objects.filter(cart=self.cart).delete()
+            CartItem.objects.bulk_create([
+                CartItem(cart=self.cart, menu_item=item, quantity=1) for item in self.items[:size]
+            ])
+            Cart.objects.filter(pk=self.cart.pk).recalculate_totals()
+            operations = (
+                [{'op': 'add', 'menu_item': item.id, 'quantity': 1} for item in self.items[:size]]
+                + [{'op': 'add', 'menu_item': self.items[11].id, 'quantity': 1}]
+                + [{'op': 'remove', 'menu_item': self.items[0].id}]
+            )
+            with CaptureQueriesContext(connection) as queries:
+                response = self.batch(operations)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts[size] = len(queries)
+
+        self.assertEqual(counts[2], counts[10], counts)
+        self.assertLessEqual(counts[10], 12)
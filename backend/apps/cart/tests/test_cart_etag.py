@@ -0,0 +1,61 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem
+
+User = get_user_model()
+
+
+class CartETagTests(APITestCase):
+    cart_url = '/api/v1/cart/'
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.restaurant = restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=restaurant, name='Main Branch', phone='123')
+        menu = Menu.objects.create(branch=branch, name='Main Menu')
+        self.item = MenuItem.objects.create(menu=menu, name='Cheese Pizza', price='10.00')
+        self.client.force_authenticate(user=self.customer)
+
+    def test_poll_is_answered_from_the_version(self):
+        etag = self.client.get(self.cart_url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.cart_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post('/api/v1/cart/add/', {'menu_item': self.item.id, 'quantity': 1})
+        response = self.client.get(self.cart_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data['data']['items']), 1)
+
+    def test_renames_and_availability_change_the_etag(self):
+        self.client.post('/api/v1/cart/add/', {'menu_item': self.item.id, 'quantity': 1})
+        etag = self.client.get(self.cart_url)['ETag']
+
+        for change in (self.rename_item, self.make_unavailable, self.rename_restaurant):
+            change()
+            response = self.client.get(self.cart_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, change.__name__)
+            etag = response['ETag']
+
+        line = response.data['data']['items'][0]
+        self.assertEqual((line['menu_item_name'], line['restaurant_name']), ('Margherita', 'Pizza Palace'))
+
+    def rename_item(self):
+        item = MenuItem.objects.get(pk=self.item.pk)
+        item.name = 'Margherita'
+        item.save()
+
+    def make_unavailable(self):
+        item = MenuItem.objects.get(pk=self.item.pk)
+        item.is_available = False
+        item.save()
+
+    def rename_restaurant(self):
+        self.restaurant.name = 'Pizza Palace'
+        self.restaurant.save()
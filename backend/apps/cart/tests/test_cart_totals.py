@@ -0,0 +1,76 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem
+from apps.cart.models import Cart, CartItem
+
+User = get_user_model()
+
+
+class CartTotalsTests(APITestCase):
+    add_url = '/api/v1/cart/add/'
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=restaurant, name='Main Branch', phone='123')
+        self.menu = Menu.objects.create(branch=branch, name='Main Menu')
+        self.pizza = MenuItem.objects.create(menu=self.menu, name='Pizza', price='10.00')
+        self.soda = MenuItem.objects.create(menu=self.menu, name='Soda', price='2.50')
+        self.client.force_authenticate(user=self.customer)
+
+    def cart(self):
+        return Cart.objects.get(user=self.customer)
+
+    def assertTotals(self, item_count, subtotal):
+        cart = self.cart()
+        self.assertEqual((cart.item_count, cart.subtotal), (item_count, Decimal(subtotal)))
+        self.assertFalse(Cart.objects.drifted().exists())
+
+    def test_line_changes_move_totals(self):
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 2})
+        self.client.post(self.add_url, {'menu_item': self.soda.id, 'quantity': 1})
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 1})
+        self.assertTotals(4, '32.50')
+
+        line = CartItem.objects.get(cart__user=self.customer, menu_item=self.pizza)
+        response = self.client.patch(f'/api/v1/cart/items/{line.id}/', {'quantity': 1})
+        self.assertEqual(Decimal(response.data['data']['subtotal']), Decimal('12.50'))
+        self.assertTotals(2, '12.50')
+
+        response = self.client.delete(f'/api/v1/cart/items/{line.id}/')
+        self.assertEqual(response.data['data']['item_count'], 1)
+        self.assertTotals(1, '2.50')
+
+    def test_cart_read_uses_stored_totals(self):
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 3})
+        self.assertEqual(self.cart().total_price, Decimal('30.00'))
+
+    def test_price_change_reprices_carts(self):
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 2})
+        self.pizza.price = Decimal('12.00')
+        self.pizza.save()
+        self.assertTotals(2, '24.00')
+
+    def test_item_deletion_recalculates_carts(self):
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 2})
+        self.client.post(self.add_url, {'menu_item': self.soda.id, 'quantity': 2})
+        self.soda.delete()
+        self.assertTotals(2, '20.00')
+
+    def test_reconcile_command_reports_and_fixes_drift(self):
+        self.client.post(self.add_url, {'menu_item': self.pizza.id, 'quantity': 2})
+        Cart.objects.filter(user=self.customer).update(item_count=9, subtotal='1.00')
+
+        out = StringIO()
+        call_command('reconcile_carts', stdout=out)
+        self.assertIn('1 cart(s) drifted', out.getvalue())
+        self.assertEqual(self.cart().item_count, 9)
+
+        call_command('reconcile_carts', '--fix', stdout=StringIO())
+        self.assertTotals(2, '20.00')
@@ -0,0 +1,100 @@
+import time
+from decimal import Decimal
+import threading
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem
+from apps.cart.models import Cart, CartItem
+
+User = get_user_model()
+
+
+def make_item(owner):
+    restaurant = Restaurant.objects.create(
+        name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+    )
+    branch = Branch.objects.create(restaurant=restaurant, name='Main Branch', phone='123')
+    menu = Menu.objects.create(branch=branch, name='Main Menu')
+    return MenuItem.objects.create(menu=menu, name='Cheese Pizza', price=Decimal('10.00'))
+
+
+class CartUpsertTests(TestCase):
+    add_url = '/api/v1/cart/add/'
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        self.item = make_item(User.objects.create_user(email='owner@example.com', password='password123'))
+        self.cart = Cart.objects.create(user=self.customer)
+
+    def test_add_quantity_inserts_then_increments(self):
+        line_id, quantity, created = CartItem.objects.add_quantity(self.cart.id, self.item.id, 2, self.item.price)
+        self.assertEqual((quantity, created), (2, True))
+
+        same_id, quantity, created = CartItem.objects.add_quantity(self.cart.id, self.item.id, 3, self.item.price)
+        self.assertEqual((same_id, quantity, created), (line_id, 5, False))
+        self.assertEqual(CartItem.objects.get(pk=line_id).quantity, 5)
+
+    def test_add_returns_line_state(self):
+        client = APIClient()
+        client.force_authenticate(user=self.customer)
+        client.post(self.add_url, {'menu_item': self.item.id, 'quantity': 1})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.add_url, {'menu_item': self.item.id, 'quantity': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        line = response.data['data']
+        self.assertEqual(line['quantity'], 3)
+        self.assertEqual(float(line['subtotal']), 30.00)
+        self.assertFalse(line['created'])
+        # cart lookup, menu item validation, upsert, cart totals (plus the savepoint pair)
+        self.assertEqual(len(queries), 6)
+
+
+class ConcurrentCartUpsertTests(TransactionTestCase):
+    threads = 16
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        self.item = make_item(User.objects.create_user(email='owner@example.com', password='password123'))
+        self.cart = Cart.objects.create(user=self.customer)
+
+    def test_parallel_adds_of_same_item_are_all_counted(self):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+
+        def add():
+            try:
+                barrier.wait(5)
+                for _ in range(50):
+                    try:
+                        CartItem.objects.add_quantity(self.cart.id, self.item.id, 1, self.item.price)
+                        break
+                    except OperationalError as e:
+                        # The in-memory SQLite test database reports contention
+                        # as a table lock instead of blocking; the statement had
+                        # no effect, so trying again is safe
+                        if 'locked' not in str(e):
+                            raise
+                        time.sleep(0.01)
+            except Exception as e:  # surfaced through the assertion below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=add) for _ in range(self.threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(CartItem.objects.filter(cart=self.cart).count(), 1)
+        self.assertEqual(CartItem.objects.get(cart=self.cart).quantity, self.threads)
+        self.cart.refresh_from_db()
+        self.assertEqual(self.cart.item_count, self.threads)
+        self.assertEqual(self.cart.subtotal, self.item.price * self.threads)
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import CartView, AddToCartView, CartItemView
+from .views import CartView, AddToCartView, CartItemView, CartBatchView
 
 urlpatterns = [
     path('', CartView.as_view(), name='cart_detail'),
     path('add/', AddToCartView.as_view(), name='cart_add'),
+    path('batch/', CartBatchView.as_view(), name='cart_batch'),
     path('items/<int:pk>/', CartItemView.as_view(), name='cart_item_detail'),
 ]
@@ -1,9 +1,20 @@
 from rest_framework.views import APIView
 from rest_framework import status, permissions
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError
+from django.db.models import prefetch_related_objects
 from .models import Cart, CartItem
-from .serializers import CartSerializer, CartItemCreateSerializer, CartItemUpdateSerializer
-from apps.common.utils import APIResponse, ResponseMessages
+from .serializers import CartSerializer, CartItemCreateSerializer, CartItemUpdateSerializer, CartBatchSerializer
+from apps.common.utils import APIResponse, ResponseMessages, idempotent
+from apps.common.mixins import version_etag, etag_matches, not_modified
+
+
+def serialize_cart(cart, request):
+    """Serialize a cart, loading only the relations its ?fields=/?expand= render"""
+    serializer = CartSerializer(cart, context={'request': request})
+    selects, prefetches = serializer.eager_loading()
+    prefetch_related_objects([cart], *selects, *prefetches)
+    return serializer.data
 
 class CartView(APIView):
     """Get current user's cart"""
@@ -11,13 +22,20 @@ class CartView(APIView):
 
     def get(self, request):
         cart, created = Cart.objects.get_or_create(user=request.user)
-        serializer = CartSerializer(cart)
-        return APIResponse.success(data=serializer.data)
+        # Answer polls from the version counter before loading any lines
+        etag = version_etag('cart', cart.id, cart.version, request)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        response = APIResponse.success(data=serialize_cart(cart, request))
+        response['ETag'] = etag
+        return response
 
 class AddToCartView(APIView):
     """Add item to cart"""
     permission_classes = [permissions.IsAuthenticated]
 
+    @idempotent
     def post(self, request):
         cart, created = Cart.objects.get_or_create(user=request.user)
         serializer = CartItemCreateSerializer(data=request.data)
@@ -26,22 +44,23 @@ class AddToCartView(APIView):
             menu_item = serializer.validated_data['menu_item']
             quantity = serializer.validated_data['quantity']
             
-            # Check if item already exists in cart
-            cart_item, item_created = CartItem.objects.get_or_create(
-                cart=cart, 
-                menu_item=menu_item,
-                defaults={'quantity': quantity}
+            # Insert or increment in one statement; safe under double-taps
+            line_id, line_quantity, line_created = CartItem.objects.add_quantity(
+                cart.id, menu_item.id, quantity, menu_item.price
             )
             
-            if not item_created:
-                cart_item.quantity += quantity
-                cart_item.save()
-            
-            # Return updated cart
-            cart_serializer = CartSerializer(cart)
             return APIResponse.success(
                 message="Item added to cart", 
-                data=cart_serializer.data,
+                data={
+                    'id': line_id,
+                    'cart': cart.id,
+                    'menu_item': menu_item.id,
+                    'menu_item_name': menu_item.name,
+                    'menu_item_price': menu_item.price,
+                    'quantity': line_quantity,
+                    'subtotal': menu_item.price * line_quantity,
+                    'created': line_created,
+                },
                 status_code=status.HTTP_201_CREATED
             )
         
@@ -53,17 +72,18 @@ class CartItemView(APIView):
 
     def patch(self, request, pk):
         cart, _ = Cart.objects.get_or_create(user=request.user)
-        cart_item = get_object_or_404(CartItem, pk=pk, cart=cart)
+        cart_item = get_object_or_404(CartItem.objects.select_related('menu_item'), pk=pk, cart=cart)
         
         serializer = CartItemUpdateSerializer(cart_item, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            if 'quantity' in serializer.validated_data:
+                CartItem.objects.set_quantity(cart_item, serializer.validated_data['quantity'])
+            cart.refresh_from_db(fields=['item_count', 'subtotal', 'updated_at'])
             
             # Return updated cart
-            cart_serializer = CartSerializer(cart)
             return APIResponse.success(
                 message="Cart item updated",
-                data=cart_serializer.data
+                data=serialize_cart(cart, request)
             )
         
         return APIResponse.error(message="Validation Error", errors=serializer.errors)
@@ -71,11 +91,41 @@ class CartItemView(APIView):
     def delete(self, request, pk):
         cart, _ = Cart.objects.get_or_create(user=request.user)
         cart_item = get_object_or_404(CartItem, pk=pk, cart=cart)
-        cart_item.delete()
+        CartItem.objects.remove_lines(cart.id, [cart_item])
+        cart.refresh_from_db(fields=['item_count', 'subtotal', 'updated_at'])
         
         # Return updated cart
-        cart_serializer = CartSerializer(cart)
         return APIResponse.success(
             message="Item removed from cart",
-            data=cart_serializer.data
+            data=serialize_cart(cart, request)
         )
+
+class CartBatchView(APIView):
+    """Apply several add/set/remove operations to the cart at once"""
+    permission_classes = [permissions.IsAuthenticated]
+
+    @idempotent
+    def post(self, request):
+        serializer = CartBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse.error(message="Validation Error", errors=serializer.errors)
+
+        menu_items = serializer.context['menu_items']
+        operations = [
+            (operation['op'], operation['menu_item'], operation.get('quantity'))
+            for operation in serializer.validated_data['operations']
+        ]
+        cart, _ = Cart.objects.get_or_create(user=request.user)
+        try:
+            CartItem.objects.apply_batch(
+                cart.id, operations, {pk: item.price for pk, item in menu_items.items()}
+            )
+        except IntegrityError:
+            # A concurrent request added one of these items first; nothing was applied
+            return APIResponse.error(
+                message="Cart changed while applying the batch, please retry",
+                status_code=status.HTTP_409_CONFLICT
+            )
+
+        cart.refresh_from_db(fields=['item_count', 'subtotal', 'updated_at'])
+        return APIResponse.success(message="Cart updated", data=serialize_cart(cart, request))
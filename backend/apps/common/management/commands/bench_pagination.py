@@ -0,0 +1,59 @@
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from apps.common.pagination import KeysetPagination
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.payments.models import Payment
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark page 1 and page 10,000 of a list endpoint with page numbers and with cursors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deep-page', type=int, default=10_000, help='Deepest page to fetch')
+        parser.add_argument('--requests', type=int, default=100, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+        page_size = KeysetPagination.page_size
+        deep = options['deep_page']
+
+        with rolled_back():
+            user = User.objects.create_user(email='bench-pages@example.com', password='password123')
+            n_rows = deep * page_size
+            self.stdout.write(f'Seeding {n_rows:,} payments...')
+            Payment.objects.bulk_create((
+                Payment(
+                    user=user, method='card', transaction_id=f'bench-{n}', status='PAID',
+                    amount=Decimal(n % 5000) / 100,
+                )
+                for n in range(n_rows)
+            ), batch_size=5000)
+            client = APIClient(SERVER_NAME='localhost')
+            client.force_authenticate(user=user)
+            url = '/api/v1/payments/payments/'
+            payments = Payment.objects.filter(user=user)
+
+            for ordering, keys in (('', ('-pk',)), ('amount', ('amount', 'pk'))):
+                # The row just before the deep page, as the previous page's next link would carry it
+                columns = [key.lstrip('-') for key in keys]
+                boundary = payments.order_by(*keys).values_list(*columns)[n_rows - page_size - 1]
+                deep_cursor = KeysetPagination.make_cursor(boundary)
+                base = {'ordering': ordering} if ordering else {}
+                scenarios = [
+                    ('page 1', {**base, 'page': 1}),
+                    (f'page {deep:,}', {**base, 'page': deep}),
+                    ('cursor, first page', base),
+                    (f'cursor, page {deep:,}', {**base, 'cursor': deep_cursor}),
+                ]
+                self.stdout.write(f"ordering={ordering or '-pk (default)'}")
+                for label, params in scenarios:
+                    def fetch():
+                        response = client.get(url, params)
+                        assert response.status_code == 200, response.status_code
+                        assert len(response.data['results']) == page_size
+                    self.stdout.write(format_result(label, measure(fetch, iterations)))
@@ -1,3 +1,8 @@
-from .model_mixins import TimestampMixin, UUIDMixin, SoftDeleteMixin, BaseModel
+from .model_mixins import TimestampMixin, UUIDMixin, SoftDeleteMixin, VersionMixin, BaseModel
+from .view_mixins import (
+    VersionETagMixin, FlexFieldsViewMixin, SingleFlightMixin, version_etag, etag_matches, not_modified
+)
 
-__all__ = ['TimestampMixin', 'UUIDMixin', 'SoftDeleteMixin', 'BaseModel']
\ No newline at end of file
+__all__ = ['TimestampMixin', 'UUIDMixin', 'SoftDeleteMixin', 'VersionMixin', 'BaseModel',
+           'VersionETagMixin', 'FlexFieldsViewMixin', 'SingleFlightMixin',
+           'version_etag', 'etag_matches', 'not_modified']
\ No newline at end of file
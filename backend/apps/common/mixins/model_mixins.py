@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models.sql import UpdateQuery
 import uuid
 
 
@@ -35,6 +36,56 @@ class SoftDeleteMixin(models.Model):
         self.save()
 
 
+class VersionMixin(models.Model):
+    """Abstract model mixin for a version counter bumped on every write (used for ETags)"""
+    version = models.PositiveBigIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """
+        Increment the version in the UPDATE itself so concurrent saves never
+        share one. The new value comes back through RETURNING where the
+        backend has it (see _do_update), otherwise it is read back.
+        """
+        if not self._state.adding:
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+        if isinstance(self.version, models.Expression):
+            self.refresh_from_db(fields=['version'])
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        connection = connections[using]
+        if (
+            not isinstance(self.version, models.Expression) or self._meta.select_on_save
+            or connection.vendor not in ('postgresql', 'sqlite')  # UPDATE ... RETURNING
+            or not connection.features.can_return_columns_from_insert  # SQLite before 3.35
+        ):
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        query = base_qs.filter(pk=pk_val).query.chain(UpdateQuery)
+        query.add_update_fields(values)
+        query.annotations = {}
+        compiler = query.get_compiler(using)
+        compiler.pre_sql_setup()
+        sql, params = compiler.as_sql()
+        column = connection.ops.quote_name(self._meta.get_field('version').column)
+        with connection.cursor() as cursor:
+            cursor.execute(f'{sql} RETURNING {column}', params)
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        self.version = row[0]
+        return True
+
+    @classmethod
+    def bump_versions(cls, **filters):
+        """Bump the version of every row matching filters, e.g. after a dependent row changed"""
+        return cls._base_manager.filter(**filters).update(version=models.F('version') + 1)
+
+
 class BaseModel(UUIDMixin, TimestampMixin, SoftDeleteMixin):
     """Base model with common fields for all models"""
     class Meta:
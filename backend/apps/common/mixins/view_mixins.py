@@ -0,0 +1,174 @@
+import hashlib
+import json
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from apps.common.serializers import EXPAND_PARAM, FIELDS_PARAM, parse_paths
+from apps.common.utils.singleflight import SingleFlight
+
+
+def _paths(tree, prefix=''):
+    """{'a': {}, 'b': {'c': {}}} -> ['a', 'b.c']"""
+    return [
+        path
+        for name, children in sorted(tree.items())
+        for path in (_paths(children, f'{prefix}{name}.') if children else [prefix + name])
+    ]
+
+
+def version_etag(kind, pk, version, request=None):
+    """
+    Weak ETag derived from a row's version counter. With a request, the
+    normalized ?fields= and ?expand= are part of it, since they change the
+    representation (joined with '+': If-None-Match lists tags with commas).
+    """
+    tag = f'{settings.ETAG_NAMESPACE}-{kind}-{pk}-{version}'
+    if request is not None:
+        for param in (FIELDS_PARAM, EXPAND_PARAM):
+            paths = _paths(parse_paths(request.query_params.get(param)))
+            if paths:
+                tag += f';{param}={"+".join(paths)}'
+    return f'W/"{tag}"'
+
+
+def etag_matches(request, etag):
+    """Whether If-None-Match already names etag (weak comparison)"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    if '*' in candidates:
+        return True
+    strip = lambda tag: tag[2:] if tag.startswith('W/') else tag
+    return strip(etag) in {strip(candidate) for candidate in candidates}
+
+
+def not_modified(etag):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response['ETag'] = etag
+    return response
+
+
+class VersionETagMixin:
+    """
+    Conditional GET for retrieve() on models with a VersionMixin counter.
+
+    When the request carries If-None-Match, the version is read with a narrow
+    query first and a match returns 304 before the object, its prefetches or
+    the serializer are touched. Unconditional GETs cost nothing extra. The tag
+    varies with ?fields= and ?expand= (see version_etag).
+    """
+    etag_kind = None
+
+    def get_etag_kind(self):
+        return self.etag_kind or self.get_queryset().model._meta.model_name
+
+    def retrieve(self, request, *args, **kwargs):
+        kind = self.get_etag_kind()
+        if request.headers.get('If-None-Match'):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            version = (
+                self.filter_queryset(self.get_queryset())
+                .prefetch_related(None)
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list('pk', 'version')
+                .first()
+            )
+            if version is not None and etag_matches(request, version_etag(kind, *version, request)):
+                return not_modified(version_etag(kind, *version, request))
+
+        instance = self.get_object()
+        response = Response(self.get_serializer(instance).data)
+        response['ETag'] = version_etag(kind, instance.pk, instance.version, request)
+        return response
+
+
+class FlexFieldsViewMixin:
+    """
+    Derive select_related/prefetch_related from the serializer for reads, so
+    ?fields= and ?expand= decide which relations are queried.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in ('GET', 'HEAD') or self.action not in ('list', 'retrieve'):
+            return queryset
+        return self.get_serializer().load_related(queryset)
+
+
+def _freeze(response):
+    """A response as plain data that concurrent requests can each rebuild"""
+    content = None if isinstance(response, Response) else response.content
+    data = response.data if content is None else None
+    return response.status_code, data, content, dict(response.items())
+
+
+def _thaw(frozen):
+    status_code, data, content, headers = frozen
+    if content is None:
+        response = Response(data, status=status_code)
+    else:
+        response = HttpResponse(content, status=status_code)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+class SingleFlightMixin:
+    """
+    Collapse concurrent identical reads into one computation (see SingleFlight).
+
+    For the actions in single_flight_actions, unconditional GETs with the same
+    URL arguments, query parameters and audience share the first one's
+    response. The audience is the user by default, so per-user responses are
+    never shared; views whose responses only depend on a role override
+    get_single_flight_audience. single_flight() collapses any other expensive
+    step, such as rendering a snapshot.
+    """
+    single_flight_actions = ('retrieve',)
+    single_flight_cross_process = False
+
+    def get_single_flight_group(self):
+        return SingleFlight.group(type(self).__name__)
+
+    def get_single_flight_audience(self, request):
+        return request.user.pk if request.user.is_authenticated else None
+
+    def get_single_flight_key(self, request):
+        """Key shared by requests that must get the same response, or None to run this one alone"""
+        if (
+            request.method not in ('GET', 'HEAD') or self.action not in self.single_flight_actions
+            or request.headers.get('If-None-Match')
+        ):
+            return None
+        identity = [
+            self.action,
+            self.get_single_flight_audience(request),
+            sorted(self.kwargs.items()),
+            sorted((name, sorted(request.query_params.getlist(name))) for name in request.query_params),
+            request.build_absolute_uri('/'),  # links in responses are absolute
+        ]
+        return hashlib.sha256(json.dumps(identity, default=str).encode()).hexdigest()
+
+    def single_flight(self, key, compute, cross_process=None):
+        if cross_process is None:
+            cross_process = self.single_flight_cross_process
+        return self.get_single_flight_group().do(key, compute, cross_process=cross_process)
+
+    def collapse(self, key, render, cross_process=None):
+        """render()'s response, shared with concurrent requests for key"""
+        return _thaw(self.single_flight(key, lambda: _freeze(render()), cross_process))
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_single_flight_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+        return self.collapse(key, lambda: super(SingleFlightMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        key = self.get_single_flight_key(request)
+        if key is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.collapse(key, lambda: super(SingleFlightMixin, self).retrieve(request, *args, **kwargs))
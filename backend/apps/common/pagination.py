@@ -0,0 +1,200 @@
+"""
+Keyset (cursor) pagination.
+
+PageNumberPagination counts the whole result set and skips OFFSET rows, so a
+page gets slower the deeper it is. KeysetPagination orders by the requested
+ordering plus the primary key as a tie-breaker and seeks past the boundary row
+of the previous page instead: every page is one index range scan of
+page_size + 1 rows however deep it is, and nothing is counted.
+
+The ordering is read from the filtered queryset, so OrderingFilter and
+ordering_fields keep working. It has to be on concrete, non-relation columns
+of the model; NULLs sort as the largest value in either direction, the same on
+every backend. Querysets ordered by anything else (a search rank, a related
+field) and requests passing ?page= get plain page-number pagination.
+"""
+import base64
+import binascii
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()  # full precision; DjangoJSONEncoder drops microseconds
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = ('-pk',)  # when neither the queryset nor the model orders the rows
+    fallback_class = PageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.fallback = None
+        self.keys = self.get_keys(queryset)
+        if self.keys is None or self.fallback_class.page_query_param in request.query_params:
+            if self.keys is not None:
+                queryset = queryset.order_by(*self.order_by(False))  # the same order cursors walk
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        cursor = self.decode_cursor(request)
+        values, backwards = cursor if cursor is not None else (None, False)
+        rows, more = self.fetch_rows(queryset, values, backwards)
+        if backwards:
+            rows.reverse()
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next, self.has_previous = more, cursor is not None
+        self.page = rows
+        return rows
+
+    def fetch_rows(self, queryset, values, backwards):
+        """
+        Up to page_size rows past the boundary values (all rows when None), in
+        walking order, and whether more rows follow them
+        """
+        if values is not None:
+            queryset = queryset.filter(self.seek(values, backwards))
+        rows = list(queryset.order_by(*self.order_by(backwards))[:self.page_size + 1])
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    def get_keys(self, queryset):
+        """[(field, descending)] ending in the primary key, or None if the ordering cannot be seeked"""
+        query = queryset.query
+        if query.extra_order_by:
+            return None
+        opts = queryset.model._meta
+        ordering = query.order_by or (opts.ordering if query.default_ordering else ()) or self.ordering
+        keys = []
+        for name in ordering:
+            if not isinstance(name, str) or name == '?':
+                return None
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation:
+                return None
+            keys.append((field, descending))
+            if field.primary_key:
+                return keys
+        keys.append((opts.pk, keys[-1][1] if keys else True))
+        return keys
+
+    def order_by(self, backwards):
+        order = []
+        for field, descending in self.keys:
+            descending = descending != backwards
+            if field.null:
+                expression = F(field.attname)
+                order.append(expression.desc(nulls_first=True) if descending else expression.asc(nulls_last=True))
+            else:
+                order.append(f"{'-' if descending else ''}{field.attname}")
+        return order
+
+    def seek(self, values, backwards):
+        """Rows strictly after the boundary values in the (possibly reversed) ordering"""
+        condition = Q(pk__in=[])
+        ties = Q()
+        for (field, descending), value in zip(self.keys, values):
+            descending = descending != backwards
+            name = field.attname
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if descending else Q(pk__in=[])
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if descending else f'{name}__gt': value})
+                if field.null and not descending:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            condition |= ties & after
+            ties &= same
+        (field, descending), value = self.keys[0], values[0]
+        if not field.null and value is not None:
+            # Redundant, but gives the planner a range on the leading index column
+            lookup = 'lte' if descending != backwards else 'gte'
+            condition &= Q(**{f'{field.attname}__{lookup}': value})
+        return condition
+
+    @staticmethod
+    def make_cursor(values, backwards=False):
+        """Cursor for the rows after (or before) the given ordering values, pk last"""
+        payload = json.dumps({'v': [_encode_value(value) for value in values], 'b': backwards}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def encode_cursor(self, row, backwards):
+        cursor = self.make_cursor([getattr(row, field.attname) for field, _ in self.keys], backwards)
+        url = remove_query_param(self.request.build_absolute_uri(), self.fallback_class.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """(values, backwards) from the request's cursor, or None on the first page"""
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values, backwards = payload['v'], bool(payload['b'])
+            if len(values) != len(self.keys):
+                raise ValueError
+            values = [
+                None if value is None else field.to_python(value) for (field, _), value in zip(self.keys, values)
+            ]
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, backwards
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Opaque cursor from the previous response\'s next or previous link',
+            'schema': {'type': 'string'},
+        }] + self.fallback_class().get_schema_operation_parameters(view)
@@ -223,7 +223,7 @@
 
 
 from rest_framework.permissions import BasePermission
-from ..accounts.models import RolePermission
+from ..accounts.permission_matrix import get_permission_matrix
 
 class IsAuthenticatedAndVerified(BasePermission):
     """Allows access only to authenticated and verified users."""
@@ -250,33 +250,27 @@ class HasModelPermission(BasePermission):
             return 'DELETE'
         return 'READ'
 
-    def check_permission(self, role, resource, action):
-        # Query on RolePermission model to see if this role has access to the resource/action
-        perm = RolePermission.objects.filter(
-            role=role,
-            permission__resource_type=resource,
-            permission__action=action,
-        ).first()
-        return perm and perm.access_level in ['FULL', 'LIMITED', 'READ_ONLY']
+    def check_permission(self, user_role, resource, action):
+        # Look up the compiled role/resource/action matrix (no query on the hot path)
+        access_level = get_permission_matrix().access_level(user_role.role_id, resource, action)
+        return access_level in ['FULL', 'LIMITED', 'READ_ONLY']
 
 class IsObjectOwnerOrRolePermission(BasePermission):
     """
     Object-level permission: check user ownership or explicit permission.
     """
     def has_object_permission(self, request, view, obj):
-        user_role = request.user.get_active_role()
         resource = getattr(view, 'permission_resource', None)
         action = self.get_action(request)
         # Ownership check
         if hasattr(obj, 'owner') and obj.owner == request.user:
             return True
         # Role-based object access
-        perm = RolePermission.objects.filter(
-            role=user_role,
-            permission__resource_type=resource,
-            permission__action=action,
-        ).first()
-        return perm and perm.access_level in ['FULL', 'LIMITED']
+        user_role = request.user.get_active_role()
+        if not user_role:
+            return False
+        access_level = get_permission_matrix().access_level(user_role.role_id, resource, action)
+        return access_level in ['FULL', 'LIMITED']
 
     def get_action(self, request):
         if request.method == 'POST':
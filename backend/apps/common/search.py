@@ -0,0 +1,205 @@
+"""
+Full-text search over a denormalized `search_document` column.
+
+PostgreSQL uses a GIN expression index on to_tsvector('simple', ...) and ranks
+with ts_rank; SQLite (dev and tests) uses an FTS5 external-content table kept
+in sync by triggers and ranks with bm25. Other backends fall back to icontains
+per term. Every search term is matched as a prefix, so "piz marg" finds
+"Pizza Margherita".
+"""
+import re
+from django.db import connection, models
+from django.db.models import BooleanField, F, FloatField, Lookup, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+SEARCH_FIELD = 'search_document'
+SEARCH_INDEX = 'search_index'  # related_name of the SearchIndex row on SQLite
+MAX_TERMS = 8
+TERM_RE = re.compile(r'\w+')
+TEXT_SEARCH_CONFIG = 'simple'  # no stemming, matching the FTS5 unicode61 tokenizer
+
+
+def search_terms(text):
+    """Lowercased word tokens of a user query, capped at MAX_TERMS"""
+    return [term.lower() for term in TERM_RE.findall(text or '')][:MAX_TERMS]
+
+
+def document(*parts):
+    """Join the non-empty text parts of a search document"""
+    return ' '.join(str(part) for part in parts if part)
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+class Match(Lookup):
+    """FTS5 `column MATCH query`"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class SearchDocumentField(models.TextField):
+    def deconstruct(self):
+        # Migrations only need a TextField and shouldn't import this module
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.TextField', args, kwargs
+
+
+SearchDocumentField.register_lookup(Match)
+
+
+class BM25(F):
+    """Negated bm25() of the FTS5 table the search document was joined from"""
+    def resolve_expression(self, *args, **kwargs):
+        return _BM25(super().resolve_expression(*args, **kwargs))
+
+
+class _BM25(models.Func):
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection):
+        column = self.get_source_expressions()[0]
+        return f'-bm25({compiler.quote_name_unless_alias(column.alias)})', []
+
+
+class SearchIndex(models.Model):
+    """
+    A row of the SQLite FTS5 table over a model's search_document.
+
+    Subclasses add a one-to-one primary key to the indexed model on the rowid
+    column with related_name=SEARCH_INDEX and db_table=fts_table(model), so a
+    search is an ordinary join the query planner can drive from the FTS side.
+    The table is created by install_search_index, never by migrate.
+    """
+    search_document = SearchDocumentField()
+
+    class Meta:
+        abstract = True
+        managed = False
+
+
+def _sqlite_statements(model):
+    table = model._meta.db_table
+    fts = fts_table(model)
+    pk = model._meta.pk.column
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{SEARCH_FIELD}, content='{table}', content_rowid='{pk}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {SEARCH_FIELD}) VALUES (new.{pk}, new.{SEARCH_FIELD}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {SEARCH_FIELD}) VALUES ('delete', old.{pk}, old.{SEARCH_FIELD}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {SEARCH_FIELD} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {SEARCH_FIELD}) VALUES ('delete', old.{pk}, old.{SEARCH_FIELD}); "
+        f"INSERT INTO {fts}(rowid, {SEARCH_FIELD}) VALUES (new.{pk}, new.{SEARCH_FIELD}); END",
+    ]
+
+
+def install_search_index(model, using=None):
+    """Create the vendor-specific index (idempotent)"""
+    conn = using or connection
+    if conn.vendor == 'sqlite':
+        statements = _sqlite_statements(model)
+    elif conn.vendor == 'postgresql':
+        table = model._meta.db_table
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} "
+            f"USING GIN (to_tsvector('{TEXT_SEARCH_CONFIG}', {SEARCH_FIELD}))"
+        ]
+    else:
+        return
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def drop_search_index(model, using=None):
+    conn = using or connection
+    fts = fts_table(model)
+    if conn.vendor == 'sqlite':
+        statements = [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')]
+        statements.append(f'DROP TABLE IF EXISTS {fts}')
+    elif conn.vendor == 'postgresql':
+        statements = [f'DROP INDEX IF EXISTS {model._meta.db_table}_search_gin']
+    else:
+        return
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(model, using=None):
+    """Re-read every document into the index (SQLite FTS only; GIN indexes maintain themselves)"""
+    conn = using or connection
+    if conn.vendor == 'sqlite':
+        fts = fts_table(model)
+        with conn.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def full_text_search(queryset, terms):
+    """Filter queryset to rows matching every term (as a prefix), annotated with search_rank"""
+    model = queryset.model
+    table = connection.ops.quote_name(model._meta.db_table)
+
+    if connection.vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # bm25() only works in the MATCH query itself (as a correlated subquery it
+        # re-reads every match per row), so join the FTS table through its SearchIndex
+        # model. bm25 is lower-is-better; negate so search_rank sorts descending like ts_rank.
+        document = f'{SEARCH_INDEX}__{SEARCH_FIELD}'
+        return queryset.filter(**{f'{document}__{Match.lookup_name}': match}).annotate(search_rank=BM25(document))
+
+    if connection.vendor == 'postgresql':
+        vector = f"to_tsvector('{TEXT_SEARCH_CONFIG}', {table}.{SEARCH_FIELD})"
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.alias(
+            search_match=RawSQL(
+                f"{vector} @@ to_tsquery('{TEXT_SEARCH_CONFIG}', %s)", [tsquery], output_field=BooleanField()
+            )
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({vector}, to_tsquery('{TEXT_SEARCH_CONFIG}', %s))", [tsquery], output_field=FloatField()
+            )
+        )
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(**{f'{SEARCH_FIELD}__icontains': term})
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Drop-in replacement for SearchFilter backed by the search_document index.
+
+    Results are ordered by relevance unless the request asks for an explicit
+    ordering, in which case OrderingFilter (listed after this one) wins.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(request.query_params.get(self.search_param, ''))
+        if not terms:
+            return queryset
+        queryset = full_text_search(queryset, terms)
+        if request.query_params.get(self.ordering_param):
+            return queryset
+        return queryset.order_by('-search_rank', 'pk')
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search; every word is matched as a prefix',
+            'schema': {'type': 'string'},
+        }]
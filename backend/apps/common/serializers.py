@@ -0,0 +1,150 @@
+"""
+Sparse fieldsets (?fields=) and opt-in expansion (?expand=) for model serializers.
+
+?fields=id,name restricts the output to those fields; ?expand=branches adds a
+nested serializer listed in Meta.expandable_fields, which is left out unless
+asked for. Both take dotted paths into nested serializers, e.g.
+?fields=id,items.quantity&expand=items.menu_item_details, and naming an
+expandable field in ?fields expands it. Only the output is narrowed: writes
+still validate every field.
+
+eager_loading() walks the fields that will actually be rendered and returns
+the select_related paths and Prefetch objects they need; FlexFieldsViewMixin
+applies them, so a request loads exactly the relations it renders.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_paths(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _relation(model, attr):
+    """(related model, to-many) for a relation attribute of model, or None if attr is not one"""
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        field = next((
+            f for f in model._meta.related_objects if f.get_accessor_name() == attr
+        ), None)
+    if field is None or not field.is_relation:
+        return None
+    return field.related_model, bool(field.one_to_many or field.many_to_many)
+
+
+def _prefixed(prefix, prefetch):
+    if isinstance(prefetch, str):
+        return f'{prefix}__{prefetch}'
+    return Prefetch(f'{prefix}__{prefetch.prefetch_through}', queryset=prefetch.queryset)
+
+
+class FlexFieldsMixin:
+    """
+    Meta.expandable_fields maps a field name to (serializer class, kwargs).
+    Meta.field_relations maps a computed field (a model property) to the
+    relation paths it reads, so eager_loading() can load them too.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Trees from parse_paths(); None means "read them from the request" on the root serializer
+        self._only = fields
+        self._expand = expand
+
+    def _spec(self):
+        """(only, expand) trees for this serializer; only is None when every field is wanted"""
+        if self._expand is None:
+            root = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+            request = self.context.get('request')
+            if self._only is None and root is None and request is not None:
+                self._only = parse_paths(request.query_params.get(FIELDS_PARAM)) or None
+                self._expand = parse_paths(request.query_params.get(EXPAND_PARAM))
+            else:
+                self._expand = {}
+        return self._only, self._expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._spec()
+        for name, (serializer_class, options) in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name in expand or (only is not None and name in only):
+                fields[name] = serializer_class(read_only=True, **options)
+        for name, field in fields.items():
+            child = getattr(field, 'child', field)
+            if isinstance(child, FlexFieldsMixin):
+                child._only = (only or {}).get(name) or None
+                child._expand = expand.get(name, {})
+        return fields
+
+    @property
+    def _readable_fields(self):
+        only, _ = self._spec()
+        for field in super()._readable_fields:
+            if only is None or field.field_name in only:
+                yield field
+
+    def eager_loading(self):
+        """(select_related paths, Prefetch objects) for the fields this serializer renders"""
+        model = self.Meta.model
+        selects, prefetches = [], []
+        relations = getattr(self.Meta, 'field_relations', {})
+        for field in self._readable_fields:
+            path = '__'.join(field.source_attrs)
+            if isinstance(field, serializers.ManyRelatedField):
+                prefetches.append(path)
+                continue
+            child = getattr(field, 'child', field)
+            relation = _relation(model, path) if isinstance(child, serializers.BaseSerializer) else None
+            if relation is not None:
+                related_model, many = relation
+                child_selects, child_prefetches = (
+                    child.eager_loading() if isinstance(child, FlexFieldsMixin) else ([], [])
+                )
+                if many:
+                    queryset = related_model._default_manager.select_related(*child_selects)
+                    prefetches.append(Prefetch(path, queryset=queryset.prefetch_related(*child_prefetches)))
+                else:
+                    selects.append(path)
+                    selects.extend(f'{path}__{select}' for select in child_selects)
+                    prefetches.extend(_prefixed(path, prefetch) for prefetch in child_prefetches)
+                continue
+            # Dotted sources (menu_item.menu.branch) and declared property dependencies
+            paths = list(relations.get(field.field_name, ()))
+            if len(field.source_attrs) > 1:
+                paths.append('__'.join(field.source_attrs[:-1]))
+            selects.extend(path for path in paths if self._selectable(model, path))
+        return selects, prefetches
+
+    @staticmethod
+    def _selectable(model, path):
+        """Whether path is a chain of to-one relations that select_related can join"""
+        for attr in path.split('__'):
+            relation = _relation(model, attr)
+            if relation is None or relation[1]:
+                return False
+            model = relation[0]
+        return True
+
+    def load_related(self, queryset):
+        """queryset with exactly the relations this serializer will render loaded"""
+        selects, prefetches = self.eager_loading()
+        if selects:  # select_related() with no arguments would follow every foreign key
+            queryset = queryset.select_related(*selects)
+        return queryset.prefetch_related(*prefetches)
+
+
+class FlexFieldsModelSerializer(FlexFieldsMixin, serializers.ModelSerializer):
+    pass
+
@@ -0,0 +1,538 @@
+"""
+Deterministic, scale-factor driven synthetic dataset generator.
+
+Rows are produced by generators and written with bulk_create in fixed-size
+chunks, so memory stays bounded no matter how many users or orders are
+generated. Primary keys are assigned up front (uuid5 for UUID models,
+offsets past the current maximum for auto ids), which lets later stages
+reference earlier rows by index without keeping them in memory.
+
+One unit of scale is roughly:
+    1,000 users (90% customers, 5% drivers, 4% restaurant admins, 1% managers)
+    ~1,600 addresses, 25 restaurants, ~35 branches, ~800 menu items
+    ~1,500 paid order groups with ~1,600 orders, ~3,200 order items, ~500 ratings
+    ~190 carts with ~480 cart items, ~700 notifications
+"""
+import random
+import uuid
+from array import array
+from datetime import time
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models
+from django.utils import timezone
+
+from apps.accounts.models import Role, UserRole
+from apps.cart.models import Cart, CartItem
+from apps.common.models import Notification
+from apps.common.search import document
+from apps.delivery.models import DeliveryPartner, DeliveryStatus
+from apps.locations.geo import geohash_for
+from apps.locations.models import Address, City, Country, UserAddress
+from apps.orders.models import Order, OrderGroup, OrderItem
+from apps.payments.models import Payment
+from apps.ratings.models import Rating
+from apps.restaurants.hours import compile_opening_hours
+from apps.restaurants.models import Branch, Category, Cuisine, Menu, MenuItem, Restaurant
+from apps.restaurants.search import refresh_restaurant_documents
+
+User = get_user_model()
+
+USERS_PER_SCALE = 1000
+RESTAURANTS_PER_SCALE = 25
+
+# Role buckets by user index modulo 100
+CUSTOMER_SLOTS = range(0, 90)
+DRIVER_SLOTS = range(90, 95)
+ADMIN_SLOTS = range(95, 99)
+MANAGER_SLOTS = range(99, 100)
+
+ADDRESSES_PER_USER = ([1, 2, 3], [0.55, 0.30, 0.15])
+BRANCHES_PER_RESTAURANT = ([1, 2, 3, 5, 10], [0.70, 0.17, 0.08, 0.04, 0.01])
+ITEMS_PER_ORDER = ([1, 2, 3, 4], [0.40, 0.30, 0.20, 0.10])
+RESTAURANTS_PER_ORDER_GROUP = ([1, 2], [0.92, 0.08])
+CART_SHARE = 0.20
+RATING_SHARE = 0.35
+RESTAURANT_POPULARITY_SKEW = 0.9  # Zipf exponent for order volume per restaurant
+OPENING_HOURS = ([7, 8, 10, 11], [21, 22, 23, 0, 1, 2])  # daily open/close hour; small ones run past midnight
+DELIVERY_STATUSES = (
+    ['DELIVERED', 'CANCELLED', 'PENDING', 'CONFIRMED', 'PREPARING', 'READY_FOR_PICKUP', 'OUT_FOR_DELIVERY'],
+    [0.85, 0.05, 0.02, 0.02, 0.02, 0.02, 0.02],
+)
+
+LOCATIONS = {
+    ('United States', 'US', 'USD', 'America/New_York'): [
+        ('New York', 40.7128, -74.0060), ('Los Angeles', 34.0522, -118.2437),
+        ('Chicago', 41.8781, -87.6298), ('Houston', 29.7604, -95.3698), ('Phoenix', 33.4484, -112.0740),
+    ],
+    ('United Kingdom', 'UK', 'GBP', 'Europe/London'): [
+        ('London', 51.5074, -0.1278), ('Manchester', 53.4808, -2.2426),
+        ('Birmingham', 52.4862, -1.8904), ('Leeds', 53.8008, -1.5491), ('Glasgow', 55.8642, -4.2518),
+    ],
+    ('Canada', 'CA', 'CAD', 'America/Toronto'): [
+        ('Toronto', 43.6532, -79.3832), ('Montreal', 45.5017, -73.5673),
+        ('Vancouver', 49.2827, -123.1207), ('Calgary', 51.0447, -114.0719), ('Ottawa', 45.4215, -75.6972),
+    ],
+}
+CUISINES = ['Italian', 'Chinese', 'Indian', 'Mexican', 'Japanese', 'American', 'Thai', 'French']
+CATEGORIES = ['Starters', 'Mains', 'Sides', 'Desserts', 'Drinks', 'Salads', 'Soups', 'Specials']
+DISHES = [
+    'Pizza', 'Burger', 'Ramen', 'Tacos', 'Curry', 'Sushi', 'Salad', 'Pasta', 'Noodles', 'Burrito',
+    'Dumplings', 'Steak', 'Soup', 'Wrap', 'Sandwich', 'Fries', 'Tiramisu', 'Milkshake', 'Samosa', 'Naan',
+]
+ADJECTIVES = ['Spicy', 'Classic', 'Crispy', 'Smoky', 'Garlic', 'Veggie', 'Chicken', 'Beef', 'Paneer', 'House']
+STREETS = ['Main St', 'Broadway', 'Park Ave', 'Oak Ln', 'Maple Dr', 'Cedar Ct', 'Elm St', 'Washington Blvd']
+FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David', 'Sarah']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Moore', 'Taylor']
+
+
+def chunked(iterable, size):
+    """Yield lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class SyntheticDataGenerator:
+    """Generate a realistic dataset of a given scale with a fixed seed"""
+
+    def __init__(self, scale=1.0, seed=42, chunk_size=5000, log=None):
+        self.scale = scale
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.log = log or (lambda message: None)
+        self.tag = f'syn{seed}'
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f'quickfood-synthetic/{seed}')
+
+        self.n_users = max(100, int(USERS_PER_SCALE * scale))
+        self.n_restaurants = max(5, int(RESTAURANTS_PER_SCALE * scale))
+        self.counts = {}
+
+    # -- helpers -----------------------------------------------------------
+
+    def rng(self, stream):
+        """Independent random stream per stage so stages stay stable on their own"""
+        return random.Random(f'{self.seed}:{stream}')
+
+    def uuid_for(self, kind, index):
+        return uuid.uuid5(self.namespace, f'{kind}:{index}')
+
+    def next_id(self, model):
+        return (model.objects.aggregate(max_id=models.Max('pk'))['max_id'] or 0) + 1
+
+    def bulk(self, model, rows):
+        """Insert one chunk and keep a running count per model"""
+        if rows:
+            model.objects.bulk_create(rows, batch_size=self.chunk_size)
+            self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(rows)
+
+    def write(self, model, rows):
+        """bulk_create a row generator in chunks"""
+        for chunk in chunked(rows, self.chunk_size):
+            self.bulk(model, chunk)
+        self.log(f'  {model.__name__}: {self.counts.get(model.__name__, 0):,}')
+
+    @staticmethod
+    def slot_count(n_users, slots):
+        """Number of user indexes below n_users whose (index % 100) falls in slots"""
+        full, rest = divmod(n_users, 100)
+        return full * len(slots) + sum(1 for s in slots if s < rest)
+
+    @staticmethod
+    def slot_index(k, slots):
+        """User index of the k-th user in a role bucket"""
+        per_block = len(slots)
+        return (k // per_block) * 100 + slots.start + (k % per_block)
+
+    def user_id(self, index):
+        return self.uuid_for('user', index)
+
+    # -- stages ------------------------------------------------------------
+
+    def generate(self):
+        if User.objects.filter(email__endswith=f'.{self.tag}@example.com').exists():
+            raise ValueError(f'Synthetic data for seed {self.seed} already exists; use another seed or an empty database')
+
+        self.create_reference_data()
+        self.create_users()
+        self.create_addresses()
+        self.create_restaurants()
+        self.create_delivery_partners()
+        self.create_orders()
+        self.create_carts()
+        self.create_notifications()
+        self.reset_sequences()
+        return self.counts
+
+    def create_reference_data(self):
+        self.log('Creating reference data...')
+        self.cities = []
+        for (name, code, currency, tz), cities in LOCATIONS.items():
+            country, _ = Country.objects.get_or_create(
+                code=code, defaults={'name': name, 'currency': currency, 'timezone': tz}
+            )
+            for city_name, lat, lng in cities:
+                city, _ = City.objects.get_or_create(country=country, name=city_name)
+                self.cities.append((city.id, lat, lng))
+
+        self.roles = {}
+        for name, role_type in [
+            (Role.RoleName.CUSTOMER, Role.RoleType.PLATFORM),
+            (Role.RoleName.DELIVERY_PARTNER, Role.RoleType.PLATFORM),
+            (Role.RoleName.RESTAURANT_ADMIN, Role.RoleType.RESTAURANT),
+            (Role.RoleName.BRANCH_MANAGER, Role.RoleType.RESTAURANT),
+            (Role.RoleName.SUPER_ADMIN, Role.RoleType.SYSTEM),
+        ]:
+            role, _ = Role.objects.get_or_create(name=name, defaults={'role_type': role_type})
+            self.roles[name] = role
+
+        self.cuisine_ids = [Cuisine.objects.get_or_create(name=name)[0].id for name in CUISINES]
+        self.category_ids = [Category.objects.get_or_create(name=name)[0].id for name in CATEGORIES]
+        self.statuses = {
+            name: DeliveryStatus.objects.get_or_create(status=name)[0].id
+            for name in DELIVERY_STATUSES[0]
+        }
+
+    def create_users(self):
+        self.log(f'Creating {self.n_users:,} users...')
+        password = make_password('password123')
+        rng = self.rng('users')
+        now = timezone.now()
+
+        def users():
+            for i in range(self.n_users):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                email = f'{first.lower()}.{last.lower()}{i}.{self.tag}@example.com'
+                yield User(
+                    id=self.user_id(i), email=email, username=email, password=password,
+                    first_name=first, last_name=last, phone=f'+1555{i % 10_000_000:07d}',
+                    is_email_verified=True, is_phone_verified=rng.random() < 0.5,
+                    date_joined=now,
+                )
+
+        def role_name(i):
+            slot = i % 100
+            if slot in CUSTOMER_SLOTS:
+                return Role.RoleName.CUSTOMER
+            if slot in DRIVER_SLOTS:
+                return Role.RoleName.DELIVERY_PARTNER
+            if slot in ADMIN_SLOTS:
+                return Role.RoleName.RESTAURANT_ADMIN
+            return Role.RoleName.BRANCH_MANAGER
+
+        def user_roles():
+            for i in range(self.n_users):
+                yield UserRole(
+                    id=self.uuid_for('user_role', i), user_id=self.user_id(i),
+                    role=self.roles[role_name(i)], is_active=True,
+                )
+
+        self.write(User, users())
+        self.write(UserRole, user_roles())
+
+        self.n_customers = self.slot_count(self.n_users, CUSTOMER_SLOTS)
+        self.n_drivers = self.slot_count(self.n_users, DRIVER_SLOTS)
+        self.n_admins = self.slot_count(self.n_users, ADMIN_SLOTS)
+        self.n_managers = self.slot_count(self.n_users, MANAGER_SLOTS)
+
+    def make_address(self, rng, address_id, street):
+        city_id, lat, lng = rng.choice(self.cities)
+        latitude = Decimal(f'{lat + rng.uniform(-0.15, 0.15):.6f}')
+        longitude = Decimal(f'{lng + rng.uniform(-0.15, 0.15):.6f}')
+        return Address(
+            id=address_id, street_address=f'{rng.randint(1, 9999)} {street}', city_id=city_id,
+            state='State', postal_code=f'{rng.randint(10000, 99999)}',
+            latitude=latitude, longitude=longitude, geohash=geohash_for(latitude, longitude),
+        )
+
+    def create_addresses(self):
+        self.log('Creating addresses...')
+        rng = self.rng('addresses')
+        counts, weights = ADDRESSES_PER_USER
+        n = 0
+        # Addresses and their user links are written chunk by chunk, parents first
+        for users in chunked(range(self.n_users), max(1, self.chunk_size // 2)):
+            addresses, links = [], []
+            for i in users:
+                for a in range(rng.choices(counts, weights)[0]):
+                    address = self.make_address(rng, self.uuid_for('address', n), rng.choice(STREETS))
+                    addresses.append(address)
+                    links.append(UserAddress(
+                        id=self.uuid_for('user_address', n), user_id=self.user_id(i), address_id=address.id,
+                        address_type=UserAddress.AddressType.HOME if a == 0 else UserAddress.AddressType.OTHER,
+                        is_default=a == 0,
+                    ))
+                    n += 1
+            self.bulk(Address, addresses)
+            self.bulk(UserAddress, links)
+        self.log(f'  Address: {n:,}')
+
+    def create_restaurants(self):
+        self.log(f'Creating {self.n_restaurants:,} restaurants...')
+        rng = self.rng('restaurants')
+        first_restaurant = self.next_id(Restaurant)
+        first_branch = self.next_id(Branch)
+        first_menu = self.next_id(Menu)
+        first_item = self.next_id(MenuItem)
+        branch_counts, branch_weights = BRANCHES_PER_RESTAURANT
+
+        self.restaurant_ids = array('q')
+        self.item_start = array('q')  # first MenuItem id per restaurant
+        self.item_count = array('i')
+        self.item_prices = array('i')  # cents, indexed by item id - first_item
+        self.first_item = first_item
+
+        plan = []  # (restaurant index, branch count, [items per menu])
+        for r in range(self.n_restaurants):
+            branches = rng.choices(branch_counts, branch_weights)[0]
+            plan.append((r, branches, [
+                min(120, max(5, int(rng.lognormvariate(3.0, 0.5)))) for _ in range(branches)
+            ]))
+
+        def restaurants():
+            for r, _, _ in plan:
+                owner = self.user_id(self.slot_index(r % max(1, self.n_admins), ADMIN_SLOTS))
+                self.restaurant_ids.append(first_restaurant + r)
+                yield Restaurant(
+                    id=first_restaurant + r, name=f'{rng.choice(ADJECTIVES)} {rng.choice(DISHES)} House {r}',
+                    owner_id=owner, description=f'Synthetic restaurant {r}', phone=f'+1555{r % 10_000_000:07d}',
+                    email=f'restaurant{r}.{self.tag}@example.com', is_approved=rng.random() < 0.95,
+                )
+
+        def branch_rows():
+            # Address and branch are built together so the branch shares the address coordinates
+            points = self.rng('branch_points')
+            hours = self.rng('branch_hours')
+            n = 0
+            for r, branch_total, _ in plan:
+                for b in range(branch_total):
+                    address = self.make_address(points, self.uuid_for('branch_address', n), 'Market St')
+                    manager = None
+                    if self.n_managers and rng.random() < 0.3:
+                        manager = self.user_id(self.slot_index(rng.randrange(self.n_managers), MANAGER_SLOTS))
+                    yield address, Branch(
+                        id=first_branch + n, restaurant_id=first_restaurant + r, name=f'Branch {b + 1}',
+                        branch_manager_id=manager, address_id=address.id, phone='+15550000000',
+                        latitude=address.latitude, longitude=address.longitude, geohash=address.geohash,
+                        branch_type=Branch.BranchType.DELIVERY,
+                        opening_time=time(hours.choice(OPENING_HOURS[0])),
+                        closing_time=time(hours.choice(OPENING_HOURS[1])),
+                    )
+                    n += 1
+
+        def menus():
+            n = 0
+            for r, branch_total, _ in plan:
+                for b in range(branch_total):
+                    yield Menu(id=first_menu + n, branch_id=first_branch + n, name='All Day Menu')
+                    n += 1
+
+        def menu_items():
+            item_id = first_item
+            menu_id = first_menu
+            category_names = dict(zip(self.category_ids, CATEGORIES))
+            for r, branch_total, item_counts in plan:
+                cuisine_id = self.cuisine_ids[r % len(self.cuisine_ids)]
+                cuisine_name = CUISINES[r % len(self.cuisine_ids)]
+                self.item_start.append(item_id)
+                self.item_count.append(sum(item_counts))
+                for count in item_counts:
+                    for _ in range(count):
+                        price = round(min(80.0, max(1.5, rng.lognormvariate(2.4, 0.45))), 2)
+                        self.item_prices.append(int(round(price * 100)))
+                        vegetarian = rng.random() < 0.3
+                        category_id = rng.choice(self.category_ids)
+                        name = f'{rng.choice(ADJECTIVES)} {rng.choice(DISHES)}'
+                        yield MenuItem(
+                            id=item_id, menu_id=menu_id, category_id=category_id,
+                            cuisine_id=cuisine_id, name=name,
+                            description='Synthetic dish', price=Decimal(f'{price:.2f}'),
+                            is_available=rng.random() < 0.92, is_vegetarian=vegetarian,
+                            is_vegan=vegetarian and rng.random() < 0.3, is_gluten_free=rng.random() < 0.15,
+                            # bulk_create skips save(), so the search document is built here
+                            search_document=document(
+                                name, 'Synthetic dish', category_names[category_id], cuisine_name
+                            ),
+                        )
+                        item_id += 1
+                    menu_id += 1
+
+        self.write(Restaurant, restaurants())
+        for rows in chunked(branch_rows(), self.chunk_size):
+            self.bulk(Address, [address for address, _ in rows])
+            self.bulk(Branch, [branch for _, branch in rows])
+        self.log(f"  Branch: {self.counts.get('Branch', 0):,}")
+        compile_opening_hours(Branch.objects.filter(pk__gte=first_branch))
+        refresh_restaurant_documents(
+            Restaurant.objects.filter(pk__gte=first_restaurant, pk__lt=first_restaurant + self.n_restaurants)
+        )
+        self.write(Menu, menus())
+        self.write(MenuItem, menu_items())
+
+        # Zipf-like popularity: a few restaurants take most of the orders
+        weights = [1 / (rank + 1) ** RESTAURANT_POPULARITY_SKEW for rank in range(self.n_restaurants)]
+        self.restaurant_cum_weights = list(accumulate_floats(weights))
+
+    def create_delivery_partners(self):
+        self.log('Creating delivery partners...')
+        rng = self.rng('drivers')
+        self.first_partner = self.next_id(DeliveryPartner)
+
+        def partners():
+            for k in range(self.n_drivers):
+                yield DeliveryPartner(
+                    id=self.first_partner + k, user_id=self.user_id(self.slot_index(k, DRIVER_SLOTS)),
+                    vehicle_type=rng.choice(['Bike', 'Scooter', 'Car']),
+                    average_rating=round(rng.uniform(3.5, 5.0), 2),
+                )
+
+        self.write(DeliveryPartner, partners())
+
+    def pick_items(self, rng, restaurant_index, how_many):
+        start = self.item_start[restaurant_index]
+        count = self.item_count[restaurant_index]
+        offsets = rng.sample(range(count), min(how_many, count))
+        return [start + offset for offset in offsets]
+
+    def price_of(self, item_id):
+        return self.item_prices[item_id - self.first_item]
+
+    def create_orders(self):
+        self.log('Creating orders...')
+        rng = self.rng('orders')
+        first_group = self.next_id(OrderGroup)
+        first_order = self.next_id(Order)
+        first_payment = self.next_id(Payment)
+        status_names, status_weights = DELIVERY_STATUSES
+        item_counts, item_weights = ITEMS_PER_ORDER
+        group_sizes, group_weights = RESTAURANTS_PER_ORDER_GROUP
+        restaurant_range = range(self.n_restaurants)
+
+        buffers = {Payment: [], OrderGroup: [], Order: [], OrderItem: [], Rating: []}
+
+        def flush(force=False):
+            # Parents before children so foreign keys always resolve
+            if force or len(buffers[OrderItem]) >= self.chunk_size:
+                for model in (Payment, OrderGroup, Order, OrderItem, Rating):
+                    self.bulk(model, buffers[model])
+                    buffers[model].clear()
+
+        group_id, order_id = first_group, first_order
+        for k in range(self.n_customers):
+            customer_id = self.user_id(self.slot_index(k, CUSTOMER_SLOTS))
+            # Heavy-tailed order history: most customers order a little, a few order a lot
+            for _ in range(min(60, int(rng.paretovariate(1.6)) - 1 + (rng.random() < 0.6))):
+                restaurants = set(rng.choices(
+                    restaurant_range, cum_weights=self.restaurant_cum_weights,
+                    k=rng.choices(group_sizes, group_weights)[0],
+                ))
+                group_total = 0
+                orders = []
+                for r in restaurants:
+                    items = self.pick_items(rng, r, rng.choices(item_counts, item_weights)[0])
+                    lines = [(item, rng.choices([1, 2, 3], [0.75, 0.2, 0.05])[0]) for item in items]
+                    order_total = sum(self.price_of(item) * qty for item, qty in lines)
+                    group_total += order_total
+                    status = rng.choices(status_names, status_weights)[0]
+                    partner = None
+                    if self.n_drivers and status in ('OUT_FOR_DELIVERY', 'DELIVERED'):
+                        partner = self.first_partner + rng.randrange(self.n_drivers)
+                    orders.append((order_id, r, status, partner, order_total, lines))
+                    order_id += 1
+
+                payment_id = first_payment + (group_id - first_group)
+                buffers[Payment].append(Payment(
+                    id=payment_id, user_id=customer_id, amount=Decimal(group_total) / 100,
+                    method=rng.choice(['CREDIT_CARD', 'PAYPAL', 'CASH']),
+                    transaction_id=f'{self.tag}-{payment_id}', status='COMPLETED', paid_at=timezone.now(),
+                ))
+                buffers[OrderGroup].append(OrderGroup(
+                    id=group_id, customer_id=customer_id, status='COMPLETED',
+                    total_price=Decimal(group_total) / 100, payment_id=payment_id,
+                ))
+                for oid, r, status, partner, order_total, lines in orders:
+                    buffers[Order].append(Order(
+                        id=oid, order_group_id=group_id, restaurant_id=self.restaurant_ids[r],
+                        delivery_status_id=self.statuses[status], total_price=Decimal(order_total) / 100,
+                        delivery_partner_id=partner,
+                    ))
+                    for item, qty in lines:
+                        buffers[OrderItem].append(OrderItem(
+                            order_id=oid, menu_item_id=item, quantity=qty,
+                            price=Decimal(self.price_of(item)) / 100,
+                        ))
+                    if status == 'DELIVERED' and rng.random() < RATING_SHARE:
+                        buffers[Rating].append(Rating(
+                            user_id=customer_id, order_id=oid, delivery_partner_id=partner,
+                            score=rng.choices([1, 2, 3, 4, 5], [0.04, 0.06, 0.15, 0.35, 0.40])[0],
+                        ))
+                group_id += 1
+                flush()
+        flush(force=True)
+        for model in (Payment, OrderGroup, Order, OrderItem, Rating):
+            self.log(f'  {model.__name__}: {self.counts.get(model.__name__, 0):,}')
+
+    def create_carts(self):
+        self.log('Creating carts...')
+        rng = self.rng('carts')
+        first_cart = self.next_id(Cart)
+        restaurant_range = range(self.n_restaurants)
+        shoppers = [k for k in range(self.n_customers) if rng.random() < CART_SHARE]
+
+        # Lines first, so each cart is written with its totals already summed
+        for chunk in chunked(enumerate(shoppers), self.chunk_size):
+            carts, lines = [], []
+            for n, k in chunk:
+                r = rng.choices(restaurant_range, cum_weights=self.restaurant_cum_weights)[0]
+                item_count, subtotal = 0, 0
+                for item in self.pick_items(rng, r, rng.randint(1, 4)):
+                    quantity = rng.randint(1, 3)
+                    lines.append(CartItem(cart_id=first_cart + n, menu_item_id=item, quantity=quantity))
+                    item_count += quantity
+                    subtotal += self.price_of(item) * quantity
+                carts.append(Cart(
+                    id=first_cart + n, user_id=self.user_id(self.slot_index(k, CUSTOMER_SLOTS)),
+                    item_count=item_count, subtotal=Decimal(subtotal) / 100,
+                ))
+            self.bulk(Cart, carts)
+            self.bulk(CartItem, lines)
+        self.log(f"  Cart: {self.counts.get('Cart', 0):,}")
+        self.log(f"  CartItem: {self.counts.get('CartItem', 0):,}")
+
+    def create_notifications(self):
+        self.log('Creating notifications...')
+        rng = self.rng('notifications')
+
+        def notifications():
+            for i in range(self.n_users):
+                for _ in range(rng.choices([0, 1, 2], [0.5, 0.3, 0.2])[0]):
+                    yield Notification(
+                        user_id=self.user_id(i), message=f'Your order #{rng.randint(1000, 9999)} has been updated.',
+                        read=rng.random() < 0.6,
+                    )
+
+        self.write(Notification, notifications())
+
+    def reset_sequences(self):
+        """Move auto-increment sequences past the explicitly assigned ids"""
+        sql = connection.ops.sequence_reset_sql(no_style(), [
+            Restaurant, Branch, Menu, MenuItem, DeliveryPartner, Payment,
+            OrderGroup, Order, OrderItem, Rating, Cart, CartItem, Notification,
+        ])
+        with connection.cursor() as cursor:
+            for statement in sql:
+                cursor.execute(statement)
+
+
+def accumulate_floats(values):
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from apps.cart.models import Cart, CartItem
+from apps.orders.models import Order, OrderGroup, OrderItem
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Category
+
+User = get_user_model()
+
+
+class FlexFieldsTests(APITestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=self.restaurant, name='Main Branch', phone='123')
+        self.menu = Menu.objects.create(branch=branch, name='Main Menu')
+        category = Category.objects.create(name='Pizza')
+        self.item = MenuItem.objects.create(menu=self.menu, category=category, name='Cheese Pizza', price='10.00')
+        group = OrderGroup.objects.create(customer=self.customer, status='PENDING', total_price='20.00')
+        self.order = Order.objects.create(order_group=group, restaurant=self.restaurant, total_price='20.00')
+        OrderItem.objects.create(order=self.order, menu_item=self.item, quantity=2, price='10.00')
+        self.client.force_authenticate(user=self.customer)
+
+    def test_embeds_are_opt_in(self):
+        restaurant = self.client.get(f'/api/v1/restaurants/restaurants/{self.restaurant.pk}/').data
+        self.assertNotIn('branches', restaurant)
+        order = self.client.get(f'/api/v1/orders/orders/{self.order.pk}/').data
+        self.assertNotIn('restaurant_details', order)
+        self.assertNotIn('menu_item_details', order['items'][0])
+
+        restaurant = self.client.get(
+            f'/api/v1/restaurants/restaurants/{self.restaurant.pk}/', {'expand': 'branches'}
+        ).data
+        self.assertEqual([branch['name'] for branch in restaurant['branches']], ['Main Branch'])
+
+    def test_nested_expand_and_fields(self):
+        response = self.client.get('/api/v1/orders/orders/', {
+            'fields': 'id,items.quantity,items.menu_item_details.name',
+            'expand': 'restaurant_details.branches',
+        })
+        self.assertEqual(response.data['results'], [{
+            'id': self.order.pk,
+            'items': [{'quantity': 2, 'menu_item_details': {'name': 'Cheese Pizza'}}],
+        }])
+
+        order = self.client.get(f'/api/v1/orders/orders/{self.order.pk}/', {'expand': 'restaurant_details.branches'})
+        self.assertEqual(order.data['restaurant_details']['branches'][0]['name'], 'Main Branch')
+
+    def test_unrequested_relations_are_not_queried(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/orders/orders/', {'fields': 'id,total_price'})
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('orders_orderitem', sql)
+        self.assertNotIn('restaurants_restaurant"."name', sql)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/v1/orders/orders/', {'expand': 'items.menu_item_details,restaurant_details.branches'})
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertIn('restaurants_menuitem', sql)
+        self.assertIn('restaurants_branch', sql)
+
+    def test_cart_fields(self):
+        cart = Cart.objects.create(user=self.customer)
+        CartItem.objects.create(cart=cart, menu_item=self.item, quantity=3)
+        with self.assertNumQueries(1):  # the totals live on the cart row; no lines are loaded
+            data = self.client.get('/api/v1/cart/', {'fields': 'id,subtotal'}).data['data']
+        self.assertEqual(set(data), {'id', 'subtotal'})
+
+        data = self.client.get('/api/v1/cart/', {'fields': 'items.restaurant_name,items.subtotal'}).data['data']
+        self.assertEqual(data['items'], [{'restaurant_name': 'Pizza Place', 'subtotal': 30}])
+
+    def test_fields_do_not_narrow_writes(self):
+        response = self.client.post('/api/v1/restaurants/restaurants/?fields=id', {'name': 'Taco Stand'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+        response = self.client.post(
+            '/api/v1/restaurants/restaurants/?fields=id',
+            {'name': 'Taco Stand', 'phone': '555', 'email': 'tacos@example.com'},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(set(response.data), {'id'})
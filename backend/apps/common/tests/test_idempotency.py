@@ -0,0 +1,139 @@
+import threading
+from types import SimpleNamespace
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from apps.common.utils import APIResponse, idempotent
+
+
+class CountingView(APIView):
+    """Counts executions; optionally blocks until released"""
+    authentication_classes = []
+    permission_classes = []
+    calls = 0
+    entered = None
+    release = None
+    status_code = 201
+
+    @idempotent
+    def post(self, request):
+        type(self).calls += 1
+        if self.entered is not None:
+            self.entered.set()
+            self.release.wait(5)
+        return APIResponse.success("Created", {'call': type(self).calls}, status_code=self.status_code)
+
+
+@override_settings(IDEMPOTENCY_POLL_INTERVAL=0.01)
+class IdempotencyTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = SimpleNamespace(pk=1, is_authenticated=True)
+        CountingView.calls = 0
+        CountingView.entered = CountingView.release = None
+        CountingView.status_code = 201
+
+    def post(self, key=None, data=None, user=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        request = self.factory.post('/things/', data or {'a': 1}, format='json', **headers)
+        force_authenticate(request, user=user or self.user)
+        return CountingView.as_view()(request)
+
+    def test_retry_replays_stored_response(self):
+        first = self.post('key-1')
+        second = self.post('key-1')
+
+        self.assertEqual(CountingView.calls, 1)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_requests_without_key_always_run(self):
+        self.post()
+        self.post()
+        self.assertEqual(CountingView.calls, 2)
+
+    def test_keys_are_scoped_per_user(self):
+        self.post('key-1')
+        self.post('key-1', user=SimpleNamespace(pk=2, is_authenticated=True))
+        self.assertEqual(CountingView.calls, 2)
+
+    def test_key_reused_with_different_payload_is_rejected(self):
+        self.post('key-1', {'a': 1})
+        response = self.post('key-1', {'a': 2})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(CountingView.calls, 1)
+
+    def test_server_errors_are_not_stored(self):
+        CountingView.status_code = 503
+        self.post('key-1')
+        CountingView.status_code = 201
+        response = self.post('key-1')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CountingView.calls, 2)
+
+    def test_concurrent_duplicate_waits_for_first(self):
+        CountingView.entered, CountingView.release = threading.Event(), threading.Event()
+        responses = {}
+
+        first = threading.Thread(target=lambda: responses.setdefault('first', self.post('key-1')))
+        first.start()
+        self.assertTrue(CountingView.entered.wait(5))
+
+        second = threading.Thread(target=lambda: responses.setdefault('second', self.post('key-1')))
+        second.start()
+        second.join(0.1)
+        self.assertTrue(second.is_alive())  # blocked behind the in-flight request
+
+        CountingView.release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(CountingView.calls, 1)
+        self.assertEqual(responses['second'].data, responses['first'].data)
+        self.assertEqual(responses['second']['Idempotent-Replayed'], 'true')
+
+    @override_settings(IDEMPOTENCY_LOCK_TIMEOUT=0.05)
+    def test_duplicate_gives_up_when_first_never_finishes(self):
+        CountingView.entered, CountingView.release = threading.Event(), threading.Event()
+        first = threading.Thread(target=lambda: self.post('key-1'))
+        first.start()
+        self.assertTrue(CountingView.entered.wait(5))
+
+        response = self.post('key-1')
+        CountingView.release.set()
+        first.join(5)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(CountingView.calls, 1)
+
+
+@override_settings(CACHES=settings.SHARED_CACHES)
+class SharedCacheIdempotencyTests(TestCase):
+    """With the configured backend, keys and responses are visible to every worker"""
+
+    def setUp(self):
+        cache.clear()
+        CountingView.calls = 0
+        CountingView.entered = CountingView.release = None
+        CountingView.status_code = 201
+
+    def post(self):
+        request = APIRequestFactory().post('/things/', {'a': 1}, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        force_authenticate(request, user=SimpleNamespace(pk=1, is_authenticated=True))
+        return CountingView.as_view()(request)
+
+    def test_response_is_stored_in_the_shared_table(self):
+        self.post()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT cache_key FROM {settings.CACHE_TABLE}')
+            keys = [key for key, in cursor.fetchall()]
+        self.assertTrue(any('idempotency:response:' in key for key in keys))
+
+        retry = self.post()
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(CountingView.calls, 1)
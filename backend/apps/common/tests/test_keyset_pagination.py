@@ -0,0 +1,80 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from apps.payments.models import Payment
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(APITestCase):
+    url = '/api/v1/payments/payments/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='payer@example.com', password='password123')
+        other = User.objects.create_user(email='other@example.com', password='password123')
+        start = timezone.now()
+        self.payments = [
+            Payment.objects.create(
+                user=self.user, method='card', transaction_id=f'tx-{n}', status='PAID',
+                amount=Decimal(n % 5),  # ties across pages
+                paid_at=None if n % 7 == 0 else start - timedelta(minutes=n % 11, microseconds=n),
+            )
+            for n in range(47)
+        ]
+        Payment.objects.create(user=other, method='card', transaction_id='tx-other', status='PAID', amount=1)
+        self.client.force_authenticate(user=self.user)
+
+    def walk(self, params):
+        """Follow links from the first page; returns the pks of every page in order"""
+        pages = []
+        response = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append([row['id'] for row in response.data['results']])
+            if not response.data['next']:
+                return pages
+            response = self.client.get(response.data['next'])
+
+    def expected(self, key, descending):
+        """The order the paginator promises: NULL largest, pk as tie-breaker in the same direction"""
+        def sort_key(payment):
+            value = getattr(payment, key)
+            return value is None, value
+        ordered = sorted(self.payments, key=lambda p: p.pk, reverse=descending)
+        ordered.sort(key=sort_key, reverse=descending)
+        return [payment.pk for payment in ordered]
+
+    def test_pages_cover_every_row_once_in_order(self):
+        for ordering in ('', 'amount', '-amount', 'paid_at', '-paid_at'):
+            pages = self.walk({'ordering': ordering} if ordering else {})
+            self.assertEqual([len(page) for page in pages], [20, 20, 7], ordering)
+            key = ordering.lstrip('-') or 'pk'
+            descending = ordering.startswith('-') or not ordering
+            self.assertEqual(sum(pages, []), self.expected(key, descending), ordering)
+
+    def test_previous_links_walk_back(self):
+        response = self.client.get(self.url, {'ordering': 'paid_at'})
+        first = [row['id'] for row in response.data['results']]
+        self.assertIsNone(response.data['previous'])
+        second = self.client.get(response.data['next'])
+        self.assertNotIn('count', second.data)
+        back = self.client.get(second.data['previous'])
+        self.assertEqual([row['id'] for row in back.data['results']], first)
+
+    def test_no_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries))
+
+    def test_page_numbers_still_work(self):
+        response = self.client.get(self.url, {'page': 3})
+        self.assertEqual(response.data['count'], 47)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_invalid_cursor(self):
+        for cursor in ('garbage', 'eyJ2IjpbMV0sImIiOmZhbHNlfQ', 'eyJ2IjpbIngiLDFdLCJiIjpmYWxzZX0'):
+            self.assertEqual(self.client.get(self.url, {'cursor': cursor, 'ordering': 'amount'}).status_code, 404)
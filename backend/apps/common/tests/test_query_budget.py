@@ -0,0 +1,276 @@
+"""
+Query-count regression suite for every API endpoint.
+
+Each endpoint is called as each role against a seeded dataset, recording the
+query count, wall time and payload size, with the database cache backend so
+that cache reads and writes are counted as queries. Results are compared against
+query_baselines.json; run with UPDATE_QUERY_BASELINES=1 to rewrite it after an
+intentional change. Every endpoint is measured twice, before and after the
+dataset grows, and must issue the same number of queries both times. Endpoints
+listed with a body are POSTed that JSON instead, so they must be repeatable.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.accounts.cache import disabled_cache, user_cache
+from apps.restaurants.autocomplete import reset_index
+from apps.restaurants.models import (
+    Restaurant, Branch, Menu, MenuItem, Category, Cuisine, DeliveryZone, OpeningHours
+)
+from apps.locations.models import Country, City, Address, UserAddress
+from apps.orders.models import OrderGroup, Order, OrderItem
+from apps.delivery.models import DeliveryPartner, DeliveryStatus
+from apps.payments.models import Payment
+from apps.ratings.models import Rating
+from apps.cart.models import Cart, CartItem
+
+User = get_user_model()
+
+BASELINE_PATH = Path(__file__).with_name('query_baselines.json')
+UPDATE_BASELINES = os.environ.get('UPDATE_QUERY_BASELINES') == '1'
+
+# Allowed drift before a baseline counts as regressed (queries must never grow)
+PAYLOAD_TOLERANCE = 1.10
+WALL_TIME_TOLERANCE = 5.0
+WALL_TIME_FLOOR_MS = 100.0
+WALL_TIME_SAMPLES = 3  # best-of-N keeps GC pauses and scheduler noise out
+
+ROLES = ['anonymous', 'customer', 'owner', 'driver', 'staff']
+
+ENDPOINTS = [
+    ('auth-me', '/api/v1/auth/me/'),
+    ('restaurants-list', '/api/v1/restaurants/restaurants/'),
+    ('restaurants-detail', '/api/v1/restaurants/restaurants/{restaurant}/'),
+    ('restaurants-list-expanded', '/api/v1/restaurants/restaurants/?expand=branches'),
+    ('branches-list', '/api/v1/restaurants/branches/'),
+    ('branches-detail', '/api/v1/restaurants/branches/{branch}/'),
+    ('branches-nearby', '/api/v1/restaurants/branches/nearby/?lat=40.0&lng=-74.0&radius_km=50'),
+    ('restaurants-list-deliver-to', '/api/v1/restaurants/restaurants/?deliver_to=40.0,-74.0'),
+    ('delivery-zones-list', '/api/v1/restaurants/delivery-zones/'),
+    ('delivery-zones-detail', '/api/v1/restaurants/delivery-zones/{delivery_zone}/'),
+    ('opening-hours-list', '/api/v1/restaurants/opening-hours/'),
+    ('opening-hours-detail', '/api/v1/restaurants/opening-hours/{opening_hours}/'),
+    ('autocomplete', '/api/v1/restaurants/autocomplete/?q=res'),
+    ('menus-list', '/api/v1/restaurants/menus/'),
+    ('menus-detail', '/api/v1/restaurants/menus/{menu}/'),
+    ('menu-items-list', '/api/v1/restaurants/menu-items/'),
+    ('menu-items-detail', '/api/v1/restaurants/menu-items/{menu_item}/'),
+    ('menu-items-list-facets', '/api/v1/restaurants/menu-items/?facets=true'),
+    ('cuisines-list', '/api/v1/restaurants/cuisines/'),
+    ('cuisines-detail', '/api/v1/restaurants/cuisines/{cuisine}/'),
+    ('categories-list', '/api/v1/restaurants/categories/'),
+    ('categories-detail', '/api/v1/restaurants/categories/{category}/'),
+    ('order-groups-list', '/api/v1/orders/order-groups/'),
+    ('order-groups-list-expanded', '/api/v1/orders/order-groups/?expand=orders.restaurant_details'),
+    ('order-groups-detail', '/api/v1/orders/order-groups/{order_group}/'),
+    ('orders-list', '/api/v1/orders/orders/'),
+    ('orders-detail', '/api/v1/orders/orders/{order}/'),
+    ('orders-list-expanded', '/api/v1/orders/orders/?expand=restaurant_details.branches,items.menu_item_details'),
+    ('orders-list-sparse', '/api/v1/orders/orders/?fields=id,total_price,items.quantity'),
+    ('order-items-list', '/api/v1/orders/order-items/'),
+    ('order-items-detail', '/api/v1/orders/order-items/{order_item}/'),
+    ('cart-detail', '/api/v1/cart/'),
+    ('cart-batch', '/api/v1/cart/batch/', {'operations': [
+        {'op': 'set', 'menu_item': '{menu_item}', 'quantity': 2},
+        {'op': 'add', 'menu_item': '{other_menu_item}', 'quantity': 1},
+        {'op': 'remove', 'menu_item': '{other_menu_item}'},
+    ]}),
+    ('locations-list', '/api/v1/locations/locations/'),
+    ('delivery-partners-list', '/api/v1/delivery/partners/'),
+    ('delivery-partners-detail', '/api/v1/delivery/partners/{partner}/'),
+    ('delivery-available-orders', '/api/v1/delivery/partners/available_orders/'),
+    ('delivery-statuses-list', '/api/v1/delivery/statuses/'),
+    ('delivery-statuses-detail', '/api/v1/delivery/statuses/{status}/'),
+    ('payments-list', '/api/v1/payments/payments/'),
+    ('payments-detail', '/api/v1/payments/payments/{payment}/'),
+    ('ratings-list', '/api/v1/ratings/ratings/'),
+    ('ratings-detail', '/api/v1/ratings/ratings/{rating}/'),
+]
+
+
+def fill(body, ids):
+    """Substitute {placeholders} in the string values of a request body"""
+    if isinstance(body, dict):
+        return {key: fill(value, ids) for key, value in body.items()}
+    if isinstance(body, list):
+        return [fill(value, ids) for value in body]
+    return body.format(**ids) if isinstance(body, str) else body
+
+
+@override_settings(CACHES=settings.SHARED_CACHES)  # cache round trips count, as they do in production
+class EndpointQueryBudgetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        disabled_cache.clear()
+        reset_index()
+        self.customer = User.objects.create_user(
+            email='customer@example.com', password='password123', is_email_verified=True
+        )
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.driver_user = User.objects.create_user(email='driver@example.com', password='password123')
+        self.staff = User.objects.create_user(email='staff@example.com', password='password123', is_staff=True)
+        self.users = {
+            'anonymous': None,
+            'customer': self.customer,
+            'owner': self.owner,
+            'driver': self.driver_user,
+            'staff': self.staff,
+        }
+
+        self.driver = DeliveryPartner.objects.create(user=self.driver_user, vehicle_type='Bike')
+        self.pending = DeliveryStatus.objects.create(status='PENDING')
+        country = Country.objects.create(name='Test Country', code='TC', currency='USD', timezone='UTC')
+        self.city = City.objects.create(name='Test City', country=country)
+        self.cart = Cart.objects.create(user=self.customer)
+        for user in (self.owner, self.driver_user, self.staff):
+            Cart.objects.create(user=user)
+        self.seeded = 0
+
+    def seed(self, restaurants):
+        """Add restaurants, each with branches, menus, orders, payments and ratings"""
+        for _ in range(restaurants):
+            n = self.seeded
+            self.seeded += 1
+            restaurant = Restaurant.objects.create(
+                name=f'Restaurant {n}', owner=self.owner, phone='123',
+                email=f'r{n}@example.com', is_approved=True, is_active=True
+            )
+            cuisine = Cuisine.objects.create(name=f'Cuisine {n}')
+            category = Category.objects.create(name=f'Category {n}')
+
+            for b in range(2):
+                address = Address.objects.create(
+                    street_address=f'{n}{b} Main St', city=self.city, state='State', postal_code='12345'
+                )
+                latitude, longitude = 40.0 + n * 0.01, -74.0 + b * 0.01
+                branch = Branch.objects.create(
+                    restaurant=restaurant, name=f'Branch {n}-{b}', phone='123', address=address,
+                    latitude=latitude, longitude=longitude
+                )
+                opening_hours = OpeningHours.objects.create(
+                    branch=branch, weekday=OpeningHours.Weekday.MONDAY, opens='09:00', closes='17:00'
+                )
+                delivery_zone = DeliveryZone.objects.create(branch=branch, name=f'Zone {n}-{b}', polygon=[
+                    [latitude - 0.1, longitude - 0.1], [latitude - 0.1, longitude + 0.1],
+                    [latitude + 0.1, longitude + 0.1], [latitude + 0.1, longitude - 0.1],
+                ])
+                UserAddress.objects.create(user=self.customer, address=address)
+                menu = Menu.objects.create(branch=branch, name=f'Menu {n}-{b}')
+                items = [
+                    MenuItem.objects.create(
+                        menu=menu, category=category, cuisine=cuisine,
+                        name=f'Item {n}-{b}-{i}', price='10.00'
+                    )
+                    for i in range(3)
+                ]
+
+            CartItem.objects.create(cart=self.cart, menu_item=items[0], quantity=1)
+
+            payment = Payment.objects.create(
+                user=self.customer, amount='20.00', method='CASH',
+                transaction_id=f'TXN-{n}', status='COMPLETED'
+            )
+            group = OrderGroup.objects.create(
+                customer=self.customer, status='PENDING', total_price='20.00', payment=payment
+            )
+            order = Order.objects.create(
+                order_group=group, restaurant=restaurant, delivery_status=self.pending, total_price='20.00'
+            )
+            for item in items[:2]:
+                OrderItem.objects.create(order=order, menu_item=item, quantity=1, price=item.price)
+            Rating.objects.create(user=self.customer, order=order, delivery_partner=self.driver, score=5)
+
+            if n == 0:
+                self.ids = {
+                    'restaurant': restaurant.id,
+                    'branch': branch.id,
+                    'menu': menu.id,
+                    'menu_item': items[0].id,
+                    'other_menu_item': items[1].id,
+                    'delivery_zone': delivery_zone.id,
+                    'opening_hours': opening_hours.id,
+                    'cuisine': cuisine.id,
+                    'category': category.id,
+                    'order_group': group.id,
+                    'order': order.id,
+                    'order_item': OrderItem.objects.filter(order=order).first().id,
+                    'partner': self.driver.id,
+                    'status': self.pending.id,
+                    'payment': payment.id,
+                    'rating': Rating.objects.get(order=order).id,
+                }
+
+    def measure_all(self):
+        """Call every endpoint as every role and collect its metrics"""
+        results = {}
+        for role in ROLES:
+            user = self.users[role]
+            for name, url, *body in ENDPOINTS:
+                path = url.format(**self.ids)
+                timings = []
+                for _ in range(WALL_TIME_SAMPLES):
+                    # A fresh instance per request, as authentication would hand out
+                    self.client.force_authenticate(user=User.objects.get(pk=user.pk) if user else None)
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        if body:
+                            response = self.client.post(path, fill(body[0], self.ids), format='json')
+                        else:
+                            response = self.client.get(path)
+                        timings.append((time.perf_counter() - started) * 1000)
+                results[f'{name}:{role}'] = {
+                    'status': response.status_code,
+                    'queries': len(queries),
+                    'wall_ms': round(min(timings), 2),
+                    'bytes': len(response.content),
+                }
+        self.client.force_authenticate(user=None)
+        return results
+
+    def test_query_counts_flat_and_within_baseline(self):
+        self.seed(2)
+        small = self.measure_all()
+        self.seed(4)
+        large = self.measure_all()
+
+        growth = [
+            f"{key}: {small[key]['queries']} -> {large[key]['queries']} queries"
+            for key in small
+            if small[key]['queries'] != large[key]['queries']
+        ]
+        self.assertEqual(growth, [], 'Query count grows with the dataset (N+1):\n' + '\n'.join(growth))
+
+        if UPDATE_BASELINES:
+            BASELINE_PATH.write_text(json.dumps(large, indent=2, sort_keys=True) + '\n')
+            return
+
+        baselines = json.loads(BASELINE_PATH.read_text())
+        regressions = []
+        for key, current in sorted(large.items()):
+            baseline = baselines.get(key)
+            if baseline is None:
+                regressions.append(f'{key}: no baseline recorded')
+                continue
+            if current['status'] != baseline['status']:
+                regressions.append(f"{key}: status {baseline['status']} -> {current['status']}")
+            if current['queries'] > baseline['queries']:
+                regressions.append(f"{key}: queries {baseline['queries']} -> {current['queries']}")
+            if current['bytes'] > baseline['bytes'] * PAYLOAD_TOLERANCE:
+                regressions.append(f"{key}: payload {baseline['bytes']} -> {current['bytes']} bytes")
+            wall_budget = max(baseline['wall_ms'] * WALL_TIME_TOLERANCE, WALL_TIME_FLOOR_MS)
+            if current['wall_ms'] > wall_budget:
+                regressions.append(f"{key}: wall time {baseline['wall_ms']} -> {current['wall_ms']} ms")
+
+        self.assertEqual(
+            regressions, [],
+            'Endpoint baselines regressed (UPDATE_QUERY_BASELINES=1 to accept):\n' + '\n'.join(regressions)
+        )
@@ -0,0 +1,189 @@
+import threading
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.common.mixins import SingleFlightMixin
+from apps.common.utils import SingleFlight
+from apps.common.views import SingleFlightStatsView
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+
+    def run(index):
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class SlowCounter:
+    """compute() that counts calls and stays in flight until released"""
+
+    def __init__(self, result='payload', fail_first=False):
+        self.calls = 0
+        self.result = result
+        self.fail_first = fail_first
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        first = self.calls == 1
+        if first:
+            self.entered.set()
+            self.release.wait(5)
+            if self.fail_first:
+                raise RuntimeError('leader failed')
+        return self.result
+
+
+@override_settings(SINGLE_FLIGHT_POLL_INTERVAL=0.01)
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.flight = SingleFlight('test')
+
+    def start_leader(self, compute, key='menu:1', **kwargs):
+        outcome = {}
+
+        def lead():
+            try:
+                outcome['result'] = self.flight.do(key, compute, **kwargs)
+            except RuntimeError as error:
+                outcome['error'] = error
+
+        thread = threading.Thread(target=lead)
+        thread.start()
+        compute.entered.wait(5)
+        return thread, outcome
+
+    def test_concurrent_calls_share_one_computation(self):
+        compute = SlowCounter()
+        leader, outcome = self.start_leader(compute)
+        threading.Timer(0.05, compute.release.set).start()
+        self.assertEqual(run_concurrently(4, lambda: self.flight.do('menu:1', compute)), ['payload'] * 4)
+        leader.join()
+        self.assertEqual(outcome['result'], 'payload')
+        self.assertEqual(compute.calls, 1)
+        self.assertEqual(
+            self.flight.stats(), {'in_flight': 0, 'computed': 1, 'collapsed': 4, 'shared': 0, 'timeouts': 0}
+        )
+
+    def test_keys_are_independent_and_finished_calls_are_not_reused(self):
+        self.assertEqual(self.flight.do('a', lambda: 1), 1)
+        self.assertEqual(self.flight.do('b', lambda: 2), 2)
+        self.assertEqual(self.flight.do('a', lambda: 3), 3)
+        self.assertEqual(self.flight.stats()['computed'], 3)
+
+    def test_followers_compute_themselves_when_the_leader_fails(self):
+        compute = SlowCounter(fail_first=True)
+        leader, outcome = self.start_leader(compute)
+        threading.Timer(0.05, compute.release.set).start()
+        self.assertEqual(run_concurrently(2, lambda: self.flight.do('menu:1', compute)), ['payload'] * 2)
+        leader.join()
+        self.assertIsInstance(outcome['error'], RuntimeError)
+        self.assertEqual(self.flight.stats()['collapsed'], 0)
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.1)
+    def test_followers_stop_waiting_for_a_slow_leader(self):
+        compute = SlowCounter()
+        leader, _ = self.start_leader(compute)
+        self.assertEqual(self.flight.do('menu:1', compute), 'payload')
+        compute.release.set()
+        leader.join()
+        self.assertEqual(self.flight.stats()['timeouts'], 1)
+
+    def test_cross_process_waits_for_the_lock_holders_result(self):
+        # Another process holds the lock and publishes its result a moment later
+        cache.add('singleflight:test:menu:1:lock', 1)
+        threading.Timer(0.05, lambda: cache.set('singleflight:test:menu:1:result', 'theirs')).start()
+        self.assertEqual(self.flight.do('menu:1', lambda: 'ours', cross_process=True), 'theirs')
+        self.assertEqual(self.flight.stats()['shared'], 1)
+
+    def test_cross_process_leader_publishes_and_unlocks(self):
+        self.assertEqual(self.flight.do('menu:1', lambda: 'ours', cross_process=True), 'ours')
+        self.assertEqual(cache.get('singleflight:test:menu:1:result'), 'ours')
+        self.assertIsNone(cache.get('singleflight:test:menu:1:lock'))
+
+    @override_settings(SINGLE_FLIGHT_WAIT=0.1)
+    def test_cross_process_stops_waiting_for_a_stuck_holder(self):
+        cache.add('singleflight:test:menu:1:lock', 1)
+        self.assertEqual(self.flight.do('menu:1', lambda: 'ours', cross_process=True), 'ours')
+        self.assertEqual(self.flight.stats()['timeouts'], 1)
+
+
+class ListingStub(viewsets.GenericViewSet):
+    """Stands in for ListModelMixin, counting renders"""
+    compute = None
+
+    def list(self, request, *args, **kwargs):
+        response = Response({'results': [type(self).compute()]})
+        response['ETag'] = 'W/"listing"'
+        return response
+
+
+class ListingViewSet(SingleFlightMixin, ListingStub):
+    authentication_classes = []
+    permission_classes = []
+    single_flight_actions = ('list',)
+
+
+class SingleFlightMixinTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.view = ListingViewSet.as_view({'get': 'list'})
+        ListingViewSet.compute = self.compute = SlowCounter()
+        SingleFlight.group('ListingViewSet').reset()
+
+    def get(self, user=None, **headers):
+        request = self.factory.get('/listing/', {'page': 2}, **headers)
+        if user is not None:
+            force_authenticate(request, user)
+        response = self.view(request)
+        response.render()
+        return response
+
+    def start_leader(self, **kwargs):
+        thread = threading.Thread(target=lambda: self.get(**kwargs))
+        thread.start()
+        self.compute.entered.wait(5)
+        threading.Timer(0.05, self.compute.release.set).start()
+        return thread
+
+    def test_concurrent_requests_share_the_response(self):
+        leader = self.start_leader()
+        responses = run_concurrently(3, self.get)
+        leader.join()
+        self.assertEqual(self.compute.calls, 1)
+        for response in responses:
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, {'results': ['payload']})
+            self.assertEqual(response['ETag'], 'W/"listing"')
+        self.assertEqual(SingleFlight.group('ListingViewSet').stats()['collapsed'], 3)
+
+    def test_users_and_conditional_requests_are_not_shared(self):
+        leader = self.start_leader(user=SimpleNamespace(pk=1, is_authenticated=True))
+        self.get(user=SimpleNamespace(pk=2, is_authenticated=True))
+        self.get(user=SimpleNamespace(pk=1, is_authenticated=True), HTTP_IF_NONE_MATCH='W/"listing"')
+        leader.join()
+        self.assertEqual(self.compute.calls, 3)
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.compute.release.set()
+        self.get()
+        view = SingleFlightStatsView.as_view()
+        request = self.factory.get('/health/single-flight/')
+        force_authenticate(request, SimpleNamespace(pk=1, is_authenticated=True, is_staff=False))
+        self.assertEqual(view(request).status_code, 403)
+        force_authenticate(request, SimpleNamespace(pk=1, is_authenticated=True, is_staff=True))
+        response = view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['ListingViewSet']['computed'], 1)
@@ -0,0 +1,29 @@
+from django.core.cache import cache
+from django.test import TestCase
+from apps.common.utils import VersionStamp
+
+
+class VersionStampTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stamp = VersionStamp('tests:version')
+
+    def test_bump_changes_the_shared_version(self):
+        version = self.stamp.get()
+        self.assertEqual(VersionStamp('tests:version').get(), version)
+        self.assertEqual(self.stamp.bump(), version + 1)
+        self.assertEqual(VersionStamp('tests:version').get(), version + 1)
+
+    def test_lost_key_is_reseeded_with_a_new_version(self):
+        version = self.stamp.get()
+        cache.delete('tests:version')
+        self.assertGreater(self.stamp.bump(), version)
+        cache.delete('tests:version')
+        self.assertGreater(self.stamp.get(), version)
+
+    def test_bump_on_commit_bumps_again_after_commit(self):
+        version = self.stamp.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stamp.bump_on_commit()
+            self.assertEqual(self.stamp.get(), version + 1)
+        self.assertEqual(self.stamp.get(), version + 2)
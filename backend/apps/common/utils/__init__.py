@@ -1,6 +1,9 @@
 from .responses import APIResponse, ResponseMessages
 # from .exceptions import BusinessLogicError, custom_exception_handler
 from .validators import validate_phone_number, validate_password_strength
+from .cache import LocalTTLCache, VersionStamp
+from .idempotency import idempotent
+from .singleflight import SingleFlight, single_flight_stats
 # from .permissions import IsOwnerOrReadOnly, IsOwner
 
 __all__ = [
@@ -10,6 +13,11 @@ __all__ = [
     # 'custom_exception_handler',
     'validate_phone_number',
     'validate_password_strength',
+    'LocalTTLCache',
+    'VersionStamp',
+    'idempotent',
+    'SingleFlight',
+    'single_flight_stats',
     # 'IsOwnerOrReadOnly',
     # 'IsOwner',
 ]
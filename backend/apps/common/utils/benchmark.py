@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def rolled_back():
+    """Run a block inside a transaction that is always rolled back"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(fn, iterations=100, warmup=5):
+    """Call fn repeatedly and report throughput, latency and queries per call"""
+    for _ in range(warmup):
+        fn()
+
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - started
+
+    return {
+        'iterations': iterations,
+        'seconds': elapsed,
+        'per_call_ms': (elapsed / iterations) * 1000,
+        'rate': iterations / elapsed if elapsed else float('inf'),
+        'queries_per_call': len(queries) / iterations,
+    }
+
+
+def format_result(label, result):
+    """One-line summary used by the bench_* management commands"""
+    return (
+        f"{label:<32} {result['rate']:>10.1f}/s "
+        f"{result['per_call_ms']:>9.3f} ms/call "
+        f"{result['queries_per_call']:>6.2f} queries/call"
+    )
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import cache
+from django.db import transaction
+
+
+class LocalTTLCache:
+    """Thread-safe, process-local LRU cache with per-entry expiry"""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store value under key; ttl (seconds) overrides the cache default"""
+        ttl = self.ttl if ttl is None else ttl
+        if self.maxsize <= 0 or (ttl is not None and ttl <= 0):
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Evict a single key"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Evict everything and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return hit/miss counters for monitoring"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+        }
+
+
+class VersionStamp:
+    """
+    Version number kept under one key of the default cache backend, so every
+    process sharing the backend sees a bump. Data cached under an old version
+    is simply never read again.
+
+    The backend may be a database table, so hot paths pass get() a max_age:
+    this process then reuses the version it last read or wrote for that long,
+    and other processes' bumps reach it up to max_age seconds late.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._last = None  # (version, monotonic time read or written)
+
+    def get(self, max_age=0):
+        last = self._last
+        if max_age and last is not None and time.monotonic() - last[1] < max_age:
+            return last[0]
+        version = cache.get(self.key)
+        if version is None:
+            # Seed with a timestamp so a lost key can never match stale entries
+            cache.add(self.key, time.time_ns(), timeout=None)
+            version = cache.get(self.key)
+        self._last = (version, time.monotonic())
+        return version
+
+    def bump(self):
+        """Invalidate everything cached under the current version; returns the new one"""
+        try:
+            version = cache.incr(self.key)
+        except ValueError:
+            version = time.time_ns()
+            cache.set(self.key, version, timeout=None)
+        self._last = (version, time.monotonic())  # this process sees its own bump at once
+        return version
+
+    def bump_on_commit(self):
+        """Bump now and again once the current transaction commits"""
+        self.bump()
+        # A reader may cache pre-commit rows in between; the second bump discards them
+        transaction.on_commit(self.bump)
@@ -0,0 +1,100 @@
+import json
+import time
+import hashlib
+import logging
+import functools
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from .responses import APIResponse
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+REPLAY_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(request):
+    """Stable hash of the request payload, to reject a key reused for a different request"""
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored['fingerprint'] != fingerprint:
+        return APIResponse.error(
+            "Idempotency-Key was already used with a different request",
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            error_code='IDEMPOTENCY_KEY_REUSED'
+        )
+    response = Response(stored['data'], status=stored['status'])
+    response[REPLAY_HEADER] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """
+    Make a view method safe to retry with an Idempotency-Key header.
+
+    The first request for a (user, endpoint, key) runs normally and its response
+    is stored for IDEMPOTENCY_KEY_TTL; retries get that response back without
+    re-running the view. A duplicate arriving while the first is still running
+    waits for it instead of executing in parallel. Server errors are not stored,
+    so the client can retry them. Requests without the header are unaffected.
+    Locks and responses live in the shared cache (see CACHES), so a retry that
+    reaches another worker is recognised too.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return APIResponse.error(f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+        scope = hashlib.blake2b(
+            f'{request.user.pk}:{request.method}:{request.path}:{key}'.encode(), digest_size=16
+        ).hexdigest()
+        response_key = f'idempotency:response:{scope}'
+        lock_key = f'idempotency:lock:{scope}'
+        fingerprint = _fingerprint(request)
+
+        stored = cache.get(response_key)
+        if stored is not None:
+            return _replay(stored, fingerprint)
+
+        # The lock outlives the waiting budget, so a slow first request is never
+        # taken over; it only expires on its own if that request died mid-flight
+        deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+        while not cache.add(lock_key, fingerprint, timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT * 2):
+            stored = cache.get(response_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+            if time.monotonic() >= deadline:
+                return APIResponse.error(
+                    "A request with this Idempotency-Key is still being processed",
+                    status_code=status.HTTP_409_CONFLICT,
+                    error_code='IDEMPOTENCY_KEY_IN_PROGRESS'
+                )
+            time.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+
+        try:
+            # The previous holder may have finished between our read and the lock
+            stored = cache.get(response_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code < 500:
+                cache.set(response_key, {
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'data': response.data,
+                }, timeout=settings.IDEMPOTENCY_KEY_TTL)
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
@@ -0,0 +1,123 @@
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = True
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical computations into one.
+
+    The first call for a key runs compute(); calls for the same key arriving
+    while it runs wait for it and get its result. With cross_process, the
+    leader also takes a lock in the cache and leaves its result there for
+    SINGLE_FLIGHT_RESULT_TTL seconds, so leaders in other processes wait for
+    it too. Results shared across processes must be picklable. A follower
+    whose leader fails, or is still running after SINGLE_FLIGHT_WAIT
+    seconds, computes the result itself.
+    """
+    groups = {}
+    _groups_lock = threading.Lock()
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.collapsed = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    @classmethod
+    def group(cls, name):
+        """The process-wide group called name, so its counters are reported together"""
+        with cls._groups_lock:
+            if name not in cls.groups:
+                cls.groups[name] = cls(name)
+            return cls.groups[name]
+
+    def do(self, key, compute, cross_process=False):
+        with self._lock:
+            call = self._calls.get(key)
+            leading = call is None
+            if leading:
+                call = self._calls[key] = _Call()
+        if not leading:
+            return self._follow(call, compute)
+        try:
+            call.result = self._lead(key, compute) if cross_process else self._run(compute)
+            call.failed = False
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _follow(self, call, compute):
+        finished = call.done.wait(settings.SINGLE_FLIGHT_WAIT)
+        if finished and not call.failed:
+            with self._lock:
+                self.collapsed += 1
+            return call.result
+        if not finished:
+            with self._lock:
+                self.timeouts += 1
+        return self._run(compute)
+
+    def _run(self, compute):
+        with self._lock:
+            self.computed += 1
+        return compute()
+
+    def _lead(self, key, compute):
+        lock_key = f'singleflight:{self.name}:{key}:lock'
+        result_key = f'singleflight:{self.name}:{key}:result'
+        deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+        locked = cache.add(lock_key, 1, timeout=settings.SINGLE_FLIGHT_WAIT)
+        while not locked:
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    self.timeouts += 1
+                return self._run(compute)
+            time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+            result = cache.get(result_key, _MISSING)
+            if result is not _MISSING:
+                with self._lock:
+                    self.shared += 1
+                return result
+            locked = cache.add(lock_key, 1, timeout=settings.SINGLE_FLIGHT_WAIT)  # the holder failed
+        try:
+            result = self._run(compute)
+            cache.set(result_key, result, timeout=settings.SINGLE_FLIGHT_RESULT_TTL)
+            return result
+        finally:
+            cache.delete(lock_key)
+
+    def stats(self):
+        """Return this process's counters for monitoring"""
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'computed': self.computed,
+                'collapsed': self.collapsed,
+                'shared': self.shared,
+                'timeouts': self.timeouts,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.computed = self.collapsed = self.shared = self.timeouts = 0
+
+
+def single_flight_stats():
+    """Counters of every group in this process, by name"""
+    return {name: group.stats() for name, group in sorted(SingleFlight.groups.items())}
@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from django.db import connection
-from apps.common.utils import APIResponse
+from apps.common.utils import APIResponse, single_flight_stats
 from time import timezone
 
 class HealthCheckView(APIView):
@@ -30,4 +30,12 @@ class HealthCheckView(APIView):
                 message="Health check failed",
                 errors=str(e),
                 status_code=503
-            )
\ No newline at end of file
+            )
+
+
+class SingleFlightStatsView(APIView):
+    """Request coalescing counters of the process answering, per view"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return APIResponse.success(message="Single-flight counters", data=single_flight_stats())
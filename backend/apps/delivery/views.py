@@ -4,6 +4,8 @@ from rest_framework.response import Response
 from .models import DeliveryPartner, DeliveryStatus
 from .serializers import DeliveryPartnerSerializer, DeliveryStatusSerializer
 from apps.orders.models import Order
+from apps.restaurants.models import Branch
+from apps.restaurants.serializers import NearbyQuerySerializer
 from apps.common.utils import APIResponse
 
 class DeliveryPartnerViewSet(viewsets.ModelViewSet):
@@ -22,9 +24,28 @@ class DeliveryPartnerViewSet(viewsets.ModelViewSet):
         if not pending_status:
              return APIResponse.success("No orders available", [])
              
-        orders = Order.objects.filter(delivery_status=pending_status, delivery_partner__isnull=True)
-        # In real app, filter by location
-        data = [{'id': o.id, 'restaurant': o.restaurant.name, 'total': o.total_price} for o in orders]
+        orders = Order.objects.filter(delivery_status=pending_status, delivery_partner__isnull=True).select_related('restaurant')
+        if 'lat' not in request.query_params and 'lng' not in request.query_params:
+            data = [{'id': o.id, 'restaurant': o.restaurant.name, 'total': o.total_price} for o in orders]
+            return APIResponse.success("Available orders", data)
+
+        # Only orders from restaurants with a branch within radius_km of the partner, nearest first
+        params = NearbyQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return APIResponse.error("Invalid location", errors=params.errors)
+        ranked = Branch.objects.by_distance(
+            params.validated_data['lat'], params.validated_data['lng'], params.validated_data['radius_km'],
+            key='restaurant_id',
+        )
+        distances = {}
+        for distance, restaurant_id in ranked:
+            distances.setdefault(restaurant_id, distance)  # a restaurant is as close as its nearest branch
+        orders = sorted(orders.filter(restaurant_id__in=list(distances)), key=lambda o: distances[o.restaurant_id])
+        data = [
+            {'id': o.id, 'restaurant': o.restaurant.name, 'total': o.total_price,
+             'distance_km': round(distances[o.restaurant_id], 3)}
+            for o in orders[:params.validated_data['limit']]
+        ]
         return APIResponse.success("Available orders", data)
 
     @action(detail=False, methods=['post'], url_path='orders/(?P<pk>[^/.]+)/claim')
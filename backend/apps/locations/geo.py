@@ -0,0 +1,239 @@
+"""
+Geohash cells and great-circle distance for proximity queries without PostGIS.
+
+Rows store the geohash of their coordinates in an indexed column. A radius
+query covers the circle's bounding box with a small set of cells at the finest
+precision that keeps the set small; each cell becomes an index range scan, and
+only those candidates are ranked by haversine distance.
+"""
+import heapq
+import math
+from operator import itemgetter
+from django.db.models import Q
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # about 5m x 5m
+GEOHASH_MAX_LENGTH = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_COVER_CELLS = 24  # index range scans per radius query, before merging neighbours
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if longitude >= mid:
+                value, lng_lo = value * 2 + 1, mid
+            else:
+                value, lng_hi = value * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                value, lat_lo = value * 2 + 1, mid
+            else:
+                value, lat_hi = value * 2, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def geohash_for(latitude, longitude):
+    """Stored geohash for a row's coordinates; blank when either is missing"""
+    if latitude is None or longitude is None:
+        return ''
+    return encode(latitude, longitude)
+
+
+def cell_size(precision):
+    """(height, width) of a cell in degrees"""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    return 180.0 / (1 << (total_bits - lng_bits)), 360.0 / (1 << lng_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(south, north, west, east) in degrees around the circle, or None if it spans every longitude"""
+    latitude, longitude = float(latitude), float(longitude)
+    d_lat = radius_km / KM_PER_DEGREE
+    south, north = max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat)
+    # Longitude degrees shrink towards the poles; size the box for its poleward edge
+    shrink = math.cos(math.radians(max(abs(south), abs(north))))
+    if shrink <= 0 or d_lat / shrink >= 180:
+        return None
+    d_lng = d_lat / shrink
+    return south, north, longitude - d_lng, longitude + d_lng
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=MAX_COVER_CELLS):
+    """
+    Geohash cells that together contain every point within radius_km, or None
+    to mean all of them. Uses the finest precision at which the circle's
+    bounding box needs no more than max_cells cells.
+    """
+    box = bounding_box(latitude, longitude, radius_km)
+    if box is None:
+        return None
+    south, north, west, east = box
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor((north + 90) / height) - math.floor((south + 90) / height) + 1
+        cols = math.floor((east + 180) / width) - math.floor((west + 180) / width) + 1
+        if rows * cols > max_cells:
+            continue
+        cells = set()
+        # Walk the centres of every cell the box touches
+        first_lat = (math.floor((south + 90) / height) + 0.5) * height - 90
+        first_lng = (math.floor((west + 180) / width) + 0.5) * width - 180
+        for row in range(rows):
+            lat = min(first_lat + row * height, 90.0)
+            for col in range(cols):
+                lng = (first_lng + col * width + 180) % 360 - 180
+                cells.add(encode(lat, lng, precision))
+        return sorted(cells)
+    return None
+
+
+def cells_q(field, cells):
+    """
+    Q matching geohashes inside any of the cells, as index range scans.
+
+    Stored hashes only use BASE32 characters, so [cell, cell + 'zzz...'] holds
+    exactly the hashes starting with cell; unlike LIKE 'cell%' it can use a
+    plain B-tree index on every backend. Runs of sibling cells that are
+    adjacent in hash order share one range.
+    """
+    ranges = []
+    for cell in sorted(cells):
+        if ranges:
+            low, high = ranges[-1]
+            if cell[:-1] == high[:-1] and BASE32.index(cell[-1]) == BASE32.index(high[-1]) + 1:
+                ranges[-1] = (low, cell)
+                continue
+        ranges.append((cell, cell))
+    condition = Q()
+    for low, high in ranges:
+        condition |= Q(**{f'{field}__range': (low, high.ljust(GEOHASH_MAX_LENGTH, BASE32[-1]))})
+    return condition
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def nearest(points, latitude, longitude, radius_km, limit):
+    """
+    The limit closest (distance_km, key) pairs among points within radius_km
+    (all of them when limit is None).
+
+    points yields (key, latitude, longitude). The centre's trigonometry is
+    hoisted out of the loop, which is the hot path of every proximity query.
+    """
+    lat0, lng0 = math.radians(float(latitude)), math.radians(float(longitude))
+    cos_lat0 = math.cos(lat0)
+    # Compare on the haversine term itself; only survivors get the asin/sqrt
+    a_max = math.sin(min(radius_km / EARTH_RADIUS_KM, math.pi) / 2) ** 2
+    sin, cos, radians = math.sin, math.cos, math.radians
+
+    def candidates():
+        for key, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            lat, lng = radians(float(lat)), radians(float(lng))
+            a = sin((lat - lat0) / 2) ** 2 + cos_lat0 * cos(lat) * sin((lng - lng0) / 2) ** 2
+            if a <= a_max:
+                yield a, key
+
+    by_distance = itemgetter(0)  # never compare the keys themselves
+    if limit is None:
+        closest = sorted(candidates(), key=by_distance)
+    else:
+        closest = heapq.nsmallest(limit, candidates(), key=by_distance)
+    return [(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a))), key) for a, key in closest]
+
+
+def point_in_polygon(latitude, longitude, polygon):
+    """Even-odd ray casting; polygon is a ring of (latitude, longitude) vertices"""
+    inside = False
+    y, x = float(latitude), float(longitude)
+    n = len(polygon)
+    for i in range(n):
+        y1, x1 = polygon[i - 1]
+        y2, x2 = polygon[i]
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def _segment_touches_box(y1, x1, y2, x2, south, north, west, east):
+    """Liang-Barsky clip of the segment against the box"""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for p, q in ((-dx, x1 - west), (dx, east - x1), (-dy, y1 - south), (dy, north - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                return False
+    return True
+
+
+def rasterize(polygon, precision):
+    """
+    Yield (cell, is_interior) for every geohash cell of this precision that
+    overlaps the polygon. Interior cells lie wholly inside it; the others are
+    crossed by its boundary and need an exact point test. Polygons crossing
+    the antimeridian are not supported.
+    """
+    height, width = cell_size(precision)
+    lats = [float(lat) for lat, _ in polygon]
+    lngs = [float(lng) for _, lng in polygon]
+    edges = [(lats[i - 1], lngs[i - 1], lats[i], lngs[i]) for i in range(len(polygon))]
+    ring = list(zip(lats, lngs))
+
+    row_first = math.floor((min(lats) + 90) / height)
+    row_last = math.floor((max(lats) + 90) / height)
+    col_first = math.floor((min(lngs) + 180) / width)
+    col_last = math.floor((max(lngs) + 180) / width)
+    for row in range(row_first, row_last + 1):
+        south = row * height - 90
+        north = south + height
+        # Only edges spanning this row can cross its cells
+        row_edges = [edge for edge in edges if min(edge[0], edge[2]) <= north and max(edge[0], edge[2]) >= south]
+        for col in range(col_first, col_last + 1):
+            west = col * width - 180
+            east = west + width
+            centre = (south + height / 2, west + width / 2)
+            if any(_segment_touches_box(*edge, south, north, west, east) for edge in row_edges):
+                yield encode(*centre, precision), False
+            elif point_in_polygon(*centre, ring):
+                yield encode(*centre, precision), True
+
+
+def raster_precision(polygon, max_cells, finest):
+    """Finest precision (at most finest) whose cells cover the polygon's bounding box in max_cells or fewer"""
+    lats = [float(lat) for lat, _ in polygon]
+    lngs = [float(lng) for _, lng in polygon]
+    for precision in range(finest, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor((max(lats) + 90) / height) - math.floor((min(lats) + 90) / height) + 1
+        cols = math.floor((max(lngs) + 180) / width) - math.floor((min(lngs) + 180) / width) + 1
+        if rows * cols <= max_cells:
+            return precision
+    return 1
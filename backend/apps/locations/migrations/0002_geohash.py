@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+# Copied from apps.locations.geo at the time of writing, so later changes there
+# don't change what this migration stores
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9
+
+
+def geohash_for(latitude, longitude):
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < GEOHASH_PRECISION:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if longitude >= mid:
+                value, lng_lo = value * 2 + 1, mid
+            else:
+                value, lng_hi = value * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                value, lat_lo = value * 2 + 1, mid
+            else:
+                value, lat_hi = value * 2, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def backfill_geohash(apps, schema_editor):
+    Address = apps.get_model('locations', 'Address')
+    rows = list(Address.objects.filter(latitude__isnull=False, longitude__isnull=False).only('latitude', 'longitude'))
+    for row in rows:
+        row.geohash = geohash_for(row.latitude, row.longitude)
+    Address.objects.bulk_update(rows, ['geohash'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
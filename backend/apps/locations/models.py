@@ -1,6 +1,7 @@
 from django.db import models
 from apps.common.mixins import BaseModel
 from .managers import AddressManager
+from .geo import GEOHASH_MAX_LENGTH, geohash_for
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -41,6 +42,7 @@ class Address(BaseModel):
     # Location coordinates
     latitude                = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True,help_text="Latitude coordinate for precise location")
     longitude               = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True,help_text="Latitude coordinate for precise location")
+    geohash                 = models.CharField(max_length=GEOHASH_MAX_LENGTH, blank=True, default='', db_index=True, editable=False)
     
     # Additional fields
     delivery_instructions   = models.TextField(blank=True, help_text="Special delivery instructions  this address")
@@ -57,6 +59,12 @@ class Address(BaseModel):
         ]
     def __str__(self):
         return self.full_address
+
+    def save(self, *args, **kwargs):
+        self.geohash = geohash_for(self.latitude, self.longitude)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'geohash'}
+        super().save(*args, **kwargs)
     
     @property
     def full_address(self):
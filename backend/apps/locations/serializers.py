@@ -15,14 +15,14 @@ class CountrySerializer(serializers.ModelSerializer):
 class AddressSerializer(serializers.ModelSerializer):
     """Serializer for Address model"""
     
-    country_name = serializers.CharField(source='country.country_name', read_only=True)
+    country_name = serializers.CharField(source='city.country.name', read_only=True)
     full_address = serializers.CharField(read_only=True)
     
     class Meta:
         model = Address
         fields = [
             'id', 'street_address', 'apartment_number', 'city', 
-            'state', 'postal_code', 'country', 'country_name',
+            'state', 'postal_code', 'country_name',
             'latitude', 'longitude', 'delivery_instructions',
             'full_address', 'created_at', 'updated_at'
         ]
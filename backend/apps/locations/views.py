@@ -32,7 +32,7 @@ class AddressListCreateView(APIView):
         user_addresses = UserAddress.objects.filter(
             user=request.user, 
             is_active=True
-        ).select_related('address', 'address__country').order_by('-is_default', '-created_at')
+        ).select_related('address__city__country').order_by('-is_default', '-created_at')
         
         serializer = UserAddressSerializer(user_addresses, many=True)
         
@@ -88,7 +88,7 @@ class AddressDetailView(APIView):
     def get_object(self, pk, user):
         """Get user address object"""
         try:
-            return UserAddress.objects.select_related('address', 'address__country').get(
+            return UserAddress.objects.select_related('address__city__country').get(
                 id=pk,
                 user=user,
                 is_active=True
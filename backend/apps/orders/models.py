@@ -20,6 +20,13 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     delivery_partner = models.ForeignKey('delivery.DeliveryPartner', on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        # (ordering column, pk) for keyset pagination
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='order_created_keyset_idx'),
+            models.Index(fields=['total_price', 'id'], name='order_total_keyset_idx'),
+        ]
+
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE)
     menu_item = models.ForeignKey(MenuItem, on_delete=models.PROTECT)
@@ -1,34 +1,54 @@
 from rest_framework import serializers
+from apps.common.serializers import FlexFieldsModelSerializer
 from .models import OrderGroup, Order, OrderItem
+from apps.restaurants.models import Restaurant
 from apps.restaurants.serializers import RestaurantSerializer, MenuItemSerializer
 from apps.locations.models import Address
 
 class CheckoutSerializer(serializers.Serializer):
+    """Pass context['restaurant_ids'] to also check every restaurant delivers to the address"""
     address_id = serializers.UUIDField()
     payment_method = serializers.CharField(max_length=20, default='CASH')
 
-    def validate_address_id(self, value):
-        if not Address.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Invalid address ID")
-        return value
-
-class OrderItemSerializer(serializers.ModelSerializer):
-    menu_item_details = MenuItemSerializer(source='menu_item', read_only=True)
-
+    def validate(self, attrs):
+        address = Address.objects.filter(id=attrs['address_id']).only('id', 'latitude', 'longitude').first()
+        if address is None:
+            raise serializers.ValidationError({'address_id': ["Invalid address ID"]})
+
+        restaurant_ids = set(self.context.get('restaurant_ids', ()))
+        if restaurant_ids:
+            serving = set(
+                Restaurant.objects.filter(pk__in=restaurant_ids)
+                .delivering_to(address.latitude, address.longitude)
+                .values_list('pk', flat=True)
+            )
+            outside = sorted(restaurant_ids - serving)
+            if outside:
+                raise serializers.ValidationError({
+                    'address_id': ["Address is outside the delivery zone of some restaurants in the cart"],
+                    'restaurants': outside,
+                })
+        attrs['address'] = address
+        return attrs
+
+class OrderItemSerializer(FlexFieldsModelSerializer):
     class Meta:
         model = OrderItem
         fields = '__all__'
+        # ?expand=menu_item_details
+        expandable_fields = {'menu_item_details': (MenuItemSerializer, {'source': 'menu_item'})}
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(FlexFieldsModelSerializer):
     items = OrderItemSerializer(source='orderitem_set', many=True, read_only=True)
-    restaurant_details = RestaurantSerializer(source='restaurant', read_only=True)
 
     class Meta:
         model = Order
         fields = '__all__'
         read_only_fields = ('order_group', 'restaurant', 'total_price', 'created_at', 'delivery_partner')
+        # ?expand=restaurant_details, ?expand=items.menu_item_details
+        expandable_fields = {'restaurant_details': (RestaurantSerializer, {'source': 'restaurant'})}
 
-class OrderGroupSerializer(serializers.ModelSerializer):
+class OrderGroupSerializer(FlexFieldsModelSerializer):
     orders = OrderSerializer(source='order_set', many=True, read_only=True)
 
     class Meta:
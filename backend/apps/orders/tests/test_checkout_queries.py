@@ -0,0 +1,112 @@
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem
+from apps.cart.models import Cart, CartItem
+from apps.orders.models import Order, OrderGroup, OrderItem
+from apps.delivery.models import DeliveryStatus
+from apps.locations.models import Address, City, Country
+
+User = get_user_model()
+
+
+class CheckoutQueryCountTests(APITestCase):
+    checkout_url = '/api/v1/orders/order-groups/checkout/'
+
+    def setUp(self):
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        cache.clear()
+        DeliveryStatus.objects.create(status='PENDING')
+
+        country = Country.objects.create(name='Test Country', code='TC', currency='USD', timezone='UTC')
+        city = City.objects.create(name='Test City', country=country)
+        self.address = Address.objects.create(
+            street_address='123 Main St', city=city, state='State', postal_code='12345'
+        )
+
+        self.menus = []
+        for r in range(3):
+            restaurant = Restaurant.objects.create(
+                name=f'Restaurant {r}', owner=self.owner, phone='123',
+                email=f'r{r}@example.com', is_approved=True
+            )
+            branch = Branch.objects.create(restaurant=restaurant, name='Main', phone='123')
+            self.menus.append(Menu.objects.create(branch=branch, name='Menu'))
+
+        self.cart = Cart.objects.create(user=self.customer)
+        self.client.force_authenticate(user=self.customer)
+
+    def fill_cart(self, lines):
+        """Put lines distinct items, spread over the restaurants, in the cart"""
+        CartItem.objects.filter(cart=self.cart).delete()
+        items = MenuItem.objects.bulk_create([
+            MenuItem(menu=self.menus[n % len(self.menus)], name=f'Item {n}', price=Decimal('2.50') + n)
+            for n in range(lines)
+        ])
+        CartItem.objects.bulk_create([
+            CartItem(cart=self.cart, menu_item=item, quantity=n % 3 + 1) for n, item in enumerate(items)
+        ])
+        Cart.objects.filter(pk=self.cart.pk).recalculate_totals()
+        return items
+
+    def checkout(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.checkout_url, {'address_id': self.address.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(queries)
+
+    def test_query_count_independent_of_cart_size(self):
+        counts = {}
+        for lines in (1, 10, 100):
+            self.fill_cart(lines)
+            _, counts[lines] = self.checkout()
+
+        self.assertEqual(len(set(counts.values())), 1, f'Checkout queries by cart size: {counts}')
+
+    def test_orders_split_by_restaurant_with_totals(self):
+        items = self.fill_cart(10)
+        response, _ = self.checkout()
+
+        group = OrderGroup.objects.get(id=response.data['data']['order_group_id'])
+        expected_total = sum(item.price * (n % 3 + 1) for n, item in enumerate(items))
+        self.assertEqual(group.total_price, expected_total)
+
+        orders = Order.objects.filter(order_group=group)
+        self.assertEqual(orders.count(), 3)
+        for order in orders:
+            order_items = OrderItem.objects.filter(order=order)
+            self.assertTrue(all(line.menu_item.menu.branch.restaurant_id == order.restaurant_id for line in order_items))
+            self.assertEqual(order.total_price, sum(line.price * line.quantity for line in order_items))
+
+        self.assertEqual(OrderItem.objects.filter(order__order_group=group).count(), 10)
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+    def test_cart_is_read_inside_the_transaction(self):
+        """The lines turned into orders are the ones deleted, whatever concurrent cart writes do"""
+        self.fill_cart(3)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.checkout_url, {'address_id': self.address.id}, format='json')
+        statements = [query['sql'] for query in queries]
+        transaction_start = next(i for i, sql in enumerate(statements) if sql.startswith('SAVEPOINT'))
+        cart_reads = [i for i, sql in enumerate(statements) if sql.startswith('SELECT') and '"cart_' in sql]
+        self.assertGreater(min(cart_reads), transaction_start)
+
+    def test_empty_cart_rejected(self):
+        response = self.client.post(self.checkout_url, {'address_id': self.address.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retried_checkout_replays_first_order(self):
+        self.fill_cart(3)
+        headers = {'HTTP_IDEMPOTENCY_KEY': 'checkout-1'}
+        first = self.client.post(self.checkout_url, {'address_id': self.address.id}, format='json', **headers)
+        retry = self.client.post(self.checkout_url, {'address_id': self.address.id}, format='json', **headers)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data['data']['order_group_id'], first.data['data']['order_group_id'])
+        self.assertEqual(OrderGroup.objects.filter(customer=self.customer).count(), 1)
@@ -2,13 +2,25 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
+from django.db.models import Q
 from .models import OrderGroup, Order, OrderItem
 from .serializers import OrderGroupSerializer, OrderSerializer, OrderItemSerializer, CheckoutSerializer
-from apps.cart.models import Cart
+from apps.cart.models import Cart, CartItem
 from apps.delivery.models import DeliveryStatus
-from apps.common.utils import APIResponse
+from apps.common.mixins import FlexFieldsViewMixin
+from apps.common.pagination import KeysetPagination
+from apps.common.utils import APIResponse, idempotent
 
-class OrderGroupViewSet(viewsets.ModelViewSet):
+
+def group_lines_by_restaurant(lines):
+    """Group cart lines by restaurant id, preserving cart order"""
+    grouped = {}
+    for line in lines:
+        grouped.setdefault(line.menu_item.menu.branch.restaurant_id, []).append(line)
+    return grouped
+
+
+class OrderGroupViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
     queryset = OrderGroup.objects.all()
     serializer_class = OrderGroupSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -20,60 +32,67 @@ class OrderGroupViewSet(viewsets.ModelViewSet):
         serializer.save(customer=self.request.user, status='PENDING', total_price=0)
 
     @action(detail=False, methods=['post'])
+    @idempotent
     def checkout(self, request):
-        serializer = CheckoutSerializer(data=request.data)
-        if not serializer.is_valid():
-            return APIResponse.error("Validation Error", serializer.errors)
+        with transaction.atomic():
+            # Lock the cart so concurrent cart writes wait until its lines are turned into orders
+            cart = Cart.objects.select_for_update().filter(user=request.user).only('id').first()
+            # One joined fetch of every cart line with the restaurant it belongs to
+            lines = list(
+                CartItem.objects.filter(cart=cart)
+                .select_related('menu_item__menu__branch')
+                .order_by('id')
+            )
+            lines_by_restaurant = group_lines_by_restaurant(lines)
 
-        cart = Cart.objects.filter(user=request.user).first()
-        if not cart or not cart.items.exists():
-            return APIResponse.error("Cart is empty", status_code=status.HTTP_400_BAD_REQUEST)
+            serializer = CheckoutSerializer(data=request.data, context={'restaurant_ids': list(lines_by_restaurant)})
+            if not serializer.is_valid():
+                return APIResponse.error("Validation Error", serializer.errors)
+            if not lines:
+                return APIResponse.error("Cart is empty", status_code=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            # 1. Create OrderGroup
+            pending_status, _ = DeliveryStatus.objects.get_or_create(status='PENDING')
+            restaurant_totals = {
+                restaurant_id: sum(line.subtotal for line in restaurant_lines)
+                for restaurant_id, restaurant_lines in lines_by_restaurant.items()
+            }
             order_group = OrderGroup.objects.create(
                 customer=request.user,
                 status='PENDING',
-                total_price=cart.total_price
+                total_price=sum(restaurant_totals.values())
             )
 
-            # 2. Group items by restaurant
-            items_by_restaurant = {}
-            for item in cart.items.all():
-                restaurant = item.menu_item.menu.branch.restaurant
-                if restaurant not in items_by_restaurant:
-                    items_by_restaurant[restaurant] = []
-                items_by_restaurant[restaurant].append(item)
-
-            # 3. Create Orders and OrderItems
-            pending_status, _ = DeliveryStatus.objects.get_or_create(status='PENDING')
-            
-            for restaurant, items in items_by_restaurant.items():
-                restaurant_total = sum(item.subtotal for item in items)
-                order = Order.objects.create(
+            orders = Order.objects.bulk_create([
+                Order(
                     order_group=order_group,
-                    restaurant=restaurant,
+                    restaurant_id=restaurant_id,
                     delivery_status=pending_status,
-                    total_price=restaurant_total
+                    total_price=total
                 )
-                
-                for item in items:
-                    OrderItem.objects.create(
-                        order=order,
-                        menu_item=item.menu_item,
-                        quantity=item.quantity,
-                        price=item.menu_item.price
-                    )
-
-            # 4. Clear Cart
-            cart.items.all().delete()
+                for restaurant_id, total in restaurant_totals.items()
+            ])
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    menu_item_id=line.menu_item_id,
+                    quantity=line.quantity,
+                    price=line.menu_item.price
+                )
+                for order, restaurant_lines in zip(orders, lines_by_restaurant.values())
+                for line in restaurant_lines
+            ])
+
+            CartItem.objects.remove_lines(cart.id, lines)
 
         return APIResponse.success("Order placed successfully", {'order_group_id': order_group.id}, status_code=status.HTTP_201_CREATED)
 
-class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderViewSet(FlexFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at', 'total_price']
+    ordering = ['-created_at']
 
     def get_queryset(self):
         user = self.request.user
@@ -81,7 +100,7 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
             return Order.objects.all()
         # Check if user is restaurant owner/manager (simplified check)
         # In a real scenario, we'd check against managed restaurants
-        return Order.objects.filter(order_group__customer=user) | Order.objects.filter(restaurant__owner=user)
+        return Order.objects.filter(Q(order_group__customer=user) | Q(restaurant__owner=user))
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -98,7 +117,7 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
             return APIResponse.success("Status updated")
         return APIResponse.error("Status required")
 
-class OrderItemViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderItemViewSet(FlexFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     permission_classes = [permissions.IsAuthenticated]
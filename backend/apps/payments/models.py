@@ -8,6 +8,14 @@ class Payment(models.Model):
     transaction_id = models.CharField(max_length=100, unique=True)
     status = models.CharField(max_length=20)
     paid_at = models.DateTimeField(null=True)
-    
+
+    class Meta:
+        # Lists are per user: (user, ordering column, pk) for keyset pagination
+        indexes = [
+            models.Index(fields=['user', 'id'], name='payment_user_keyset_idx'),
+            models.Index(fields=['user', 'paid_at', 'id'], name='payment_paid_keyset_idx'),
+            models.Index(fields=['user', 'amount', 'id'], name='payment_amount_keyset_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.amount} ({self.status})"
\ No newline at end of file
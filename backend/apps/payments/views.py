@@ -1,14 +1,22 @@
 from rest_framework import viewsets, permissions
 from .models import Payment
 from .serializers import PaymentSerializer
+from apps.common.pagination import KeysetPagination
+from apps.common.utils import idempotent
 
 class PaymentViewSet(viewsets.ModelViewSet):
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['paid_at', 'amount']
 
     def get_queryset(self):
         return Payment.objects.filter(user=self.request.user)
 
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -9,3 +9,10 @@ class Rating(models.Model):
     score = models.PositiveIntegerField()
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # (ordering column, pk) for keyset pagination
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='rating_created_keyset_idx'),
+            models.Index(fields=['score', 'id'], name='rating_score_keyset_idx'),
+        ]
@@ -1,11 +1,20 @@
 from rest_framework import viewsets, permissions
 from .models import Rating
 from .serializers import RatingSerializer
+from apps.common.pagination import KeysetPagination
+from apps.common.utils import idempotent
 
 class RatingViewSet(viewsets.ModelViewSet):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering_fields = ['created_at', 'score']
+    ordering = ['-created_at']
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
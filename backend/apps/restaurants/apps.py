@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class RestaurantsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.restaurants'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import reinstall_search_indexes
+        post_migrate.connect(reinstall_search_indexes, sender=self)
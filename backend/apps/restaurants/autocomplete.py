@@ -0,0 +1,221 @@
+"""
+In-process prefix index for search-box autocomplete.
+
+Restaurant, menu item, cuisine and city names are indexed under every word
+suffix ("mario's pizza" and "pizza"), lowercased with accents stripped, in
+one sorted list of (key, ref) pairs; a prefix is one bisect range. The top
+results of every prefix up to PRECOMPUTED_PREFIX_LENGTH characters are kept
+ready, since those ranges are the widest; longer prefixes rank their (short)
+range on the fly. Results are ordered by popularity: orders for restaurants,
+ordered quantity for menu items, items for cuisines and branches for cities.
+
+Saves patch the index of the process that made them after commit (see
+signals) and bump a version shared through the cache; other processes
+rebuild when they see a newer version, at most every
+AUTOCOMPLETE_REBUILD_INTERVAL seconds, and serve the previous index while
+doing so. Popularity drifts between rebuilds, so every index is also rebuilt
+after AUTOCOMPLETE_MAX_AGE seconds.
+"""
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from apps.common.utils import VersionStamp
+from apps.locations.models import City
+
+KINDS = ('restaurant', 'menu_item', 'cuisine', 'city')
+PRECOMPUTED_PREFIX_LENGTH = 4
+MAX_KEY_WORDS = 6  # word suffixes indexed per name
+MAX_RESULTS = 20
+END = '\U0010ffff'
+index_version = VersionStamp('restaurants:autocomplete:version')
+
+
+def normalize(text):
+    """Lowercase, accents stripped, whitespace collapsed"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ' '.join(''.join(char for char in text if not unicodedata.combining(char)).casefold().split())
+
+
+def index_keys(label):
+    words = normalize(label).split()
+    return {' '.join(words[start:]) for start in range(min(len(words), MAX_KEY_WORDS))}
+
+
+def entry_rows(kind, ids=None):
+    """(id, label, popularity) of the kind's searchable rows, limited to ids when given"""
+    from .models import Cuisine, MenuItem, Restaurant
+
+    if kind == 'restaurant':
+        queryset = Restaurant.objects.filter(is_approved=True, is_active=True).annotate(popularity=Count('order'))
+    elif kind == 'menu_item':
+        queryset = MenuItem.objects.filter(
+            is_available=True, menu__branch__restaurant__is_approved=True, menu__branch__restaurant__is_active=True
+        ).annotate(popularity=Coalesce(Sum('orderitem__quantity'), 0))
+    elif kind == 'cuisine':
+        queryset = Cuisine.objects.annotate(popularity=Count('menuitem'))
+    else:
+        queryset = City.objects.annotate(popularity=Count('addresses__branch', filter=Q(
+            addresses__branch__restaurant__is_approved=True, addresses__branch__restaurant__is_active=True
+        )))
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    return queryset.order_by().values_list('pk', 'name', 'popularity')
+
+
+class PrefixIndex:
+    """Sorted (key, ref) pairs over {(kind, id): (label, popularity)}; patching returns a new index"""
+
+    def __init__(self, entries, pairs, top, version):
+        self.entries = entries
+        self.pairs = pairs
+        self.top = top  # prefix -> best refs, for prefixes up to PRECOMPUTED_PREFIX_LENGTH
+        self.version = version
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, entries, version):
+        pairs = sorted((key, ref) for ref, (label, _) in entries.items() for key in index_keys(label))
+        candidates = {}
+        for key, ref in pairs:
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                candidates.setdefault(key[:length], set()).add(ref)
+        index = cls(entries, pairs, {}, version)
+        index.top = {prefix: index.best(refs, MAX_RESULTS) for prefix, refs in candidates.items()}
+        return index
+
+    def rank(self, ref):
+        label, popularity = self.entries[ref]
+        return -popularity, label.casefold(), ref
+
+    def best(self, refs, limit):
+        return heapq.nsmallest(limit, refs, key=self.rank)
+
+    def scan(self, prefix, limit):
+        start = bisect.bisect_left(self.pairs, (prefix,))
+        stop = bisect.bisect_left(self.pairs, (prefix + END,), start)
+        return self.best({ref for _, ref in self.pairs[start:stop]}, limit)
+
+    def search(self, text, limit):
+        """[(kind, id, label)] of the most popular names with a word starting with text"""
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            refs = self.top.get(prefix, ())[:limit]
+        else:
+            refs = self.scan(prefix, limit)
+        return [(kind, pk, self.entries[(kind, pk)][0]) for kind, pk in refs]
+
+    def patched(self, changes):
+        """A new index with changes ({ref: (label, popularity) or None to drop}) applied"""
+        entries = dict(self.entries)
+        dropped, added, keys = set(), [], set()
+        for ref, entry in changes.items():
+            old = entries.pop(ref, None)
+            if old is not None:
+                old_keys = index_keys(old[0])
+                dropped.update((key, ref) for key in old_keys)
+                keys |= old_keys
+            if entry is not None:
+                entries[ref] = entry
+                new_keys = index_keys(entry[0])
+                added.extend((key, ref) for key in new_keys)
+                keys |= new_keys
+        # One pass over the pairs however many refs changed
+        kept = [pair for pair in self.pairs if pair not in dropped] if dropped else self.pairs
+        index = PrefixIndex(entries, list(heapq.merge(kept, sorted(added))), dict(self.top), self.version)
+        index.built_at = self.built_at
+        for prefix in {key[:length] for key in keys for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)}:
+            refs = index.scan(prefix, MAX_RESULTS)
+            if refs:
+                index.top[prefix] = refs
+            else:
+                index.top.pop(prefix, None)
+        return index
+
+
+_index = None
+_lock = threading.Lock()
+_pending = threading.local()  # this thread's changes waiting for a commit
+
+
+def build_index():
+    version = index_version.get()  # read first: a write landing during the build bumps it again
+    entries = {
+        (kind, pk): (label, popularity) for kind in KINDS for pk, label, popularity in entry_rows(kind)
+    }
+    return PrefixIndex.build(entries, version)
+
+
+def get_index():
+    """This process's index, rebuilt when another process changed the data or it has aged out"""
+    global _index
+    index = _index
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = build_index()
+            return _index
+    age = time.monotonic() - index.built_at
+    stale = age >= settings.AUTOCOMPLETE_MAX_AGE or (
+        age >= settings.AUTOCOMPLETE_REBUILD_INTERVAL and index.version != index_version.get()
+    )
+    if stale and _lock.acquire(blocking=False):  # whoever is rebuilding, the rest serve the old index
+        try:
+            if _index is index:
+                _index = build_index()
+        finally:
+            _lock.release()
+    return _index
+
+
+def reset_index():
+    global _index
+    _index = None
+
+
+def queue_changes(kind, ids):
+    """
+    Re-read ids (any iterable, evaluated only if needed) of kind once the
+    current transaction commits. Everything queued by then is applied
+    together, as one patch and one version bump.
+    """
+    changes = getattr(_pending, 'changes', None)
+    if changes is None:
+        changes = _pending.changes = {}
+    changes.setdefault(kind, []).append(ids)
+    # Every write schedules a flush; the first one after a commit takes all of them, so
+    # changes left by a rolled-back transaction are only re-read (unchanged) with the next
+    transaction.on_commit(flush_changes)
+
+
+def flush_changes():
+    changes = getattr(_pending, 'changes', None)
+    if changes:
+        _pending.changes = None
+        apply_changes(changes)
+
+
+def apply_changes(changes):
+    """Re-read changes ({kind: [iterables of ids]}) into this process's index and bump the version"""
+    global _index
+    if _index is not None:  # a process without an index has nothing to patch
+        patch = {}
+        for kind, batches in changes.items():
+            ids = {pk for batch in batches for pk in batch}
+            rows = {pk: (label, popularity) for pk, label, popularity in entry_rows(kind, ids)} if ids else {}
+            patch.update({(kind, pk): rows.get(pk) for pk in ids})
+        if patch:
+            with _lock:
+                if _index is not None:
+                    _index = _index.patched(patch)
+    version = index_version.bump()
+    with _lock:
+        if _index is not None and _index.version == version - 1:
+            _index.version = version  # nobody else wrote in between; this index is current
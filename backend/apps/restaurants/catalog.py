@@ -0,0 +1,307 @@
+"""
+In-process columnar engine for menu item browsing (optional, needs NumPy).
+
+With MENU_CATALOG_ENGINE on, each process keeps every menu item's browsing
+columns (price in cents, flag bits, category, cuisine, branch, allergen
+mask and name) in NumPy arrays. A menu-items list page is then one
+vectorized filter, cursor seek and sort over those arrays, and only the
+page's rows are read from the database. Requests the engine cannot answer
+(full-text search, ingredient filters, allergens past the mask, page numbers)
+and processes without NumPy take the ORM path.
+
+Menu item writes append the item's id to MenuItemChange (see signals).
+Engines poll that feed at most every MENU_CATALOG_SYNC_INTERVAL seconds and
+re-read only the changed rows. Each poll re-reads a short overlap, so a
+change committed late is still picked up. Arrays are replaced, never
+modified in place, so readers never see a half-applied sync. Writes that
+skip signals (bulk loads) show up at the next full reload, every
+MENU_CATALOG_MAX_AGE seconds. Page rows are fetched through the request's
+filtered queryset, so a row that no longer matches is dropped rather than
+served.
+
+Names sort by code point, as with SQLite's default collation. Other databases
+order names by their own collation, so there name orderings take the ORM path.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN, Decimal
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend
+from apps.common.pagination import KeysetPagination
+from apps.common.search import FullTextSearchFilter
+from .tags import known_allergen_bits, mask_of, parse_tags
+
+try:
+    import numpy as np
+except ImportError:  # the engine is optional; the ORM serves every request without it
+    np = None
+
+logger = logging.getLogger(__name__)
+
+FLAG_FIELDS = ('is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available')
+ROW_FIELDS = ('pk', 'price', 'name', 'category_id', 'cuisine_id', 'menu__branch_id', 'allergen_mask', *FLAG_FIELDS)
+ID_FILTERS = ('category', 'cuisine', 'branch')
+ENGINE_FILTERS = {*ID_FILTERS, *FLAG_FIELDS, 'min_price', 'max_price', 'exclude_allergens'}
+SORTABLE = ('id', 'price', 'name')
+CODE_POINT_SORTABLE = ('name',)  # text: only where the database compares code points too
+FEED_OVERLAP = timedelta(seconds=5)  # re-read window for changes committed after a poll
+
+
+def cents(price, rounding=ROUND_HALF_EVEN):
+    """Whole cents of a price; bounds round inward to match the ORM's price__gte/price__lte"""
+    return int((Decimal(price) * 100).to_integral_value(rounding))
+
+
+def record_changes(item_ids):
+    """Append menu item ids to the change feed engines poll"""
+    if not settings.MENU_CATALOG_ENGINE or not item_ids:
+        return
+    from .models import MenuItemChange
+
+    now = timezone.now()
+    MenuItemChange.objects.bulk_create([MenuItemChange(item_id=item_id, changed_at=now) for item_id in item_ids])
+
+
+def build_columns(rows):
+    """Column arrays from ROW_FIELDS tuples"""
+    count = len(rows)
+    column = lambda index, convert=int: np.fromiter(
+        (convert(row[index] or 0) for row in rows), dtype=np.int64, count=count
+    )
+    names = np.empty(count, dtype=object)
+    names[:] = [row[2] for row in rows]
+    return {
+        'id': column(0),
+        'price': column(1, cents),
+        'name': names,
+        'category': column(3),  # 0 stands for NULL; ids start at 1
+        'cuisine': column(4),
+        'branch': column(5),
+        'allergen_mask': column(6),
+        'flags': np.fromiter(
+            (sum(1 << bit for bit, value in enumerate(row[7:]) if value) for row in rows), dtype=np.uint8, count=count
+        ),
+        'live': np.ones(count, dtype=bool),
+    }
+
+
+def rank_names(columns):
+    """Add each name's rank among all names, so sorting by name is an integer sort"""
+    columns['name_rank'] = np.unique(columns['name'], return_inverse=True)[1].astype(np.int64).reshape(-1)
+    return columns
+
+
+class MenuCatalog:
+    """Column arrays of every menu item, patched from the change feed"""
+
+    def __init__(self, model):
+        self.model = model
+        self.columns = None
+        self.positions = {}  # item id -> row index
+        self.loaded_at = self.synced_at = None  # time.monotonic() of the last full load and feed poll
+        self.feed_from = None
+        self.lock = threading.Lock()
+
+    def rows(self, queryset):
+        return list(queryset.order_by().values_list(*ROW_FIELDS))
+
+    def load(self):
+        started = timezone.now()
+        columns = rank_names(build_columns(self.rows(self.model.objects.all())))
+        self.positions = {item_id: index for index, item_id in enumerate(columns['id'].tolist())}
+        self.columns = columns
+        self.feed_from = started - FEED_OVERLAP
+        self.loaded_at = self.synced_at = time.monotonic()
+        logger.info(f"Menu catalog loaded: {len(self.positions):,} items")
+
+    def apply_feed(self):
+        from .models import MenuItemChange
+
+        started = timezone.now()
+        changed = set(
+            MenuItemChange.objects.filter(changed_at__gte=self.feed_from).values_list('item_id', flat=True)
+        )
+        if changed:
+            self.patch(self.rows(self.model.objects.filter(pk__in=changed)), changed)
+        self.feed_from = started - FEED_OVERLAP
+        self.synced_at = time.monotonic()
+
+    def patch(self, rows, changed):
+        """New arrays with rows written over (or appended to) the current ones and missing changed ids dropped"""
+        fresh = build_columns(rows)
+        columns = {name: self.columns[name].copy() for name in fresh}
+        positions = dict(self.positions)
+        appended = []
+        for index, item_id in enumerate(fresh['id'].tolist()):
+            position = positions.get(item_id)
+            if position is None:
+                appended.append(index)
+                continue
+            for name, values in fresh.items():
+                columns[name][position] = values[index]
+        for item_id in changed - set(fresh['id'].tolist()):
+            position = positions.get(item_id)
+            if position is not None:
+                columns['live'][position] = False  # deleted
+        if appended:
+            for index in appended:
+                positions[int(fresh['id'][index])] = len(positions)
+            columns = {name: np.concatenate([values, fresh[name][appended]]) for name, values in columns.items()}
+        self.positions = positions
+        self.columns = rank_names(columns)
+
+    def due(self):
+        """'load', 'poll' or None"""
+        now = time.monotonic()
+        if self.loaded_at is None or now - self.loaded_at >= settings.MENU_CATALOG_MAX_AGE:
+            return 'load'
+        if now - self.synced_at >= settings.MENU_CATALOG_SYNC_INTERVAL:
+            return 'poll'
+        return None
+
+    def sync(self):
+        """Reload or poll the feed when due; a thread finding another one at it carries on with the old arrays"""
+        if self.due() is None or not self.lock.acquire(blocking=self.columns is None):
+            return
+        try:
+            due = self.due()  # the thread holding the lock before may have done it
+            if due == 'load':
+                self.load()
+                prune_feed()
+            elif due == 'poll':
+                self.apply_feed()
+        finally:
+            self.lock.release()
+
+    def select(self, columns, query):
+        """Row indexes matching query"""
+        mask = columns['live'].copy()
+        for name in ID_FILTERS:
+            if name in query:
+                mask &= columns[name] == query[name]
+        for bit, name in enumerate(FLAG_FIELDS):
+            if name in query:
+                mask &= ((columns['flags'] >> bit) & 1).astype(bool) == query[name]
+        if 'min_price' in query:
+            mask &= columns['price'] >= query['min_price']
+        if 'max_price' in query:
+            mask &= columns['price'] <= query['max_price']
+        if query.get('allergen_mask'):
+            mask &= (columns['allergen_mask'] & query['allergen_mask']) == 0
+        return np.flatnonzero(mask)
+
+    def page(self, query, keys, values, backwards, limit):
+        """
+        Ids of up to limit items matching query, past the boundary values
+        (all when None), in the order KeysetPagination walks keys
+        """
+        columns = self.columns
+        rows = self.select(columns, query)
+        keys = [(name, descending != backwards) for name, descending in keys]
+        if values is not None:
+            after = np.zeros(len(rows), dtype=bool)
+            ties = np.ones(len(rows), dtype=bool)
+            for (name, descending), value in zip(keys, values):
+                column = columns[name][rows]
+                value = cents(value) if name == 'price' else value
+                after |= ties & ((column < value) if descending else (column > value))
+                ties &= column == value
+            rows = rows[after]
+        sort_keys = []
+        for name, descending in keys:  # always ends with the primary key
+            column = columns['name_rank' if name == 'name' else name][rows]
+            sort_keys.append(-column if descending else column)
+        if len(rows) > limit:
+            # Only rows up to the limit-th smallest first key can be on the page; sort just those
+            cutoff = np.partition(sort_keys[0], limit - 1)[limit - 1]
+            candidates = sort_keys[0] <= cutoff
+            rows, sort_keys = rows[candidates], [key[candidates] for key in sort_keys]
+        order = np.lexsort(sort_keys[::-1])
+        return columns['id'][rows[order[:limit]]].tolist()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def prune_feed():
+    """Drop feed entries every engine has outlived: each one reloads in full after MENU_CATALOG_MAX_AGE"""
+    from .models import MenuItemChange
+
+    cutoff = timezone.now() - timedelta(seconds=2 * settings.MENU_CATALOG_MAX_AGE)
+    MenuItemChange.objects.filter(changed_at__lt=cutoff).delete()
+
+
+def get_catalog():
+    """This process's synced catalog, or None when the engine is off or NumPy is missing"""
+    global _catalog
+    if not settings.MENU_CATALOG_ENGINE or np is None:
+        return None
+    if _catalog is None:
+        from .models import MenuItem
+
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = MenuCatalog(MenuItem)
+    _catalog.sync()
+    return _catalog
+
+
+def reset_catalog():
+    """Forget this process's catalog; the next request loads it again"""
+    global _catalog
+    _catalog = None
+
+
+def catalog_query(view, request):
+    """The engine's form of a menu-items list request's filters, or None if it cannot answer it"""
+    from .models import Allergen
+
+    if request.query_params.get(FullTextSearchFilter.search_param, '').strip():
+        return None
+    filterset = DjangoFilterBackend().get_filterset(request, view.get_queryset(), view)
+    if filterset is None or not filterset.is_valid():
+        return None
+    query = {}
+    for name, value in filterset.form.cleaned_data.items():
+        if value is None or value == '':
+            continue
+        if name not in ENGINE_FILTERS:
+            return None
+        if name == 'exclude_allergens':
+            bits = known_allergen_bits(Allergen, parse_tags(value)).values()
+            if None in bits:
+                return None  # past the mask's capacity; only the ORM can match the text
+            query['allergen_mask'] = mask_of(bits)
+        elif name in ('min_price', 'max_price'):
+            query[name] = cents(value, ROUND_CEILING if name == 'min_price' else ROUND_FLOOR)
+        elif name in FLAG_FIELDS:
+            query[name] = value
+        else:
+            query[name] = int(getattr(value, 'pk', value))
+    return query
+
+
+class CatalogPagination(KeysetPagination):
+    """KeysetPagination that reads pages from the catalog engine when it can answer the request"""
+
+    def fetch_rows(self, queryset, values, backwards):
+        catalog = get_catalog()
+        keys = [(field.name, descending) for field, descending in self.keys]
+        query = None
+        code_points = connections[queryset.db].vendor == 'sqlite'
+        if catalog is not None and all(
+            name in SORTABLE and (code_points or name not in CODE_POINT_SORTABLE) for name, _ in keys
+        ):
+            query = catalog_query(self.view, self.request)
+        if query is None:
+            return super().fetch_rows(queryset, values, backwards)
+        ids = catalog.page(query, keys, values, backwards, self.page_size + 1)
+        ids, more = ids[:self.page_size], len(ids) > self.page_size
+        rows = queryset.order_by().in_bulk(ids)
+        # A candidate that no longer matches is dropped from the page; it doesn't mean the walk has ended
+        return [rows[item_id] for item_id in ids if item_id in rows], more
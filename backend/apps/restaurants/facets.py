@@ -0,0 +1,93 @@
+"""
+Facet counts for menu item browsing.
+
+For every facet (category, cuisine and the dietary and availability flags)
+the counts answer "how many items would match if I picked this value", so
+each facet is counted under every active filter except its own. All of them
+come from one GROUP BY over the facet columns, taken with only the non-facet
+filters (search and the like) applied; each group is then credited to the
+facets whose other predicates it satisfies.
+
+Results are cached under the normalized filter values and the catalog
+version, which menu item writes bump (see signals), so a write is visible on
+the next request in every process.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.filters import OrderingFilter
+from apps.common.search import FullTextSearchFilter, search_terms
+from apps.common.utils import VersionStamp
+
+FACET_FIELDS = ('category', 'cuisine', 'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available')
+FACETS_PARAM = 'facets'
+catalog_version = VersionStamp('restaurants:menu_catalog:version')
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted((_normalize(v) for v in value), key=str)
+    return getattr(value, 'pk', value)
+
+
+def facet_cache_key(filters, terms):
+    """Cache key for cleaned filter values and search terms; equivalent requests share it"""
+    normalized = {
+        'filters': sorted((name, _normalize(value)) for name, value in filters.items()),
+        'search': sorted(set(terms)),
+    }
+    digest = hashlib.sha256(json.dumps(normalized, default=str).encode()).hexdigest()
+    return f'restaurants:menu_facets:{catalog_version.get()}:{digest}'
+
+
+def count_facets(rows, selected):
+    """
+    {facet: [{'value', 'count'}]} from grouped rows, each facet counted under
+    every selected facet value except its own
+    """
+    counts = {name: defaultdict(int) for name in FACET_FIELDS}
+    for row in rows:
+        missed = [name for name, value in selected.items() if row[name] != value]
+        if len(missed) > 1:
+            continue
+        for name in missed or FACET_FIELDS:
+            counts[name][row[name]] += row['count']
+    return {
+        name: [
+            {'value': value, 'count': count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+        for name, values in counts.items()
+    }
+
+
+def menu_item_facets(view, request):
+    """Facet counts for the menu items a list request on view would return, ignoring pagination"""
+    queryset = view.get_queryset()
+    filterset = DjangoFilterBackend().get_filterset(request, queryset, view)
+    filters = {}
+    if filterset is not None and filterset.is_valid():
+        filters = {
+            name: value for name, value in filterset.form.cleaned_data.items()
+            if value is not None and value != '' and value != []
+        }
+    terms = search_terms(request.query_params.get(FullTextSearchFilter.search_param, ''))
+    key = facet_cache_key(filters, terms)
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+
+    selected = {name: _normalize(filters.pop(name)) for name in FACET_FIELDS if name in filters}
+    for name, value in filters.items():
+        queryset = filterset.filters[name].filter(queryset, value)
+    for backend in view.filter_backends:
+        if backend not in (DjangoFilterBackend, OrderingFilter):
+            queryset = backend().filter_queryset(request, queryset, view)
+    rows = queryset.order_by().values(*FACET_FIELDS).annotate(count=Count('pk'))
+    facets = count_facets(rows, selected)
+    cache.set(key, facets, timeout=settings.MENU_FACETS_CACHE_TTL)
+    return facets
@@ -0,0 +1,92 @@
+from uuid import UUID
+from django.utils import timezone
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from apps.locations.models import Address
+from .models import Branch, MenuItem, Restaurant
+from .tags import parse_tags
+
+
+class OpeningHoursFilterSet(filters.FilterSet):
+    """?open_now and ?open_at, for querysets with an open_at(moment) method"""
+    open_now = filters.BooleanFilter(method='filter_open_now', help_text='Open (true) or closed (false) right now')
+    open_at = filters.IsoDateTimeFilter(
+        method='filter_open_at',
+        help_text='Open at this ISO 8601 time; without an offset it is read in the server time zone',
+    )
+
+    def filter_open_now(self, queryset, name, value):
+        open_now = queryset.open_at(timezone.now())
+        if value:
+            return open_now
+        return queryset.exclude(pk__in=open_now.values('pk'))
+
+    def filter_open_at(self, queryset, name, value):
+        return queryset.open_at(value)
+
+
+class BranchFilter(OpeningHoursFilterSet):
+    class Meta:
+        model = Branch
+        fields = ['branch_type', 'restaurant']
+
+
+class MenuItemFilter(filters.FilterSet):
+    min_price = filters.NumberFilter(field_name='price', lookup_expr='gte')
+    max_price = filters.NumberFilter(field_name='price', lookup_expr='lte')
+    branch = filters.NumberFilter(field_name='menu__branch', help_text='Branch ID')
+    exclude_allergens = filters.CharFilter(
+        method='filter_exclude_allergens', help_text='Comma-separated allergens; items listing any are left out'
+    )
+    has_ingredient = filters.CharFilter(
+        method='filter_has_ingredient', help_text='Comma-separated ingredients; items must list all of them'
+    )
+
+    class Meta:
+        model = MenuItem
+        fields = ['category', 'cuisine', 'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available']
+
+    def filter_exclude_allergens(self, queryset, name, value):
+        return queryset.excluding_allergens(parse_tags(value))
+
+    def filter_has_ingredient(self, queryset, name, value):
+        return queryset.with_ingredients(parse_tags(value))
+
+
+class RestaurantFilter(OpeningHoursFilterSet):
+    deliver_to = filters.CharFilter(
+        method='filter_deliver_to',
+        help_text='Only restaurants delivering to this point: "latitude,longitude" or one of your address IDs',
+    )
+
+    class Meta:
+        model = Restaurant
+        fields = ['is_active', 'is_approved']
+
+    def filter_deliver_to(self, queryset, name, value):
+        return queryset.delivering_to(*self.resolve_point(value))
+
+    def resolve_point(self, value):
+        latitude, _, longitude = value.partition(',')
+        try:
+            latitude, longitude = float(latitude), float(longitude)
+        except ValueError:
+            pass
+        else:
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+            raise ValidationError({'deliver_to': ['Coordinates out of range']})
+
+        user = getattr(self.request, 'user', None)
+        try:
+            address_id = UUID(value)
+        except ValueError:
+            raise ValidationError({'deliver_to': ['Expected "latitude,longitude" or an address ID']})
+        address = None
+        if user is not None and user.is_authenticated:
+            address = Address.objects.get_user_addresses(user).filter(pk=address_id).values_list(
+                'latitude', 'longitude'
+            ).first()
+        if address is None:
+            raise ValidationError({'deliver_to': ['Unknown address']})
+        return address
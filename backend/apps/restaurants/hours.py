@@ -0,0 +1,100 @@
+"""
+Weekly opening hours compiled into minute-of-week intervals.
+
+Hours are wall-clock times in the branch's country timezone. Each branch's
+week is compiled into [start_minute, end_minute) rows of local minute-of-week
+(Monday 00:00 is 0) tagged with that timezone, split at midnight so no row
+spans more than a day. "Open at T" converts T to local minute-of-week m once
+per timezone; within a timezone the open rows are those starting between the
+start of m's day and m and ending after it, a single index range scan.
+
+Intervals stay in local time rather than UTC so daylight saving changes need
+no recompiling: the offset is applied to T at query time.
+"""
+from collections import defaultdict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.conf import settings
+from django.db import transaction
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+COMPILE_CHUNK_SIZE = 2000
+
+
+def zone(name):
+    """ZoneInfo for a country's timezone name, or None if it is blank or unknown"""
+    try:
+        return ZoneInfo(name) if name else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def minute_of_week(moment, tz):
+    local = moment.astimezone(tz)
+    return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def weekly_intervals(hours):
+    """
+    Sorted, merged (start_minute, end_minute) pieces for hours given as
+    (weekday, opens, closes). closes at or before opens runs past midnight
+    (equal times mean open around the clock); Sunday nights wrap to Monday.
+    """
+    pieces = []
+    for weekday, opens, closes in hours:
+        start = weekday * MINUTES_PER_DAY + _minutes(opens)
+        end = start + ((_minutes(closes) - _minutes(opens)) % MINUTES_PER_DAY or MINUTES_PER_DAY)
+        while start < end:
+            piece_end = min(end, (start // MINUTES_PER_DAY + 1) * MINUTES_PER_DAY)
+            wrap = start - start % MINUTES_PER_WEEK
+            pieces.append((start - wrap, piece_end - wrap))
+            start = piece_end
+    merged = []
+    for start, end in sorted(pieces):
+        # Only merge within a day, so every row stays inside one day's index range
+        if merged and start <= merged[-1][1] and start // MINUTES_PER_DAY == merged[-1][0] // MINUTES_PER_DAY:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compile_opening_hours(branches):
+    """
+    Recompile the open intervals of the branches in the queryset; returns
+    the number of intervals written. Branches without weekly hours fall back
+    to their legacy daily opening_time/closing_time, if set.
+    """
+    model = branches.model
+    hours_model = model._meta.get_field('opening_hours').related_model
+    interval_model = model._meta.get_field('open_intervals').related_model
+    written = 0
+    ids = list(branches.order_by().values_list('pk', flat=True))
+    for first in range(0, len(ids), COMPILE_CHUNK_SIZE):
+        chunk = ids[first:first + COMPILE_CHUNK_SIZE]
+        weeks = defaultdict(list)
+        for branch_id, *hours in hours_model.objects.filter(branch_id__in=chunk).values_list(
+            'branch_id', 'weekday', 'opens', 'closes'
+        ):
+            weeks[branch_id].append(hours)
+        rows = []
+        for branch_id, opening, closing, tz_name in model.objects.filter(pk__in=chunk).values_list(
+            'pk', 'opening_time', 'closing_time', 'address__city__country__timezone'
+        ):
+            week = weeks.get(branch_id)
+            if week is None and opening is not None and closing is not None:
+                week = [(weekday, opening, closing) for weekday in range(7)]
+            tz_name = tz_name if zone(tz_name) else settings.TIME_ZONE
+            rows.extend(
+                interval_model(branch_id=branch_id, timezone=tz_name, start_minute=start, end_minute=end)
+                for start, end in weekly_intervals(week or ())
+            )
+        with transaction.atomic(using=branches.db):
+            interval_model.objects.filter(branch_id__in=chunk).delete()
+            interval_model.objects.bulk_create(rows)
+        written += len(rows)
+    return written
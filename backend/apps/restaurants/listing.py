@@ -0,0 +1,43 @@
+"""
+Response cache for the restaurant listing.
+
+A listing page is the same for every user of an audience (staff see every
+restaurant, everyone else the approved and active ones), so the serialized
+page is cached under the audience, the normalized query parameters and a
+listing version that Restaurant, Branch, Address and City writes bump (see
+signals). Results that depend on the clock or on the user (open_now, open_at
+and deliver_to) are not cached.
+
+When a key is cold, concurrent requests for it, in any process, share one
+render (see RestaurantViewSet.list and SingleFlightMixin).
+"""
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from apps.common.utils import VersionStamp
+
+listing_version = VersionStamp('restaurants:listing:version')
+UNCACHED_PARAMS = ('open_now', 'open_at', 'deliver_to')
+
+
+def listing_cache_key(request):
+    """Cache key for a listing request, or None if its response may not be shared"""
+    params = request.query_params
+    if any(name in params for name in UNCACHED_PARAMS):
+        return None
+    normalized = {
+        'audience': 'staff' if request.user.is_staff else 'public',
+        'params': sorted((name, sorted(params.getlist(name))) for name in params),
+        'base': request.build_absolute_uri('/'),  # pagination links are absolute
+    }
+    digest = hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+    return f'restaurants:listing:{listing_version.get()}:{digest}'
+
+
+def store_listing(key, response):
+    """Cache a rendered listing page; only successful ones"""
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, timeout=settings.RESTAURANT_LIST_CACHE_TTL)
+    return response
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.restaurants.autocomplete import get_index, reset_index
+from apps.restaurants.models import Branch, Cuisine, Menu, MenuItem, Restaurant
+
+User = get_user_model()
+
+WORDS = ('pizza', 'pasta', 'paneer', 'pad', 'thai', 'tikka', 'taco', 'burger', 'bao', 'curry', 'chicken', 'salad')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark typeahead: restaurant ?search= per keystroke against /autocomplete/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=500, help='Restaurants to seed')
+        parser.add_argument('--items', type=int, default=20000, help='Menu items to seed')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+        keystrokes = ('p', 'pi', 'piz', 'pizz', 'pizza', 'pizza m', 'pizza ma')
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-autocomplete@example.com', password='password123')
+            restaurants = [
+                Restaurant.objects.create(
+                    name=f'{WORDS[n % len(WORDS)].title()} House {n}', owner=owner, phone='123',
+                    email='bench@example.com', is_approved=True,
+                )
+                for n in range(options['restaurants'])
+            ]
+            menus = [
+                Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+                for restaurant in restaurants
+            ]
+            Cuisine.objects.bulk_create([Cuisine(name=f'{word.title()} cuisine') for word in WORDS])
+            MenuItem.objects.bulk_create([
+                MenuItem(
+                    menu=menus[n % len(menus)], price='9.50',
+                    name=f'{WORDS[n % len(WORDS)].title()} {WORDS[n * 7 % len(WORDS)]} {"margherita" if n % 5 else n}',
+                )
+                for n in range(options['items'])
+            ], batch_size=2000)
+            client = APIClient(SERVER_NAME='localhost')
+
+            def typing(url, param):
+                def call():
+                    for text in keystrokes:
+                        response = client.get(url, {param: text})
+                        assert response.status_code == 200, response.status_code
+                return call
+
+            reset_index()
+            index = get_index()
+
+            def lookups():
+                for text in keystrokes:
+                    index.search(text, 8)
+
+            self.stdout.write(f"{len(restaurants):,} restaurants, {options['items']:,} items, "
+                              f"{len(keystrokes)} keystrokes x {iterations}")
+            search = typing('/api/v1/restaurants/restaurants/', 'search')
+            autocomplete = typing('/api/v1/restaurants/autocomplete/', 'q')
+            self.stdout.write(format_result('restaurant ?search= (before)', measure(search, iterations)))
+            self.stdout.write(format_result('/autocomplete/', measure(autocomplete, iterations)))
+            self.stdout.write(format_result('index lookups only', measure(lookups, iterations)))
+            reset_index()
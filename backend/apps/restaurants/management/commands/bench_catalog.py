@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.restaurants.catalog import get_catalog, np, reset_catalog
+from apps.restaurants.models import Branch, Category, Cuisine, Menu, MenuItem, Restaurant
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark filtered, sorted menu item pages: ORM against the NumPy catalog engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=50000, help='Menu items to seed')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('numpy is not installed')
+        iterations = options['requests']
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-catalog@example.com', password='password123')
+            restaurant = Restaurant.objects.create(
+                name='Bench', owner=owner, phone='123', email='bench@example.com', is_approved=True
+            )
+            menu = Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+            categories = Category.objects.bulk_create([Category(name=f'Category {n}') for n in range(12)])
+            cuisines = Cuisine.objects.bulk_create([Cuisine(name=f'Cuisine {n}') for n in range(8)])
+            MenuItem.objects.bulk_create([
+                MenuItem(
+                    menu=menu, name=f'Dish {n * 7919 % options["items"]}', price=f'{n % 40 + 1}.{n % 100:02d}',
+                    category=categories[n % len(categories)], cuisine=cuisines[n % len(cuisines)],
+                    is_vegetarian=n % 2 == 0, is_vegan=n % 5 == 0, is_gluten_free=n % 3 == 0, is_available=n % 9 != 0,
+                )
+                for n in range(options['items'])
+            ], batch_size=2000)
+            client = APIClient(SERVER_NAME='localhost')
+            url = '/api/v1/restaurants/menu-items/'
+            scenarios = (
+                ('cuisine, by price', {'cuisine': cuisines[3].pk, 'ordering': 'price'}),
+                ('vegetarian, price range, by name', {
+                    'is_vegetarian': 'true', 'min_price': '10', 'max_price': '25', 'ordering': '-name',
+                }),
+                ('available, newest', {'is_available': 'true'}),
+            )
+
+            def page(params):
+                def call():
+                    response = client.get(url, params)
+                    assert response.status_code == 200, response.status_code
+                return call
+
+            self.stdout.write(f"{options['items']:,} items x {iterations}")
+            for label, params in scenarios:
+                self.stdout.write(format_result(f'{label} (ORM)', measure(page(params), iterations)))
+                with override_settings(MENU_CATALOG_ENGINE=True, MENU_CATALOG_SYNC_INTERVAL=3600):
+                    reset_catalog()
+                    get_catalog()  # the one-off load is not part of a request
+                    self.stdout.write(format_result(f'{label} (engine)', measure(page(params), iterations)))
+            reset_catalog()
@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.restaurants.models import Branch, Category, Cuisine, Menu, MenuItem, Restaurant
+
+User = get_user_model()
+
+FLAGS = ('is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark menu item facet counts: one filtered request per facet value against ?facets=true'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=5000, help='Menu items to seed')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-facets@example.com', password='password123')
+            restaurant = Restaurant.objects.create(
+                name='Bench', owner=owner, phone='123', email='bench@example.com', is_approved=True
+            )
+            menu = Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+            categories = Category.objects.bulk_create([Category(name=f'Category {n}') for n in range(12)])
+            cuisines = Cuisine.objects.bulk_create([Cuisine(name=f'Cuisine {n}') for n in range(8)])
+            MenuItem.objects.bulk_create([
+                MenuItem(
+                    menu=menu, name=f'Dish {n}', price='9.50',
+                    category=categories[n % len(categories)], cuisine=cuisines[n % len(cuisines)],
+                    is_vegetarian=n % 2 == 0, is_vegan=n % 5 == 0, is_gluten_free=n % 3 == 0, is_available=n % 9 != 0,
+                )
+                for n in range(options['items'])
+            ])
+            client = APIClient(SERVER_NAME='localhost')
+            url = '/api/v1/restaurants/menu-items/'
+            base = {'is_vegetarian': 'true'}
+            facet_values = (
+                [('category', category.pk) for category in categories]
+                + [('cuisine', cuisine.pk) for cuisine in cuisines]
+                + [(flag, value) for flag in FLAGS for value in ('true', 'false')]
+            )
+
+            def per_value_requests():
+                for name, value in facet_values:
+                    params = {key: v for key, v in base.items() if key != name}
+                    response = client.get(url, {**params, name: value, 'page': 1})
+                    assert response.status_code == 200, response.status_code
+
+            def facets(cold):
+                def call():
+                    if cold:
+                        cache.clear()
+                    response = client.get(url, {**base, 'facets': 'true'})
+                    assert response.status_code == 200, response.status_code
+                return call
+
+            self.stdout.write(f"{options['items']:,} items, {len(facet_values)} facet values x {iterations}")
+            self.stdout.write(format_result('request per value (before)', measure(per_value_requests, iterations)))
+            self.stdout.write(format_result('?facets=true, cold', measure(facets(True), iterations)))
+            self.stdout.write(format_result('?facets=true, cached', measure(facets(False), iterations)))
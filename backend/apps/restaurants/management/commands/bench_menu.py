@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.restaurants.models import Branch, Category, Cuisine, Menu, MenuItem, Restaurant
+from apps.restaurants.serializers import MenuSerializer
+from apps.restaurants.snapshots import with_render_prefetches
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark GET menus/{id}/: serializing on every request against the stored snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=200, help='Items on the menu')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-menu@example.com', password='password123')
+            restaurant = Restaurant.objects.create(
+                name='Bench', owner=owner, phone='123', email='bench@example.com', is_approved=True
+            )
+            menu = Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+            categories = Category.objects.bulk_create([Category(name=f'Category {n}') for n in range(12)])
+            cuisines = Cuisine.objects.bulk_create([Cuisine(name=f'Cuisine {n}') for n in range(8)])
+            MenuItem.objects.bulk_create([
+                MenuItem(
+                    menu=menu, name=f'Dish {n}', description='A bench dish', price='9.50',
+                    category=categories[n % len(categories)], cuisine=cuisines[n % len(cuisines)],
+                    ingredients='flour, water, salt', allergens='gluten',
+                )
+                for n in range(options['items'])
+            ])
+            client = APIClient(SERVER_NAME='localhost')
+            url = f'/api/v1/restaurants/menus/{menu.pk}/'
+
+            def serialize():
+                instance = with_render_prefetches(Menu.objects.filter(pk=menu.pk)).get()
+                return JSONRenderer().render(MenuSerializer(instance).data)
+
+            def endpoint():
+                response = client.get(url)
+                assert response.status_code == 200, response.status_code
+
+            self.stdout.write(f"Menu with {options['items']} items x {iterations}")
+            self.stdout.write(format_result('serializer (before)', measure(serialize, iterations)))
+            self.stdout.write(format_result('GET menus/{id}/ snapshot', measure(endpoint, iterations)))
@@ -0,0 +1,70 @@
+import random
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.locations.geo import geohash_for, nearest
+from apps.restaurants.models import Branch, Restaurant
+
+User = get_user_model()
+
+# Branches cluster around metro centres, as real ones do
+METROS = [(40.71, -74.00), (34.05, -118.24), (41.88, -87.63), (51.51, -0.13), (35.68, 139.69), (-33.87, 151.21)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the nearby-branches endpoint against a full haversine scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branches', type=int, default=50_000, help='Branches to seed')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        rng = random.Random(11)
+        iterations = options['requests']
+
+        with rolled_back():
+            self.stdout.write(f"Seeding {options['branches']:,} branches...")
+            self.seed(rng, options['branches'])
+            client = APIClient(SERVER_NAME='localhost')
+            lat, lng = METROS[0]
+
+            for radius in (1, 5, 20):
+                params = {'lat': lat + 0.01, 'lng': lng - 0.01, 'radius_km': radius, 'limit': 20}
+                hits = len(Branch.objects.by_distance(params['lat'], params['lng'], radius))
+                self.stdout.write(f'radius {radius} km ({hits:,} branches in range) x {iterations}')
+
+                def full_scan():
+                    points = Branch.objects.values_list('pk', 'latitude', 'longitude').iterator()
+                    return nearest(points, params['lat'], params['lng'], radius, 20)
+
+                def endpoint():
+                    response = client.get('/api/v1/restaurants/branches/nearby/', params)
+                    assert response.status_code == 200, response.status_code
+
+                result = measure(full_scan, iterations=max(1, iterations // 20), warmup=1)
+                self.stdout.write(format_result('full scan (before)', result))
+                result = measure(lambda: Branch.objects.by_distance(params['lat'], params['lng'], radius, 20),
+                                 iterations=iterations)
+                self.stdout.write(format_result('geohash prefilter', result))
+                result = measure(endpoint, iterations=iterations)
+                self.stdout.write(format_result('GET branches/nearby/', result))
+
+    def seed(self, rng, n_branches):
+        owner = User.objects.create_user(email='bench-nearby@example.com', password='password123')
+        restaurants = Restaurant.objects.bulk_create([
+            Restaurant(name=f'Bench {r}', owner=owner, phone='123', email=f'r{r}@example.com', is_approved=True)
+            for r in range(max(1, n_branches // 5))
+        ])
+        branches = []
+        for n in range(n_branches):
+            lat, lng = rng.choice(METROS)
+            latitude = Decimal(f'{rng.gauss(lat, 0.2):.6f}')
+            longitude = Decimal(f'{rng.gauss(lng, 0.25):.6f}')
+            branches.append(Branch(
+                restaurant=restaurants[n % len(restaurants)], name=f'Branch {n}', phone='123',
+                latitude=latitude, longitude=longitude, geohash=geohash_for(latitude, longitude),
+            ))
+        Branch.objects.bulk_create(branches, batch_size=5000)
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.restaurants.models import Branch, Restaurant
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the restaurant listing: uncached against cached pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restaurants', type=int, default=2000, help='Restaurants to seed')
+        parser.add_argument('--requests', type=int, default=100, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        iterations = options['requests']
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-listing@example.com', password='password123')
+            restaurants = Restaurant.objects.bulk_create([
+                Restaurant(
+                    name=f'Restaurant {n}', owner=owner, phone='123', email='bench@example.com', is_approved=n % 10 != 0
+                )
+                for n in range(options['restaurants'])
+            ])
+            Branch.objects.bulk_create([
+                Branch(restaurant=restaurant, name=f'Branch {n}', phone='123')
+                for n, restaurant in enumerate(restaurants)
+            ])
+            client = APIClient(SERVER_NAME='localhost')
+            url = '/api/v1/restaurants/restaurants/'
+            params = {'ordering': 'name', 'page': 3}
+
+            def listing(cold):
+                def call():
+                    if cold:
+                        cache.clear()
+                    response = client.get(url, params)
+                    assert response.status_code == 200, response.status_code
+                return call
+
+            self.stdout.write(f"{len(restaurants):,} restaurants x {iterations}")
+            self.stdout.write(format_result('listing, uncached (before)', measure(listing(True), iterations)))
+            self.stdout.write(format_result('listing, cached', measure(listing(False), iterations)))
+
@@ -0,0 +1,111 @@
+import random
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.search import FullTextSearchFilter, document
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.locations.models import Address, City, Country
+from apps.restaurants.models import Branch, Category, Cuisine, Menu, MenuItem, Restaurant
+from apps.restaurants.search import refresh_restaurant_documents
+
+User = get_user_model()
+
+# A deliberately small vocabulary: every term hits a large share of rows, the
+# worst case for ranking and the best case for icontains short-circuiting
+WORDS = [
+    'spicy', 'smoked', 'crispy', 'garlic', 'truffle', 'lemon', 'honey', 'pepper', 'basil', 'ginger',
+    'pizza', 'burger', 'noodles', 'curry', 'taco', 'salad', 'ramen', 'pasta', 'sushi', 'kebab',
+]
+CITIES = ['Springfield', 'Riverside', 'Fairview', 'Kingston', 'Lakewood', 'Ashford', 'Brookfield', 'Clayton']
+QUERIES = ['pizza', 'spicy cur', 'truffle pasta', 'riverside', 'zzz']
+
+
+# The search_fields the viewsets used with SearchFilter before the full-text index
+LEGACY_SEARCH_FIELDS = {
+    Restaurant: ['name', 'description', 'branches__address__city__name', 'branches__address__street_address'],
+    MenuItem: ['name', 'description', 'category__name'],
+}
+
+
+class LegacySearchView:
+    def __init__(self, search_fields):
+        self.search_fields = search_fields
+
+
+class Command(BaseCommand):
+    help = 'Benchmark icontains-join search against the full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100_000, help='Menu items to seed')
+        parser.add_argument('--restaurants', type=int, default=2_000, help='Restaurants to seed (two branches each)')
+        parser.add_argument('--requests', type=int, default=50, help='Searches per scenario')
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        factory = APIRequestFactory()
+
+        with rolled_back():
+            self.stdout.write(f"Seeding {options['restaurants']:,} restaurants and {options['items']:,} menu items...")
+            self.seed(rng, options['restaurants'], options['items'])
+
+            for model, fields in LEGACY_SEARCH_FIELDS.items():
+                self.stdout.write(f'{model.__name__} search x {options["requests"]}')
+                for query in QUERIES:
+                    request = Request(factory.get('/', {'search': query}))
+
+                    def legacy():
+                        qs = SearchFilter().filter_queryset(request, model.objects.all(), LegacySearchView(fields))
+                        return qs.count(), list(qs.order_by('pk')[:20])
+
+                    def full_text():
+                        qs = FullTextSearchFilter().filter_queryset(request, model.objects.all(), None)
+                        return qs.count(), list(qs[:20])
+
+                    hits = full_text()[0]
+                    self.stdout.write(f'  "{query}" ({hits:,} hits)')
+                    for label, fn in (('icontains joins (before)', legacy), ('full-text index (after)', full_text)):
+                        result = measure(fn, iterations=options['requests'], warmup=2)
+                        self.stdout.write('  ' + format_result(label, result))
+
+    def seed(self, rng, n_restaurants, n_items):
+        owner = User.objects.create_user(email='bench-search@example.com', password='password123')
+        country = Country.objects.create(name='Bench Country', code='BQ', currency='USD', timezone='UTC')
+        cities = City.objects.bulk_create([City(name=name, country=country) for name in CITIES])
+        categories = Category.objects.bulk_create([Category(name=word.title()) for word in WORDS[10:]])
+        cuisine = Cuisine.objects.create(name='Bench Fusion')
+
+        restaurants = Restaurant.objects.bulk_create([
+            Restaurant(
+                name=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {r}', owner=owner,
+                description=' '.join(rng.sample(WORDS, 4)), phone='123', email=f'r{r}@example.com',
+                is_approved=True,
+            )
+            for r in range(n_restaurants)
+        ])
+        addresses = Address.objects.bulk_create([
+            Address(street_address=f'{n} {rng.choice(WORDS).title()} St', city=rng.choice(cities),
+                    state='State', postal_code='12345')
+            for n in range(n_restaurants * 2)
+        ])
+        branches = Branch.objects.bulk_create([
+            Branch(restaurant=restaurants[n // 2], name=f'Branch {n}', phone='123', address=address)
+            for n, address in enumerate(addresses)
+        ])
+        refresh_restaurant_documents(Restaurant.objects.filter(pk__in=[r.pk for r in restaurants]))
+        menus = Menu.objects.bulk_create([Menu(branch=branch, name='Menu') for branch in branches])
+
+        items = []
+        for n in range(n_items):
+            category = rng.choice(categories)
+            name = f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}'
+            description = ' '.join(rng.sample(WORDS, 5))
+            items.append(MenuItem(
+                menu=menus[n % len(menus)], category=category, cuisine=cuisine, name=name,
+                description=description, price=Decimal('9.99'),
+                search_document=document(name, description, category.name, cuisine.name),
+            ))
+        MenuItem.objects.bulk_create(items, batch_size=5000)
@@ -0,0 +1,85 @@
+import math
+import random
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.common.utils.benchmark import rolled_back, measure, format_result
+from apps.locations.geo import KM_PER_DEGREE, point_in_polygon
+from apps.restaurants.models import Branch, DeliveryZone, DeliveryZoneCell, Restaurant
+
+User = get_user_model()
+
+METROS = [(40.71, -74.00), (34.05, -118.24), (41.88, -87.63), (51.51, -0.13)]
+
+
+def blob(rng, latitude, longitude, radius_km, vertices):
+    """An irregular star-shaped polygon around the point"""
+    ring = []
+    for k in range(vertices):
+        angle = 2 * math.pi * k / vertices
+        r = radius_km * rng.uniform(0.6, 1.0) / KM_PER_DEGREE
+        ring.append([
+            round(latitude + r * math.sin(angle), 6),
+            round(longitude + r * math.cos(angle) / math.cos(math.radians(latitude)), 6),
+        ])
+    return ring
+
+
+class Command(BaseCommand):
+    help = 'Benchmark delivery zone lookups: rasterized cells against testing every polygon'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--zones', type=int, default=5000, help='Delivery zones to seed')
+        parser.add_argument('--requests', type=int, default=500, help='Lookups per scenario')
+
+    def handle(self, *args, **options):
+        rng = random.Random(13)
+        n_zones = options['zones']
+
+        with rolled_back():
+            owner = User.objects.create_user(email='bench-zones@example.com', password='password123')
+            restaurants = Restaurant.objects.bulk_create([
+                Restaurant(name=f'Bench {r}', owner=owner, phone='123', email=f'r{r}@example.com', is_approved=True)
+                for r in range(n_zones)
+            ])
+            branches = Branch.objects.bulk_create([
+                Branch(restaurant=restaurant, name='Main', phone='123') for restaurant in restaurants
+            ])
+
+            started = time.perf_counter()
+            for branch in branches:
+                lat, lng = rng.choice(METROS)
+                DeliveryZone.objects.create(branch=branch, name='Zone', polygon=blob(
+                    rng, rng.gauss(lat, 0.15), rng.gauss(lng, 0.2), rng.uniform(2, 8), rng.randint(12, 32)
+                ))
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'Rasterized {n_zones:,} zones into {DeliveryZoneCell.objects.count():,} cells '
+                f'in {elapsed:.1f}s ({n_zones / elapsed:,.0f} zones/s)'
+            )
+
+            points = [(rng.gauss(lat, 0.15), rng.gauss(lng, 0.2)) for lat, lng in rng.choices(METROS, k=256)]
+            cursor = iter(range(10 ** 9))
+
+            def scan_polygons():
+                lat, lng = points[next(cursor) % len(points)]
+                return [
+                    pk for pk, polygon in DeliveryZone.objects.filter(is_active=True).values_list('pk', 'polygon')
+                    if point_in_polygon(lat, lng, polygon)
+                ]
+
+            def cell_lookup():
+                lat, lng = points[next(cursor) % len(points)]
+                return list(DeliveryZone.objects.covering(lat, lng).values_list('pk', flat=True))
+
+            def restaurants_delivering():
+                lat, lng = points[next(cursor) % len(points)]
+                return list(Restaurant.objects.delivering_to(lat, lng).values_list('pk', flat=True)[:20])
+
+            iterations = options['requests']
+            hits = sum(len(cell_lookup()) for _ in range(len(points))) / len(points)
+            self.stdout.write(f'Zone lookup, {hits:.1f} zones per point on average')
+            self.stdout.write(format_result('every polygon (before)', measure(scan_polygons, max(1, iterations // 50), 1)))
+            self.stdout.write(format_result('cell index', measure(cell_lookup, iterations)))
+            self.stdout.write(format_result('restaurants delivering_to', measure(restaurants_delivering, iterations)))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.restaurants.facets import catalog_version
+from apps.restaurants.models import Allergen, MenuItem
+from apps.restaurants.tags import tag_menu_items
+
+
+class Command(BaseCommand):
+    help = 'Re-parse the allergen mask and ingredient tags of every menu item (after bulk loads that skip save())'
+
+    def handle(self, *args, **options):
+        tagged = tag_menu_items(MenuItem.objects.all(), Allergen)
+        catalog_version.bump()  # cached facet counts may filter on the tags
+        self.stdout.write(self.style.SUCCESS(f'Menu items tagged: {tagged}'))
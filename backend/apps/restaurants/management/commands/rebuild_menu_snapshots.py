@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.restaurants.models import Menu
+from apps.restaurants.snapshots import rebuild_menu_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Render and store the JSON snapshot of every menu (or only stale ones with --stale)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale', action='store_true', help='Skip menus whose snapshot is current')
+
+    def handle(self, *args, **options):
+        written = rebuild_menu_snapshots(Menu.objects.all(), stale_only=options['stale'])
+        self.stdout.write(self.style.SUCCESS(f'Menu snapshots written: {written}'))
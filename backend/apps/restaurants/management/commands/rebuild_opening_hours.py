@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.restaurants.hours import compile_opening_hours
+from apps.restaurants.models import Branch
+
+
+class Command(BaseCommand):
+    help = 'Recompile every branch\'s opening hours into the open-interval index'
+
+    def handle(self, *args, **options):
+        written = compile_opening_hours(Branch.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Open intervals compiled: {written}'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.search import install_search_index, rebuild_search_index
+from apps.restaurants.models import MenuItem, Restaurant
+from apps.restaurants.search import refresh_menu_item_documents, refresh_restaurant_documents
+
+
+class Command(BaseCommand):
+    help = 'Recompute restaurant and menu item search documents and rebuild the full-text index'
+
+    def handle(self, *args, **options):
+        refreshed = refresh_restaurant_documents(Restaurant.objects.all())
+        self.stdout.write(f'Restaurant documents updated: {refreshed}')
+        refreshed = refresh_menu_item_documents(MenuItem.objects.all())
+        self.stdout.write(f'Menu item documents updated: {refreshed}')
+
+        for model in (Restaurant, MenuItem):
+            install_search_index(model)
+            rebuild_search_index(model)
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
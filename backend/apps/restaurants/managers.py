@@ -0,0 +1,161 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from apps.locations.geo import cells_q, covering_cells, encode, nearest, point_in_polygon
+from .hours import MINUTES_PER_DAY, minute_of_week, zone
+from .tags import known_allergen_bits, mask_of, normalize_tag
+
+# k-nearest searches try radius/16 and radius/4 before the full radius
+KNN_PROBE_STEPS = (16, 4)
+
+
+class BranchQuerySet(models.QuerySet):
+    def _within(self, latitude, longitude, radius_km, limit, key):
+        cells = covering_cells(latitude, longitude, radius_km)
+        candidates = self.exclude(geohash='')
+        if cells is not None:
+            candidates = candidates.filter(cells_q('geohash', cells))
+        # Read coordinates as floats; building a Decimal per candidate costs more than the distance
+        points = candidates.annotate(
+            lat=Cast('latitude', FloatField()), lng=Cast('longitude', FloatField())
+        ).values_list(key, 'lat', 'lng')
+        return nearest(points.iterator(), latitude, longitude, radius_km, limit)
+
+    def by_distance(self, latitude, longitude, radius_km, limit=None, key='pk'):
+        """
+        (distance_km, key) of the branches within radius_km, nearest first.
+
+        Candidates come from the geohash cells around the point (index range
+        scans) and only their coordinates are read. With a limit, smaller
+        radii are probed first: once a probe finds limit branches they are
+        the nearest ones, which spares ranking a whole dense city.
+        """
+        if limit is not None:
+            for step in KNN_PROBE_STEPS:
+                ranked = self._within(latitude, longitude, radius_km / step, limit, key)
+                if len(ranked) >= limit:
+                    return ranked
+        return self._within(latitude, longitude, radius_km, limit, key)
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        """The limit closest branches within radius_km, nearest first, each carrying distance_km"""
+        ranked = self.by_distance(latitude, longitude, radius_km, limit)
+        if not ranked:
+            return []
+        branches = self.in_bulk([pk for _, pk in ranked])
+        result = []
+        for distance, pk in ranked:
+            branch = branches[pk]
+            branch.distance_km = round(distance, 3)
+            result.append(branch)
+        return result
+
+
+    def open_at(self, moment):
+        """Branches open at the aware datetime moment, in their own timezone"""
+        intervals = self.model._meta.get_field('open_intervals').related_model.objects.containing(moment)
+        return self.filter(pk__in=intervals.values('branch_id'))
+
+
+class BranchOpenIntervalQuerySet(models.QuerySet):
+    def containing(self, moment):
+        """
+        Intervals open at the aware datetime moment. The moment becomes a local
+        minute-of-week once per known timezone, each an index range scan over
+        the rows starting earlier that day.
+        """
+        from apps.locations.models import Country
+
+        names = {*Country.objects.values_list('timezone', flat=True), settings.TIME_ZONE}
+        condition = Q(pk__in=[])
+        for name in sorted(names):
+            tz = zone(name)
+            if tz is None:
+                continue
+            minute = minute_of_week(moment, tz)
+            condition |= Q(
+                timezone=name,
+                start_minute__range=(minute - minute % MINUTES_PER_DAY, minute),
+                end_minute__gt=minute,
+            )
+        return self.filter(condition)
+
+
+class DeliveryZoneQuerySet(models.QuerySet):
+    def covering(self, latitude, longitude):
+        """
+        Active zones containing the point.
+
+        The point's geohash prefixes are looked up in the cell index; interior
+        cells answer directly and only zones whose boundary crosses the cell
+        get an exact point-in-polygon test.
+        """
+        point = encode(latitude, longitude)
+        prefixes = [point[:length] for length in range(1, len(point) + 1)]
+        cells = self.model._meta.get_field('cells').related_model.objects
+        inside, boundary = set(), set()
+        # Driven by the cell index; this queryset's own filters apply to the final result
+        for zone_id, is_interior in cells.filter(
+            cell__in=prefixes, zone__is_active=True
+        ).values_list('zone_id', 'is_interior'):
+            (inside if is_interior else boundary).add(zone_id)
+        boundary -= inside
+        if boundary:
+            inside.update(
+                zone_id for zone_id, polygon in self.filter(pk__in=boundary).values_list('pk', 'polygon')
+                if point_in_polygon(latitude, longitude, polygon)
+            )
+        return self.filter(pk__in=inside)
+
+
+class MenuItemQuerySet(models.QuerySet):
+    def excluding_allergens(self, names):
+        """Items whose allergens include none of names"""
+        from .models import Allergen
+
+        bits = known_allergen_bits(Allergen, {normalize_tag(name) for name in names})
+        queryset = self
+        mask = mask_of(bits.values())
+        if mask:
+            queryset = queryset.alias(allergen_hits=F('allergen_mask').bitand(mask)).filter(allergen_hits=0)
+        for name, bit in bits.items():
+            if bit is None:
+                # Past the mask's capacity; over-matching the text only errs on the safe side
+                queryset = queryset.exclude(allergens__icontains=name)
+        return queryset
+
+    def with_ingredients(self, names):
+        """Items tagged with every one of names"""
+        names = {normalize_tag(name) for name in names}
+        ingredient_model = self.model._meta.get_field('ingredient_tags').related_model
+        ids = list(ingredient_model.objects.filter(name__in=names).values_list('id', flat=True))
+        if len(ids) < len(names):
+            return self.none()
+        queryset = self
+        for ingredient_id in ids:
+            queryset = queryset.filter(ingredient_tags=ingredient_id)
+        return queryset
+
+
+class RestaurantQuerySet(models.QuerySet):
+    def _zones(self):
+        branch = self.model._meta.get_field('branches').related_model
+        return branch._meta.get_field('delivery_zones').related_model.objects.filter(is_active=True)
+
+    def delivering_to(self, latitude, longitude):
+        """
+        Restaurants that deliver to the point: one of their zones contains it,
+        or they have no active zones at all and so are not restricted.
+        """
+        zones = self._zones()
+        unrestricted = ~Q(pk__in=zones.values('branch__restaurant_id'))
+        if latitude is None or longitude is None:
+            return self.filter(unrestricted)
+        serving = zones.covering(latitude, longitude).values('branch__restaurant_id')
+        return self.filter(Q(pk__in=serving) | unrestricted)
+
+    def open_at(self, moment):
+        """Restaurants with a branch open at the aware datetime moment"""
+        branches = self.model._meta.get_field('branches').related_model.objects.open_at(moment)
+        return self.filter(pk__in=branches.values('restaurant_id'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0003_alter_branch_restaurant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menu',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+    ]
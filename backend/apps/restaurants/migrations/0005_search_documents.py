@@ -0,0 +1,124 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:10
+
+from collections import defaultdict
+from django.db import migrations, models
+
+# Helpers from apps.common.search and apps.restaurants.search as of this
+# migration, copied so later changes to those modules never change what it does
+BATCH_SIZE = 2000
+TABLES = ('restaurants_restaurant', 'restaurants_menuitem')
+
+
+def document(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+
+def menu_item_document(item):
+    return document(
+        item.name,
+        item.description,
+        item.category.name if item.category_id else None,
+        item.cuisine.name if item.cuisine_id else None,
+        item.ingredients,
+    )
+
+
+def restaurant_document(restaurant, branches=()):
+    return document(restaurant.name, restaurant.description, *(part for branch in branches for part in branch))
+
+
+def index_statements(vendor, table):
+    fts = f'{table}_fts'
+    if vendor == 'sqlite':
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"search_document, content='{table}', content_rowid='id')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, search_document) VALUES (new.id, new.search_document); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_document) VALUES ('delete', old.id, old.search_document); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF search_document ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, search_document) VALUES ('delete', old.id, old.search_document); "
+            f"INSERT INTO {fts}(rowid, search_document) VALUES (new.id, new.search_document); END",
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+    if vendor == 'postgresql':
+        return [
+            f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} "
+            f"USING GIN (to_tsvector('simple', search_document))"
+        ]
+    return []
+
+
+def drop_statements(vendor, table):
+    fts = f'{table}_fts'
+    if vendor == 'sqlite':
+        return [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')] + [
+            f'DROP TABLE IF EXISTS {fts}'
+        ]
+    if vendor == 'postgresql':
+        return [f'DROP INDEX IF EXISTS {table}_search_gin']
+    return []
+
+
+def backfill_documents(apps, schema_editor):
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    Branch = apps.get_model('restaurants', 'Branch')
+    MenuItem = apps.get_model('restaurants', 'MenuItem')
+
+    branches = defaultdict(list)
+    for restaurant_id, *parts in Branch.objects.order_by('id').values_list(
+        'restaurant_id', 'name', 'address__street_address', 'address__city__name'
+    ):
+        branches[restaurant_id].append(parts)
+    restaurants = list(Restaurant.objects.only('name', 'description'))
+    for restaurant in restaurants:
+        restaurant.search_document = restaurant_document(restaurant, branches.get(restaurant.pk, ()))
+    Restaurant.objects.bulk_update(restaurants, ['search_document'], batch_size=BATCH_SIZE)
+
+    items = MenuItem.objects.select_related('category', 'cuisine').only(
+        'name', 'description', 'ingredients', 'category__name', 'cuisine__name'
+    )
+    batch = []
+    for item in items.iterator(chunk_size=BATCH_SIZE):
+        item.search_document = menu_item_document(item)
+        batch.append(item)
+        if len(batch) >= BATCH_SIZE:
+            MenuItem.objects.bulk_update(batch, ['search_document'])
+            batch = []
+    MenuItem.objects.bulk_update(batch, ['search_document'])
+
+
+def install_indexes(apps, schema_editor):
+    for table in TABLES:
+        for statement in index_statements(schema_editor.connection.vendor, table):
+            schema_editor.execute(statement)
+
+
+def drop_indexes(apps, schema_editor):
+    for table in TABLES:
+        for statement in drop_statements(schema_editor.connection.vendor, table):
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0004_versions'),
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+        migrations.RunPython(install_indexes, drop_indexes),
+    ]
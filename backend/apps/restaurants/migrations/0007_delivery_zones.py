@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0006_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryZone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('polygon', models.JSONField(help_text='Ring of [latitude, longitude] vertices')),
+                ('is_active', models.BooleanField(default=True)),
+                ('cell_precision', models.PositiveSmallIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='delivery_zones', to='restaurants.branch')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DeliveryZoneCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(max_length=12)),
+                ('is_interior', models.BooleanField()),
+                ('zone', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cells', to='restaurants.deliveryzone')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['cell'], name='zone_cell_idx')],
+                'constraints': [models.UniqueConstraint(fields=('zone', 'cell'), name='unique_zone_cell')],
+            },
+        ),
+    ]
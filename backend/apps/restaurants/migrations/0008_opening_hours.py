@@ -0,0 +1,97 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:53
+
+import django.db.models.deletion
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.conf import settings
+from django.db import migrations, models
+
+# Copied from apps.restaurants.hours at the time of writing, so later changes
+# there don't change what this migration compiles
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def known_zone(name):
+    try:
+        return bool(name) and ZoneInfo(name) is not None
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def weekly_intervals(hours):
+    pieces = []
+    for weekday, opens, closes in hours:
+        start = weekday * MINUTES_PER_DAY + _minutes(opens)
+        end = start + ((_minutes(closes) - _minutes(opens)) % MINUTES_PER_DAY or MINUTES_PER_DAY)
+        while start < end:
+            piece_end = min(end, (start // MINUTES_PER_DAY + 1) * MINUTES_PER_DAY)
+            wrap = start - start % MINUTES_PER_WEEK
+            pieces.append((start - wrap, piece_end - wrap))
+            start = piece_end
+    merged = []
+    for start, end in sorted(pieces):
+        if merged and start <= merged[-1][1] and start // MINUTES_PER_DAY == merged[-1][0] // MINUTES_PER_DAY:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compile_legacy_hours(apps, schema_editor):
+    """Branches start out open every day between their existing opening_time and closing_time"""
+    Branch = apps.get_model('restaurants', 'Branch')
+    BranchOpenInterval = apps.get_model('restaurants', 'BranchOpenInterval')
+    db = schema_editor.connection.alias
+    rows = []
+    for branch_id, opening, closing, tz_name in Branch.objects.using(db).filter(
+        opening_time__isnull=False, closing_time__isnull=False
+    ).values_list('pk', 'opening_time', 'closing_time', 'address__city__country__timezone').iterator():
+        tz_name = tz_name if known_zone(tz_name) else settings.TIME_ZONE
+        rows.extend(
+            BranchOpenInterval(branch_id=branch_id, timezone=tz_name, start_minute=start, end_minute=end)
+            for start, end in weekly_intervals([(weekday, opening, closing) for weekday in range(7)])
+        )
+    BranchOpenInterval.objects.using(db).bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0007_delivery_zones'),
+        ('locations', '0002_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpeningHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('opens', models.TimeField()),
+                ('closes', models.TimeField()),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_hours', to='restaurants.branch')),
+            ],
+            options={
+                'verbose_name_plural': 'Opening hours',
+                'ordering': ['weekday', 'opens'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BranchOpenInterval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timezone', models.CharField(max_length=50)),
+                ('start_minute', models.PositiveSmallIntegerField()),
+                ('end_minute', models.PositiveSmallIntegerField()),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='open_intervals', to='restaurants.branch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['timezone', 'start_minute', 'end_minute', 'branch'], name='open_interval_idx')],
+            },
+        ),
+        migrations.RunPython(compile_legacy_hours, migrations.RunPython.noop),
+    ]
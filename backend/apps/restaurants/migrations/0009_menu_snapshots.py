@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0008_opening_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuSnapshot',
+            fields=[
+                ('menu', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='restaurants.menu')),
+                ('version', models.PositiveBigIntegerField()),
+                ('body', models.BinaryField()),
+                ('rendered_at', models.DateTimeField()),
+            ],
+        ),
+    ]
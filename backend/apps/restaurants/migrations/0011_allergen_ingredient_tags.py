@@ -0,0 +1,82 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+# Copied from apps.restaurants.tags at the time of writing, so later changes
+# there don't change what this migration stores
+MAX_ALLERGEN_BITS = 63
+TAG_MAX_LENGTH = 100
+TAG_CHUNK_SIZE = 2000
+
+
+def parse_tags(text):
+    names = (' '.join(part.lower().split())[:TAG_MAX_LENGTH] for part in (text or '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def backfill_tags(apps, schema_editor):
+    """Parse every item's allergens and ingredients into the new vocabulary tables"""
+    MenuItem = apps.get_model('restaurants', 'MenuItem')
+    Allergen = apps.get_model('restaurants', 'Allergen')
+    Ingredient = apps.get_model('restaurants', 'Ingredient')
+    Tag = MenuItem.ingredient_tags.through
+    db = schema_editor.connection.alias
+    bits, ingredient_ids = {}, {}
+    ids = list(MenuItem.objects.using(db).exclude(allergens='', ingredients='').values_list('pk', flat=True))
+    for first in range(0, len(ids), TAG_CHUNK_SIZE):
+        items = list(
+            MenuItem.objects.using(db).filter(pk__in=ids[first:first + TAG_CHUNK_SIZE])
+            .only('pk', 'allergens', 'ingredients')
+        )
+        tags = []
+        for item in items:
+            item.allergen_mask = 0
+            for name in parse_tags(item.allergens):
+                if name not in bits:
+                    # The tables are new, so bits are handed out in order of first use
+                    bits[name] = len(bits) if len(bits) < MAX_ALLERGEN_BITS else None
+                    Allergen.objects.using(db).create(name=name, bit=bits[name])
+                if bits[name] is not None:
+                    item.allergen_mask |= 1 << bits[name]
+            for name in parse_tags(item.ingredients):
+                if name not in ingredient_ids:
+                    ingredient_ids[name] = Ingredient.objects.using(db).create(name=name).pk
+                tags.append(Tag(menuitem_id=item.pk, ingredient_id=ingredient_ids[name]))
+        MenuItem.objects.using(db).bulk_update(items, ['allergen_mask'])
+        Tag.objects.using(db).bulk_create(tags)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Allergen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('bit', models.PositiveSmallIntegerField(blank=True, null=True, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Ingredient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='allergen_mask',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='ingredient_tags',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='menu_items', to='restaurants.ingredient'),
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0011_allergen_ingredient_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_id', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
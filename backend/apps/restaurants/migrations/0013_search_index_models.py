@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0012_menu_item_catalog_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemSearchIndex',
+            fields=[
+                ('search_document', models.TextField()),
+                ('menu_item', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='restaurants.menuitem')),
+            ],
+            options={
+                'db_table': 'restaurants_menuitem_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RestaurantSearchIndex',
+            fields=[
+                ('search_document', models.TextField()),
+                ('restaurant', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='restaurants.restaurant')),
+            ],
+            options={
+                'db_table': 'restaurants_restaurant_fts',
+                'abstract': False,
+                'managed': False,
+            },
+        ),
+    ]
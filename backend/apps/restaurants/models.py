@@ -1,8 +1,16 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from apps.common.mixins import VersionMixin
+from apps.common.search import SEARCH_INDEX, SearchIndex
+from apps.locations.geo import GEOHASH_MAX_LENGTH, geohash_for, raster_precision, rasterize
+from .managers import (
+    BranchOpenIntervalQuerySet, BranchQuerySet, DeliveryZoneQuerySet, MenuItemQuerySet, RestaurantQuerySet
+)
+from .search import branch_terms, menu_item_document, restaurant_document
+from .tags import allergen_mask, ingredient_ids, parse_tags
 
 
-class Restaurant(models.Model):
+class Restaurant(VersionMixin):
     name = models.CharField(max_length=150)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     description = models.TextField(blank=True)
@@ -12,10 +20,29 @@ class Restaurant(models.Model):
     is_approved = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    search_document = models.TextField(blank=True, default='', editable=False)
+
+    objects = RestaurantQuerySet.as_manager()
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        branches = () if self._state.adding else branch_terms([self.pk]).get(self.pk, ())
+        self.search_document = restaurant_document(self, branches)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'search_document'}
+        super().save(*args, **kwargs)
+
+class RestaurantSearchIndex(SearchIndex):
+    restaurant = models.OneToOneField(
+        Restaurant, models.DO_NOTHING, primary_key=True, db_column='rowid', db_constraint=False,
+        related_name=SEARCH_INDEX,
+    )
+
+    class Meta(SearchIndex.Meta):
+        db_table = 'restaurants_restaurant_fts'
+
 class Branch(models.Model):
     class BranchType(models.TextChoices):
         DINE_IN = 'DINE_IN', 'Dine-in'
@@ -28,14 +55,114 @@ class Branch(models.Model):
     address = models.ForeignKey('locations.Address', on_delete=models.SET_NULL, null=True)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True)
+    geohash = models.CharField(max_length=GEOHASH_MAX_LENGTH, blank=True, default='', db_index=True, editable=False)
     phone = models.CharField(max_length=15)
     branch_type = models.CharField(max_length=20, choices=BranchType.choices, default=BranchType.DELIVERY)
+    # Same hours every day; superseded by OpeningHours rows when a branch has any
     opening_time = models.TimeField(null=True, blank=True)
     closing_time = models.TimeField(null=True, blank=True)
-    
+
+    objects = BranchQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.restaurant.name} - {self.name}"
 
+    def save(self, *args, **kwargs):
+        self.geohash = geohash_for(self.latitude, self.longitude)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'geohash'}
+        super().save(*args, **kwargs)
+
+class OpeningHours(models.Model):
+    """Hours on one weekday in the branch's local time; closing at or before opening runs overnight"""
+    class Weekday(models.IntegerChoices):
+        MONDAY = 0, 'Monday'
+        TUESDAY = 1, 'Tuesday'
+        WEDNESDAY = 2, 'Wednesday'
+        THURSDAY = 3, 'Thursday'
+        FRIDAY = 4, 'Friday'
+        SATURDAY = 5, 'Saturday'
+        SUNDAY = 6, 'Sunday'
+
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, related_name='opening_hours')
+    weekday = models.PositiveSmallIntegerField(choices=Weekday.choices)
+    opens = models.TimeField()
+    closes = models.TimeField()
+
+    class Meta:
+        ordering = ['weekday', 'opens']
+        verbose_name_plural = "Opening hours"
+
+    def __str__(self):
+        return f"{self.branch_id} - {self.get_weekday_display()} {self.opens}-{self.closes}"
+
+class BranchOpenInterval(models.Model):
+    """Compiled from opening hours: [start_minute, end_minute) of the local week, never crossing midnight"""
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, related_name='open_intervals')
+    timezone = models.CharField(max_length=50)
+    start_minute = models.PositiveSmallIntegerField()
+    end_minute = models.PositiveSmallIntegerField()
+
+    objects = BranchOpenIntervalQuerySet.as_manager()
+
+    class Meta:
+        # Covers the open-at lookup, branch included, without touching the table
+        indexes = [
+            models.Index(fields=['timezone', 'start_minute', 'end_minute', 'branch'], name='open_interval_idx'),
+        ]
+
+class DeliveryZone(models.Model):
+    """Area a branch delivers to, rasterized into geohash cells for point lookups"""
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, related_name='delivery_zones')
+    name = models.CharField(max_length=100)
+    polygon = models.JSONField(help_text="Ring of [latitude, longitude] vertices")
+    is_active = models.BooleanField(default=True)
+    cell_precision = models.PositiveSmallIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = DeliveryZoneQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.branch_id} - {self.name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_polygon = instance.__dict__.get('polygon')  # None if deferred
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and self.polygon == getattr(self, '_loaded_polygon', None):
+            super().save(*args, **kwargs)
+            return
+        self.cell_precision = raster_precision(
+            self.polygon, settings.DELIVERY_ZONE_MAX_CELLS, settings.DELIVERY_ZONE_CELL_PRECISION
+        )
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'cell_precision'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.rebuild_cells()
+        self._loaded_polygon = self.polygon
+
+    def rebuild_cells(self):
+        """Replace the zone's cells with a fresh rasterization of its polygon"""
+        self.cells.all().delete()
+        DeliveryZoneCell.objects.bulk_create([
+            DeliveryZoneCell(zone=self, cell=cell, is_interior=is_interior)
+            for cell, is_interior in rasterize(self.polygon, self.cell_precision)
+        ], batch_size=2000)
+
+class DeliveryZoneCell(models.Model):
+    """A geohash cell overlapping a zone; boundary cells need an exact point-in-polygon test"""
+    zone = models.ForeignKey(DeliveryZone, on_delete=models.CASCADE, related_name='cells')
+    cell = models.CharField(max_length=GEOHASH_MAX_LENGTH)
+    is_interior = models.BooleanField()
+
+    class Meta:
+        indexes = [models.Index(fields=['cell'], name='zone_cell_idx')]
+        constraints = [models.UniqueConstraint(fields=['zone', 'cell'], name='unique_zone_cell')]
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -46,12 +173,33 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
-class Menu(models.Model):
+class Allergen(models.Model):
+    """A normalized allergen name and its bit in MenuItem.allergen_mask (see restaurants.tags)"""
+    name = models.CharField(max_length=100, unique=True)
+    bit = models.PositiveSmallIntegerField(unique=True, null=True, blank=True)
+
+    def __str__(self):
+        return self.name
+
+class Ingredient(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+class Menu(VersionMixin):
     branch = models.ForeignKey(Branch, on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
 
+class MenuSnapshot(models.Model):
+    """A menu's rendered JSON, valid while version matches the menu's (see restaurants.snapshots)"""
+    menu = models.OneToOneField(Menu, on_delete=models.CASCADE, primary_key=True, related_name='snapshot')
+    version = models.PositiveBigIntegerField()
+    body = models.BinaryField()
+    rendered_at = models.DateTimeField()
+
 class MenuItem(models.Model):
     menu = models.ForeignKey(Menu, on_delete=models.CASCADE)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
@@ -68,9 +216,66 @@ class MenuItem(models.Model):
     is_vegetarian = models.BooleanField(default=False)
     is_vegan = models.BooleanField(default=False)
     is_gluten_free = models.BooleanField(default=False)
+    search_document = models.TextField(blank=True, default='', editable=False)
+    # Parsed from allergens and ingredients on save (see restaurants.tags)
+    allergen_mask = models.BigIntegerField(default=0, db_index=True, editable=False)
+    ingredient_tags = models.ManyToManyField(Ingredient, blank=True, editable=False, related_name='menu_items')
+
+    objects = MenuItemQuerySet.as_manager()
+
+    class Meta:
+        # (ordering column, pk) for keyset pagination
+        indexes = [
+            models.Index(fields=['price', 'id'], name='menuitem_price_keyset_idx'),
+            models.Index(fields=['name', 'id'], name='menuitem_name_keyset_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Values as loaded, so signal handlers can see what a save changed without a query
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _writes_new_text(self, name, update_fields):
+        """Whether this save writes a value of name other than the loaded one, so its tags need parsing"""
+        if update_fields is not None and name not in update_fields:
+            return False
+        if self._state.adding:
+            return bool(getattr(self, name))
+        return getattr(self, '_loaded_values', {}).get(name) != getattr(self, name)
+
+    def save(self, *args, **kwargs):
+        fields = kwargs.get('update_fields')
+        parse_allergens = self._writes_new_text('allergens', fields)
+        parse_ingredients = self._writes_new_text('ingredients', fields)
+        self.search_document = menu_item_document(self)
+        if parse_allergens:
+            self.allergen_mask = allergen_mask(Allergen, self.allergens)
+        if fields is not None:
+            kwargs['update_fields'] = {*fields, 'search_document', *(['allergen_mask'] if parse_allergens else [])}
+        super().save(*args, **kwargs)  # post_save handlers still see the previous values
+        if parse_ingredients:
+            self.ingredient_tags.set(ingredient_ids(Ingredient, parse_tags(self.ingredients)).values())
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+class MenuItemSearchIndex(SearchIndex):
+    menu_item = models.OneToOneField(
+        MenuItem, models.DO_NOTHING, primary_key=True, db_column='rowid', db_constraint=False,
+        related_name=SEARCH_INDEX,
+    )
+
+    class Meta(SearchIndex.Meta):
+        db_table = 'restaurants_menuitem_fts'
+
+class MenuItemChange(models.Model):
+    """Change feed of menu item ids, polled by the catalog engine (see restaurants.catalog)"""
+    item_id = models.BigIntegerField()
+    changed_at = models.DateTimeField(db_index=True)
+
 class Cuisine(models.Model):
     name = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True)
@@ -0,0 +1,101 @@
+"""
+Search documents for restaurants and menu items.
+
+A restaurant's document covers its own text plus every branch's name, street
+and city; a menu item's covers its text plus category, cuisine and
+ingredients. Documents are stored on the row (search_document) and indexed by
+apps.common.search; the signals in this app keep them current.
+"""
+from collections import defaultdict
+from django.db import connections
+from apps.common.search import document, fts_table, install_search_index
+
+REFRESH_CHUNK_SIZE = 2000
+
+
+def menu_item_document(item):
+    return document(
+        item.name,
+        item.description,
+        item.category.name if item.category_id else None,
+        item.cuisine.name if item.cuisine_id else None,
+        item.ingredients,
+    )
+
+
+def restaurant_document(restaurant, branches=()):
+    """branches: (branch name, street address, city name) tuples"""
+    return document(restaurant.name, restaurant.description, *(part for branch in branches for part in branch))
+
+
+def branch_terms(restaurant_ids):
+    """Map restaurant id to the (name, street, city) of each of its branches, in one query"""
+    from .models import Branch
+
+    terms = defaultdict(list)
+    rows = Branch.objects.filter(restaurant_id__in=restaurant_ids).order_by('id').values_list(
+        'restaurant_id', 'name', 'address__street_address', 'address__city__name'
+    )
+    for restaurant_id, *parts in rows:
+        terms[restaurant_id].append(parts)
+    return terms
+
+
+def _refresh(queryset, build):
+    updated = 0
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+        rows = build(ids[start:start + REFRESH_CHUNK_SIZE])
+        changed = []
+        for row in rows:
+            text = row._search_document
+            if text != row.search_document:
+                row.search_document = text
+                changed.append(row)
+        if changed:
+            queryset.model.objects.bulk_update(changed, ['search_document'])
+            updated += len(changed)
+    return updated
+
+
+def refresh_restaurant_documents(queryset):
+    """Rebuild the stored documents of the given restaurants; returns the number changed"""
+    def build(ids):
+        rows = list(queryset.model.objects.filter(pk__in=ids).only('name', 'description', 'search_document'))
+        terms = branch_terms(ids)
+        for row in rows:
+            row._search_document = restaurant_document(row, terms.get(row.pk, ()))
+        return rows
+
+    return _refresh(queryset, build)
+
+
+def refresh_menu_item_documents(queryset):
+    """Rebuild the stored documents of the given menu items; returns the number changed"""
+    def build(ids):
+        rows = list(
+            queryset.model.objects.filter(pk__in=ids).select_related('category', 'cuisine').only(
+                'name', 'description', 'ingredients', 'search_document', 'category__name', 'cuisine__name'
+            )
+        )
+        for row in rows:
+            row._search_document = menu_item_document(row)
+        return rows
+
+    return _refresh(queryset, build)
+
+
+def reinstall_search_indexes(using='default', **kwargs):
+    """
+    post_migrate hook: SQLite rebuilds a table to alter it, which drops its
+    triggers, so put back the FTS sync triggers of any index that exists.
+    """
+    from .models import MenuItem, Restaurant
+
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    tables = set(conn.introspection.table_names())
+    for model in (Restaurant, MenuItem):
+        if fts_table(model) in tables:
+            install_search_index(model, conn)
@@ -1,17 +1,20 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Restaurant, Branch, Menu, MenuItem, Cuisine, Category
+from apps.common.serializers import FlexFieldsModelSerializer
+from .autocomplete import MAX_RESULTS
+from .models import Restaurant, Branch, Menu, MenuItem, Cuisine, Category, DeliveryZone, OpeningHours
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(FlexFieldsModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
-class CuisineSerializer(serializers.ModelSerializer):
+class CuisineSerializer(FlexFieldsModelSerializer):
     class Meta:
         model = Cuisine
         fields = '__all__'
 
-class MenuItemSerializer(serializers.ModelSerializer):
+class MenuItemSerializer(FlexFieldsModelSerializer):
     cuisine = CuisineSerializer(read_only=True)
     cuisine_id = serializers.PrimaryKeyRelatedField(
         queryset=Cuisine.objects.all(), source='cuisine', write_only=True, allow_null=True
@@ -23,28 +26,70 @@ class MenuItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = MenuItem
-        fields = '__all__'
+        exclude = ('search_document', 'allergen_mask', 'ingredient_tags')
 
-class MenuSerializer(serializers.ModelSerializer):
+class MenuSerializer(FlexFieldsModelSerializer):
     items = MenuItemSerializer(source='menuitem_set', many=True, read_only=True)
 
     class Meta:
         model = Menu
         fields = '__all__'
 
-class BranchSerializer(serializers.ModelSerializer):
+class BranchSerializer(FlexFieldsModelSerializer):
     class Meta:
         model = Branch
         fields = '__all__'
 
-class RestaurantSerializer(serializers.ModelSerializer):
-    branches = BranchSerializer(source='branch_set', many=True, read_only=True)
-
+class OpeningHoursSerializer(FlexFieldsModelSerializer):
     class Meta:
-        model = Restaurant
+        model = OpeningHours
         fields = '__all__'
+
+class DeliveryZoneSerializer(FlexFieldsModelSerializer):
+    class Meta:
+        model = DeliveryZone
         fields = '__all__'
+
+    def validate_polygon(self, value):
+        if not isinstance(value, list) or len(value) < 3:
+            raise serializers.ValidationError("A polygon needs at least three [latitude, longitude] vertices")
+        ring = []
+        for vertex in value:
+            if (not isinstance(vertex, (list, tuple)) or len(vertex) != 2
+                    or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in vertex)):
+                raise serializers.ValidationError("Each vertex must be a [latitude, longitude] pair")
+            latitude, longitude = vertex
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise serializers.ValidationError("Vertex out of range")
+            ring.append([latitude, longitude])
+        if max(v[1] for v in ring) - min(v[1] for v in ring) > 180:
+            raise serializers.ValidationError("Polygons crossing the antimeridian are not supported")
+        return ring
+
+class NearbyBranchSerializer(BranchSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+class NearbyQuerySerializer(serializers.Serializer):
+    """Query parameters of a proximity search"""
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(
+        min_value=0.01, max_value=settings.NEARBY_MAX_RADIUS_KM, default=settings.NEARBY_DEFAULT_RADIUS_KM
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=settings.NEARBY_MAX_RESULTS, default=20)
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Query parameters of a typeahead lookup"""
+    q = serializers.CharField(max_length=100, trim_whitespace=False)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_RESULTS, default=8)
+
+class RestaurantSerializer(FlexFieldsModelSerializer):
+    class Meta:
+        model = Restaurant
+        exclude = ('search_document',)
         read_only_fields = ('owner', 'created_at', 'is_approved')
+        # ?expand=branches
+        expandable_fields = {'branches': (BranchSerializer, {'many': True})}
 
 class RestaurantApprovalSerializer(serializers.ModelSerializer):
     class Meta:
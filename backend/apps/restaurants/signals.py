@@ -0,0 +1,170 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from apps.locations.models import Address, City, Country
+from .autocomplete import queue_changes
+from .catalog import record_changes
+from .facets import catalog_version
+from .hours import compile_opening_hours
+from .listing import listing_version
+from .models import Restaurant, Branch, Menu, MenuItem, Category, Cuisine, OpeningHours
+from .search import refresh_menu_item_documents, refresh_restaurant_documents
+
+
+@receiver([post_save, post_delete], sender=MenuItem)
+def bump_menu_version(sender, instance, **kwargs):
+    """A menu renders its items, so any item write changes the menu"""
+    menu_ids = {instance.menu_id}
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded and loaded.get('menu_id') not in (None, instance.menu_id):
+        menu_ids.add(loaded['menu_id'])  # moved out of another menu
+    Menu.bump_versions(pk__in=menu_ids)
+
+
+@receiver([post_save, post_delete], sender=Branch)
+def bump_restaurant_version(sender, instance, **kwargs):
+    """A restaurant renders its branches"""
+    Restaurant.bump_versions(pk=instance.restaurant_id)
+
+
+@receiver([post_save, pre_delete], sender=Category)
+def bump_menus_for_category(sender, instance, **kwargs):
+    """Items embed their category; bump before delete, while items still point at it"""
+    Menu.bump_versions(menuitem__category=instance)
+
+
+@receiver([post_save, pre_delete], sender=Cuisine)
+def bump_menus_for_cuisine(sender, instance, **kwargs):
+    Menu.bump_versions(menuitem__cuisine=instance)
+
+
+@receiver([post_save, post_delete], sender=MenuItem)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Cuisine)
+def invalidate_menu_facets(sender, instance, **kwargs):
+    """Item writes change facet counts; deleting a label moves its items to no label"""
+    catalog_version.bump_on_commit()
+
+
+@receiver([post_save, post_delete], sender=MenuItem)
+def feed_menu_catalog(sender, instance, **kwargs):
+    record_changes([instance.pk])
+
+
+@receiver(post_save, sender=Menu)
+def feed_menu_catalog_for_menu(sender, instance, created, **kwargs):
+    """Items carry their menu's branch"""
+    if not created:
+        record_changes(MenuItem.objects.filter(menu=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Cuisine)
+def feed_menu_catalog_after_label_delete(sender, instance, **kwargs):
+    record_changes(getattr(instance, '_search_item_ids', None))
+
+
+@receiver([post_save, post_delete], sender=Restaurant)
+@receiver([post_save, post_delete], sender=Branch)
+@receiver(post_save, sender=Address)
+@receiver(post_save, sender=City)
+def invalidate_restaurant_listing(sender, instance, **kwargs):
+    """Listing pages embed restaurants and are searched by branch names, streets and cities"""
+    if sender in (Address, City) and kwargs.get('created'):
+        return
+    listing_version.bump_on_commit()
+
+
+# Autocomplete names; patched after commit so rolled-back writes never show up
+
+@receiver(post_save, sender=Restaurant)
+def autocomplete_restaurant(sender, instance, **kwargs):
+    """Approval and activity decide whether the restaurant's items are offered too"""
+    queue_changes('restaurant', [instance.pk])
+    items = MenuItem.objects.filter(menu__branch__restaurant=instance).values_list('pk', flat=True)
+    queue_changes('menu_item', items)
+
+
+@receiver(post_delete, sender=Restaurant)
+@receiver([post_save, post_delete], sender=MenuItem)
+@receiver([post_save, post_delete], sender=Cuisine)
+@receiver([post_save, post_delete], sender=City)
+def autocomplete_name(sender, instance, **kwargs):
+    kind = {Restaurant: 'restaurant', MenuItem: 'menu_item', Cuisine: 'cuisine', City: 'city'}[sender]
+    queue_changes(kind, [instance.pk])  # pk now: a delete clears it before commit
+
+
+# Search documents embed related rows, so writes to those rows refresh them
+
+@receiver([post_save, post_delete], sender=Branch)
+def refresh_restaurant_search(sender, instance, **kwargs):
+    refresh_restaurant_documents(Restaurant.objects.filter(pk=instance.restaurant_id))
+
+
+@receiver(post_save, sender=Address)
+def refresh_search_for_address(sender, instance, created, **kwargs):
+    if not created:
+        refresh_restaurant_documents(Restaurant.objects.filter(branches__address=instance))
+
+
+@receiver(post_save, sender=City)
+def refresh_search_for_city(sender, instance, created, **kwargs):
+    if not created:
+        refresh_restaurant_documents(Restaurant.objects.filter(branches__address__city=instance))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Cuisine)
+def remember_items_for_search(sender, instance, **kwargs):
+    """SET_NULL clears the items' foreign key without saving them; note which ones to refresh"""
+    field = 'category' if sender is Category else 'cuisine'
+    instance._search_item_ids = list(MenuItem.objects.filter(**{field: instance}).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Cuisine)
+def refresh_search_for_label(sender, instance, created, **kwargs):
+    if not created:
+        field = 'category' if sender is Category else 'cuisine'
+        refresh_menu_item_documents(MenuItem.objects.filter(**{field: instance}))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Cuisine)
+def refresh_search_after_label_delete(sender, instance, **kwargs):
+    item_ids = getattr(instance, '_search_item_ids', None)
+    if item_ids:
+        refresh_menu_item_documents(MenuItem.objects.filter(pk__in=item_ids))
+
+
+# Compiled open intervals depend on the hours, the legacy daily times and the branch's timezone
+
+@receiver([post_save, post_delete], sender=OpeningHours)
+def compile_hours(sender, instance, origin=None, **kwargs):
+    # Deleting the branch (or anything above it) cascades here; recompiling would
+    # fall back to its legacy times and write intervals for a branch about to go
+    if origin is not None and getattr(origin, 'model', type(origin)) is not OpeningHours:
+        return
+    compile_opening_hours(Branch.objects.filter(pk=instance.branch_id))
+
+
+@receiver(post_save, sender=Branch)
+def compile_branch_hours(sender, instance, **kwargs):
+    compile_opening_hours(Branch.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Address)
+def compile_hours_for_address(sender, instance, created, **kwargs):
+    if not created:
+        compile_opening_hours(Branch.objects.filter(address=instance))
+
+
+@receiver(post_save, sender=City)
+def compile_hours_for_city(sender, instance, created, **kwargs):
+    if not created:
+        compile_opening_hours(Branch.objects.filter(address__city=instance))
+
+
+@receiver(post_save, sender=Country)
+def compile_hours_for_country(sender, instance, created, **kwargs):
+    if not created:
+        compile_opening_hours(Branch.objects.filter(address__city__country=instance))
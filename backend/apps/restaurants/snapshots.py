@@ -0,0 +1,58 @@
+"""
+Pre-rendered menu documents.
+
+A menu's GET body (the menu, its items and each item's category and cuisine)
+is stored as JSON bytes in MenuSnapshot, tagged with the menu version it was
+rendered from. Every write that changes what a menu renders bumps that version
+in the same statement or transaction (see signals), so a snapshot whose version
+differs is stale by construction and is never served; the next read renders it
+again. Readers take the version before the data, so a racing write can only
+make a snapshot look older than its contents, never newer.
+"""
+from django.db.models import F, Prefetch
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+RENDER_CHUNK_SIZE = 200
+
+
+def with_render_prefetches(queryset):
+    """The prefetches MenuSerializer needs, so rendering a menu costs a fixed number of queries"""
+    item_model = queryset.model._meta.get_field('menuitem').related_model
+    return queryset.prefetch_related(
+        Prefetch('menuitem_set', queryset=item_model.objects.select_related('cuisine', 'category'))
+    )
+
+
+def render_menu(menu):
+    from .serializers import MenuSerializer
+
+    return JSONRenderer().render(MenuSerializer(menu).data)
+
+
+def store_snapshots(menus, bodies):
+    """Upsert one snapshot per (menu, body), tagged with the version each menu was read at"""
+    from .models import MenuSnapshot
+
+    now = timezone.now()
+    MenuSnapshot.objects.bulk_create(
+        [MenuSnapshot(menu_id=menu.pk, version=menu.version, body=body, rendered_at=now)
+         for menu, body in zip(menus, bodies)],
+        update_conflicts=True,
+        unique_fields=['menu'],
+        update_fields=['version', 'body', 'rendered_at'],
+    )
+
+
+def rebuild_menu_snapshots(queryset, stale_only=False):
+    """Render and store snapshots for the menus in queryset; returns how many were written"""
+    if stale_only:
+        queryset = queryset.exclude(snapshot__version=F('version'))
+    written = 0
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    for first in range(0, len(ids), RENDER_CHUNK_SIZE):
+        chunk = queryset.model.objects.filter(pk__in=ids[first:first + RENDER_CHUNK_SIZE])
+        menus = list(with_render_prefetches(chunk))
+        store_snapshots(menus, [render_menu(menu) for menu in menus])
+        written += len(menus)
+    return written
@@ -0,0 +1,101 @@
+"""
+Allergen and ingredient tags parsed from a menu item's comma-separated text.
+
+allergens and ingredients stay the editable fields; saving an item parses
+them into a shared vocabulary. Each Allergen owns one bit of
+MenuItem.allergen_mask, so "contains none of these" is a single integer AND
+over one column. Ingredients are open-ended, so they are linked through the
+ingredient_tags table instead and "has this ingredient" is one indexed join.
+
+Names are lowercased with whitespace collapsed. A signed 64-bit mask has 63
+usable bits; allergens added after that get no bit and are matched against
+the text instead (see MenuItemQuerySet.excluding_allergens).
+"""
+MAX_ALLERGEN_BITS = 63
+TAG_MAX_LENGTH = 100  # Allergen.name and Ingredient.name
+TAG_CHUNK_SIZE = 2000
+
+
+def normalize_tag(name):
+    return ' '.join(name.lower().split())[:TAG_MAX_LENGTH]
+
+
+def parse_tags(text):
+    """Distinct normalized names from comma-separated text, in order"""
+    names = (normalize_tag(part) for part in (text or '').split(','))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def allergen_bits(allergen_model, names):
+    """{name: bit or None} for names, adding the unknown ones to the vocabulary"""
+    names = set(names)
+    while True:
+        bits = dict(allergen_model.objects.filter(name__in=names).values_list('name', 'bit'))
+        missing = sorted(names - bits.keys())
+        if not missing:
+            return bits
+        used = set(allergen_model.objects.exclude(bit=None).values_list('bit', flat=True))
+        free = [bit for bit in range(MAX_ALLERGEN_BITS) if bit not in used]
+        # A concurrent writer may take a name or a bit first; conflicts are skipped and the loop re-reads
+        allergen_model.objects.bulk_create(
+            [allergen_model(name=name, bit=free[n] if n < len(free) else None) for n, name in enumerate(missing)],
+            ignore_conflicts=True,
+        )
+
+
+def known_allergen_bits(allergen_model, names):
+    """{name: bit or None} for the names already in the vocabulary; no item lists any other"""
+    return dict(allergen_model.objects.filter(name__in=set(names)).values_list('name', 'bit'))
+
+
+def mask_of(bits):
+    mask = 0
+    for bit in bits:
+        if bit is not None:
+            mask |= 1 << bit
+    # Stored in a signed column: bit 62 is the highest, so the value is never negative
+    return mask
+
+
+def ingredient_ids(ingredient_model, names):
+    """{name: id} for names, adding the unknown ones to the vocabulary"""
+    names = set(names)
+    if not names:
+        return {}
+    ingredient_model.objects.bulk_create(
+        [ingredient_model(name=name) for name in names], ignore_conflicts=True
+    )
+    return dict(ingredient_model.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def allergen_mask(allergen_model, text):
+    """The allergen_mask for an allergens text"""
+    names = parse_tags(text)
+    return mask_of(allergen_bits(allergen_model, names).values()) if names else 0
+
+
+def tag_menu_items(queryset, allergen_model):
+    """Recompute allergen_mask and ingredient tags for every item in queryset; returns how many"""
+    model = queryset.model
+    tags = model._meta.get_field('ingredient_tags')
+    through = tags.remote_field.through
+    tagged = 0
+    ids = list(queryset.order_by().values_list('pk', flat=True))
+    for first in range(0, len(ids), TAG_CHUNK_SIZE):
+        chunk = ids[first:first + TAG_CHUNK_SIZE]
+        items = list(model.objects.filter(pk__in=chunk).only('pk', 'allergens', 'ingredients'))
+        allergens = {item.pk: parse_tags(item.allergens) for item in items}
+        ingredients = {item.pk: parse_tags(item.ingredients) for item in items}
+        bits = allergen_bits(allergen_model, {name for names in allergens.values() for name in names})
+        known = ingredient_ids(tags.related_model, {name for names in ingredients.values() for name in names})
+        for item in items:
+            item.allergen_mask = mask_of(bits[name] for name in allergens[item.pk])
+        model.objects.bulk_update(items, ['allergen_mask'])
+        through.objects.filter(menuitem_id__in=chunk).delete()
+        through.objects.bulk_create([
+            through(menuitem_id=item_id, ingredient_id=known[name])
+            for item_id, names in ingredients.items() for name in names
+        ])
+        tagged += len(items)
+    return tagged
+
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.locations.models import City, Country
+from apps.restaurants.autocomplete import get_index, index_version, reset_index
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Cuisine
+
+User = get_user_model()
+
+
+class AutocompleteTests(APITestCase):
+    url = '/api/v1/restaurants/autocomplete/'
+
+    def setUp(self):
+        cache.clear()
+        reset_index()
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.restaurant = self.create_restaurant("Mario's Pizzeria")
+        self.hidden = self.create_restaurant('Pizza Secret', is_approved=False)
+        thai = Cuisine.objects.create(name='Thai')
+        Cuisine.objects.create(name='Thali House')
+        menu = Menu.objects.create(branch=Branch.objects.create(restaurant=self.restaurant, name='Main', phone='1'))
+        for name in ('Pizza Margherita', 'Thai Green Curry', 'Pad Thai', 'Café Latte'):
+            MenuItem.objects.create(menu=menu, name=name, price='9.00', cuisine=thai)
+        hidden_menu = Menu.objects.create(branch=Branch.objects.create(restaurant=self.hidden, name='B', phone='1'))
+        MenuItem.objects.create(menu=hidden_menu, name='Pizza Bianca', price='9.00')
+        City.objects.create(country=Country.objects.create(name='Thailand', code='TH'), name='Bangkok')
+
+    def tearDown(self):
+        reset_index()
+
+    def create_restaurant(self, name, is_approved=True):
+        return Restaurant.objects.create(
+            name=name, owner=self.owner, phone='123', email='r@example.com', is_approved=is_approved
+        )
+
+    def complete(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item['type'], item['name']) for item in response.data['results']]
+
+    def test_matches_any_word_by_prefix(self):
+        self.assertEqual(self.complete('piz'), [
+            ('restaurant', "Mario's Pizzeria"), ('menu_item', 'Pizza Margherita'),
+        ])
+        self.assertEqual(self.complete('marg'), [('menu_item', 'Pizza Margherita')])
+        self.assertEqual(self.complete('  PIZZA   marg'), [('menu_item', 'Pizza Margherita')])
+        self.assertEqual(self.complete('cafe'), [('menu_item', 'Café Latte')])
+        self.assertEqual(self.complete('bang'), [('city', 'Bangkok')])
+        self.assertEqual(self.complete('zzz'), [])
+
+    def test_most_popular_first(self):
+        # Thai has four items, the rest none; ties go by name
+        self.assertEqual(self.complete('tha'), [
+            ('cuisine', 'Thai'), ('menu_item', 'Pad Thai'),
+            ('menu_item', 'Thai Green Curry'), ('cuisine', 'Thali House'),
+        ])
+        self.assertEqual(self.complete('tha', limit=1), [('cuisine', 'Thai')])
+
+    def test_validation(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'limit': 50}).status_code, 400)
+
+    @override_settings(CACHES=settings.SHARED_CACHES)
+    def test_warm_lookups_run_no_queries(self):
+        self.complete('piz')
+        with self.assertNumQueries(0):
+            self.complete('pizzeria')
+            self.complete('p')
+
+    def test_saves_patch_the_index(self):
+        self.complete('piz')
+        index = get_index()
+        version = index_version.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant.name = 'Luigi Trattoria'
+            self.restaurant.save()
+            pizzeria = self.create_restaurant('Pizzeria Nova')
+            MenuItem.objects.get(name='Café Latte').delete()
+        self.assertEqual(get_index().version, version + 1)  # the transaction's writes make one patch
+        self.assertEqual(self.complete('piz'), [('menu_item', 'Pizza Margherita'), ('restaurant', 'Pizzeria Nova')])
+        self.assertEqual(self.complete('trat'), [('restaurant', 'Luigi Trattoria')])
+        self.assertEqual(self.complete('caf'), [])
+        self.assertEqual(get_index().built_at, index.built_at)  # patched, not rebuilt
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hidden.is_approved = True
+            self.hidden.save()
+            pizzeria.delete()
+        self.assertEqual(self.complete('piz'), [
+            ('menu_item', 'Pizza Bianca'), ('menu_item', 'Pizza Margherita'), ('restaurant', 'Pizza Secret'),
+        ])
+
+    @override_settings(AUTOCOMPLETE_REBUILD_INTERVAL=0)
+    def test_other_processes_writes_trigger_a_rebuild(self):
+        self.complete('piz')
+        Cuisine.objects.filter(name='Thali House').update(name='Tapas')  # as if written elsewhere
+        self.assertIn(('cuisine', 'Thali House'), self.complete('thal'))
+        index_version.bump()
+        self.assertEqual(self.complete('thal'), [])
+        self.assertEqual(self.complete('tap'), [('cuisine', 'Tapas')])
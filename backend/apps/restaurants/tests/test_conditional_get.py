@@ -0,0 +1,86 @@
+from decimal import Decimal
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Category
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=self.owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        self.branch = Branch.objects.create(restaurant=self.restaurant, name='Main Branch', phone='123')
+        self.menu = Menu.objects.create(branch=self.branch, name='Main Menu')
+        self.category = Category.objects.create(name='Pizza')
+        self.item = MenuItem.objects.create(menu=self.menu, category=self.category, name='Cheese', price='10.00')
+        self.menu_url = f'/api/v1/restaurants/menus/{self.menu.id}/'
+        self.restaurant_url = f'/api/v1/restaurants/restaurants/{self.restaurant.id}/'
+
+    def assertRevalidates(self, url):
+        """Fetch, then confirm the ETag yields a 304 in a single query; returns the ETag"""
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    def assertChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_menu_revalidates_until_an_item_changes(self):
+        etag = self.assertRevalidates(self.menu_url)
+        self.item.price = Decimal('11.00')
+        self.item.save()
+        self.assertChanged(self.menu_url, etag)
+
+    def test_menu_changes_with_new_item_and_category_rename(self):
+        etag = self.assertRevalidates(self.menu_url)
+        MenuItem.objects.create(menu=self.menu, name='Pepperoni', price='12.00')
+        self.assertChanged(self.menu_url, etag)
+
+        etag = self.assertRevalidates(self.menu_url)
+        self.category.name = 'Pizzas'
+        self.category.save()
+        self.assertChanged(self.menu_url, etag)
+
+    def test_restaurant_changes_with_own_write_and_branch_write(self):
+        etag = self.assertRevalidates(self.restaurant_url)
+        self.restaurant.description = 'Now with a new oven'
+        self.restaurant.save()
+        self.assertChanged(self.restaurant_url, etag)
+
+        etag = self.assertRevalidates(self.restaurant_url)
+        Branch.objects.create(restaurant=self.restaurant, name='Second Branch', phone='123')
+        self.assertChanged(self.restaurant_url, etag)
+
+    def test_hidden_restaurant_is_not_revalidated(self):
+        etag = self.client.get(self.restaurant_url)['ETag']
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(is_approved=False)
+        response = self.client.get(self.restaurant_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_sparse_and_expanded_representations_get_their_own_etags(self):
+        full = self.assertRevalidates(self.restaurant_url)
+        sparse = self.assertRevalidates(f'{self.restaurant_url}?fields=name,id')
+        expanded = self.assertRevalidates(f'{self.restaurant_url}?expand=branches')
+        self.assertEqual(len({full, sparse, expanded}), 3)
+
+        # The same selection in another order is the same representation
+        response = self.client.get(f'{self.restaurant_url}?fields=id,,name', HTTP_IF_NONE_MATCH=sparse)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(f'{self.restaurant_url}?fields=id,name', HTTP_IF_NONE_MATCH=full)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], sparse)
+
+    def test_save_returns_the_new_version_without_reading_it_back(self):
+        version = Menu.objects.get(pk=self.menu.pk).version  # adding the item bumped it
+        with self.assertNumQueries(1):
+            self.menu.save(update_fields=['name'])
+        self.assertEqual(self.menu.version, version + 1)
@@ -0,0 +1,136 @@
+import random
+from decimal import Decimal
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.cart.models import Cart, CartItem
+from apps.delivery.models import DeliveryStatus
+from apps.locations.geo import point_in_polygon
+from apps.locations.models import Country, City, Address, UserAddress
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, DeliveryZone, DeliveryZoneCell
+
+User = get_user_model()
+
+# A 0.1 x 0.1 degree square (about 11km) at the origin, and an L-shaped zone east of it
+SQUARE = [[0, 0], [0, 0.1], [0.1, 0.1], [0.1, 0]]
+L_SHAPE = [[0, 0.2], [0, 0.4], [0.1, 0.4], [0.1, 0.3], [0.3, 0.3], [0.3, 0.2]]
+
+
+class DeliveryZoneTests(APITestCase):
+    restaurants_url = '/api/v1/restaurants/restaurants/'
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.customer = User.objects.create_user(email='customer@example.com', password='password123')
+        self.square = self.make_restaurant('Square Grill', SQUARE)
+        self.l_shape = self.make_restaurant('Corner Bistro', L_SHAPE)
+        self.anywhere = self.make_restaurant('Anywhere Deli')
+
+        country = Country.objects.create(name='Test Country', code='TC', currency='USD', timezone='UTC')
+        self.city = City.objects.create(name='Test City', country=country)
+
+    def make_restaurant(self, name, polygon=None):
+        restaurant = Restaurant.objects.create(
+            name=name, owner=self.owner, phone='123', email='r@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=restaurant, name='Main', phone='123')
+        if polygon:
+            DeliveryZone.objects.create(branch=branch, name='Zone', polygon=polygon)
+        return restaurant
+
+    def make_address(self, latitude, longitude, user=None):
+        address = Address.objects.create(
+            street_address='1 Main St', city=self.city, state='State', postal_code='12345',
+            latitude=latitude, longitude=longitude
+        )
+        if user:
+            UserAddress.objects.create(user=user, address=address)
+        return address
+
+    def serving(self, latitude, longitude):
+        return set(Restaurant.objects.delivering_to(latitude, longitude).values_list('name', flat=True))
+
+    def test_cell_lookup_matches_exact_polygon_test(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            lat, lng = rng.uniform(-0.05, 0.35), rng.uniform(-0.05, 0.45)
+            zones = set(DeliveryZone.objects.covering(lat, lng).values_list('branch__restaurant__name', flat=True))
+            expected = {
+                name for name, polygon in (('Square Grill', SQUARE), ('Corner Bistro', L_SHAPE))
+                if point_in_polygon(lat, lng, polygon)
+            }
+            self.assertEqual(zones, expected, (lat, lng))
+
+    def test_zoneless_restaurants_deliver_everywhere(self):
+        self.assertEqual(self.serving(0.05, 0.05), {'Square Grill', 'Anywhere Deli'})
+        self.assertEqual(self.serving(0.2, 0.35), {'Anywhere Deli'})  # the notch of the L
+        self.assertEqual(self.serving(0.25, 0.25), {'Corner Bistro', 'Anywhere Deli'})
+        self.assertEqual(self.serving(None, None), {'Anywhere Deli'})
+
+    def test_inactive_zone_lifts_restriction(self):
+        DeliveryZone.objects.filter(branch__restaurant=self.square).update(is_active=False)
+        self.assertIn('Square Grill', self.serving(0.5, 0.5))
+
+    def test_editing_polygon_rebuilds_cells(self):
+        zone = DeliveryZone.objects.get(branch__restaurant=self.square)
+        old_cells = set(zone.cells.values_list('cell', flat=True))
+        zone.polygon = [[1, 1], [1, 1.1], [1.1, 1.1], [1.1, 1]]
+        zone.save()
+        self.assertNotIn('Square Grill', self.serving(0.05, 0.05))
+        self.assertIn('Square Grill', self.serving(1.05, 1.05))
+        self.assertFalse(DeliveryZoneCell.objects.filter(zone=zone, cell__in=old_cells).exists())
+
+        cells = DeliveryZoneCell.objects.filter(zone=zone).count()
+        zone = DeliveryZone.objects.get(pk=zone.pk)
+        zone.name = 'Renamed'
+        with self.assertNumQueries(1):  # unchanged polygon, no re-rasterization
+            zone.save()
+        self.assertEqual(DeliveryZoneCell.objects.filter(zone=zone).count(), cells)
+
+    def test_list_filtered_by_point_or_address(self):
+        response = self.client.get(self.restaurants_url, {'deliver_to': '0.05,0.05'})
+        self.assertEqual({row['name'] for row in response.data['results']}, {'Square Grill', 'Anywhere Deli'})
+
+        address = self.make_address(Decimal('0.25'), Decimal('0.25'), user=self.customer)
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(self.restaurants_url, {'deliver_to': str(address.id)})
+        self.assertEqual({row['name'] for row in response.data['results']}, {'Corner Bistro', 'Anywhere Deli'})
+
+        other = self.make_address(Decimal('0.25'), Decimal('0.25'))  # not the customer's
+        self.assertEqual(self.client.get(self.restaurants_url, {'deliver_to': str(other.id)}).status_code, 400)
+        self.assertEqual(self.client.get(self.restaurants_url, {'deliver_to': 'nowhere'}).status_code, 400)
+        self.assertEqual(self.client.get(self.restaurants_url, {'deliver_to': '95,0'}).status_code, 400)
+
+    def test_checkout_outside_zone_rejected(self):
+        DeliveryStatus.objects.create(status='PENDING')
+        cart = Cart.objects.create(user=self.customer)
+        for restaurant in (self.square, self.anywhere):
+            menu = Menu.objects.create(branch=restaurant.branches.get(), name='Menu')
+            item = MenuItem.objects.create(menu=menu, name=f'{restaurant.name} special', price='5.00')
+            CartItem.objects.add_quantity(cart.pk, item.pk, 1, item.price)
+        self.client.force_authenticate(user=self.customer)
+        url = '/api/v1/orders/order-groups/checkout/'
+
+        outside = self.make_address(Decimal('0.5'), Decimal('0.5'))
+        response = self.client.post(url, {'address_id': outside.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors']['restaurants'], [str(self.square.pk)])
+
+        inside = self.make_address(Decimal('0.05'), Decimal('0.05'))
+        response = self.client.post(url, {'address_id': inside.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_polygon_validated(self):
+        self.client.force_authenticate(user=self.owner)
+        branch = self.anywhere.branches.get()
+        url = '/api/v1/restaurants/delivery-zones/'
+        for polygon in ([[0, 0], [1, 1]], [[0, 0], [0, 1], ['a', 1]], [[0, 0], [0, 1], [100, 1]]):
+            response = self.client.post(url, {'branch': branch.pk, 'name': 'Z', 'polygon': polygon}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, polygon)
+
+        response = self.client.post(url, {'branch': branch.pk, 'name': 'Z', 'polygon': SQUARE}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(response.data['cell_precision'], 0)
+        self.assertNotIn('Anywhere Deli', self.serving(0.5, 0.5))
@@ -0,0 +1,111 @@
+from io import StringIO
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from apps.common.search import search_terms
+from apps.locations.models import Country, City, Address
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Category, Cuisine
+
+User = get_user_model()
+
+
+class FullTextSearchTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        country = Country.objects.create(name='Test Country', code='TC', currency='USD', timezone='UTC')
+        self.city = City.objects.create(name='Springfield', country=country)
+
+        self.pizza = self.restaurant('Pizza Palace', 'Wood fired pizza')
+        self.noodle = self.restaurant('Noodle Bar', 'Hand pulled noodles, pizza on fridays')
+        address = Address.objects.create(
+            street_address='12 Evergreen Terrace', city=self.city, state='State', postal_code='12345'
+        )
+        self.branch = Branch.objects.create(restaurant=self.noodle, name='Downtown', phone='123', address=address)
+        # A second branch in the same city must not duplicate the restaurant
+        Branch.objects.create(restaurant=self.noodle, name='Uptown', phone='123', address=Address.objects.create(
+            street_address='1 Main St', city=self.city, state='State', postal_code='12345'
+        ))
+
+        self.menu = Menu.objects.create(branch=self.branch, name='Main Menu')
+        self.category = Category.objects.create(name='Mains')
+        self.cuisine = Cuisine.objects.create(name='Sichuan')
+        self.dandan = MenuItem.objects.create(
+            menu=self.menu, category=self.category, cuisine=self.cuisine, name='Dan Dan Noodles',
+            price='9.00', ingredients='pork, chilli oil, peanuts'
+        )
+        self.margherita = MenuItem.objects.create(
+            menu=self.menu, category=self.category, name='Pizza Margherita', price='11.00'
+        )
+
+    def restaurant(self, name, description):
+        return Restaurant.objects.create(
+            name=name, description=description, owner=self.owner, phone='123',
+            email='r@example.com', is_approved=True, is_active=True
+        )
+
+    def search(self, url, query):
+        response = self.client.get(url, {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.data['results']]
+
+    def search_restaurants(self, query):
+        return self.search('/api/v1/restaurants/restaurants/', query)
+
+    def search_items(self, query):
+        return self.search('/api/v1/restaurants/menu-items/', query)
+
+    def test_terms_match_as_prefixes_and_all_must_match(self):
+        self.assertEqual(self.search_items('marg piz'), ['Pizza Margherita'])
+        self.assertEqual(self.search_items('noodles pizza'), [])
+
+    def test_menu_items_match_category_cuisine_and_ingredients(self):
+        self.assertEqual(sorted(self.search_items('mains')), ['Dan Dan Noodles', 'Pizza Margherita'])
+        self.assertEqual(self.search_items('sichuan'), ['Dan Dan Noodles'])
+        self.assertEqual(self.search_items('peanut'), ['Dan Dan Noodles'])
+
+    def test_restaurants_match_branch_city_and_street_once(self):
+        self.assertEqual(self.search_restaurants('springfield'), ['Noodle Bar'])
+        self.assertEqual(self.search_restaurants('evergreen'), ['Noodle Bar'])
+        self.assertEqual(self.search_restaurants('uptown'), ['Noodle Bar'])
+
+    def test_results_ranked_by_relevance(self):
+        # "pizza" is in Pizza Palace's name and description but only the description of Noodle Bar
+        self.assertEqual(self.search_restaurants('pizza'), ['Pizza Palace', 'Noodle Bar'])
+
+    def test_explicit_ordering_overrides_rank(self):
+        response = self.client.get('/api/v1/restaurants/restaurants/', {'search': 'pizza', 'ordering': 'name'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Noodle Bar', 'Pizza Palace'])
+
+    def test_documents_follow_related_writes(self):
+        self.city.name = 'Shelbyville'
+        self.city.save()
+        self.assertEqual(self.search_restaurants('shelbyville'), ['Noodle Bar'])
+        self.assertEqual(self.search_restaurants('springfield'), [])
+
+        self.category.name = 'Classics'
+        self.category.save()
+        self.assertEqual(len(self.search_items('classics')), 2)
+
+        self.cuisine.delete()
+        self.assertEqual(self.search_items('sichuan'), [])
+
+        self.margherita.name = 'Pizza Diavola'
+        self.margherita.save(update_fields=['name'])
+        self.assertEqual(self.search_items('diavola'), ['Pizza Diavola'])
+
+        self.branch.delete()
+        self.assertEqual(self.search_restaurants('evergreen'), [])
+        self.assertEqual(self.search_items('pizza'), [])
+
+    def test_search_document_not_serialized(self):
+        response = self.client.get(f'/api/v1/restaurants/menu-items/{self.dandan.pk}/')
+        self.assertNotIn('search_document', response.data)
+
+    def test_query_punctuation_is_ignored(self):
+        self.assertEqual(search_terms('"Dan" AND (NEAR*'), ['dan', 'and', 'near'])
+        self.assertEqual(self.search_items('"dan" -noodles*'), ['Dan Dan Noodles'])
+
+    def test_rebuild_command_restores_documents(self):
+        MenuItem.objects.update(search_document='')
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search_items('peanut'), ['Dan Dan Noodles'])
@@ -0,0 +1,161 @@
+import re
+from decimal import ROUND_CEILING, ROUND_FLOOR
+from unittest import mock, skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from apps.restaurants.catalog import cents, get_catalog, np, reset_catalog
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, MenuItemChange, Category, Cuisine
+
+User = get_user_model()
+
+
+class MenuCatalogTestCase(APITestCase):
+    url = '/api/v1/restaurants/menu-items/'
+
+    def setUp(self):
+        reset_catalog()
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        self.branches = [Branch.objects.create(restaurant=restaurant, name=name, phone='123') for name in ('A', 'B')]
+        self.menus = [Menu.objects.create(branch=branch) for branch in self.branches]
+        self.category = Category.objects.create(name='Pizza')
+        self.cuisine = Cuisine.objects.create(name='Italian')
+        for n in range(30):
+            MenuItem.objects.create(
+                menu=self.menus[n % 2], name=f'{"Zesty" if n % 3 else "apple"} dish {n % 7}', price=f'{5 + n % 6}.50',
+                category=self.category if n % 4 else None, cuisine=self.cuisine if n % 5 else None,
+                is_vegetarian=n % 2 == 0, is_vegan=n % 6 == 0, is_available=n % 7 != 0,
+                allergens='nuts' if n % 3 == 0 else ('milk, soy' if n % 3 == 1 else ''),
+                ingredients='tomato' if n % 2 else '',
+            )
+
+    def tearDown(self):
+        reset_catalog()
+
+    def walk(self, params):
+        """Item ids of every page, following next cursors, and the first page's ids walked back from the second"""
+        response = self.client.get(self.url, {**params, 'page_size': 4})
+        self.assertEqual(response.status_code, 200)
+        pages = [[item['id'] for item in response.data['results']]]
+        while response.data.get('next'):
+            response = self.client.get(response.data['next'])
+            pages.append([item['id'] for item in response.data['results']])
+        back = None
+        if len(pages) > 1:
+            second = self.client.get(self.client.get(self.url, params).data['next'])
+            back = [item['id'] for item in self.client.get(second.data['previous']).data['results']]
+        return pages, back
+
+
+class PriceRangeFilterTests(MenuCatalogTestCase):
+    def test_min_and_max_price(self):
+        response = self.client.get(self.url, {'min_price': '6.50', 'max_price': '8.50', 'page': 1, 'page_size': 100})
+        prices = {item['price'] for item in response.data['results']}
+        self.assertEqual(prices, {'6.50', '7.50', '8.50'})
+
+    def test_bounds_round_inward(self):
+        self.assertEqual((cents('6.501', ROUND_CEILING), cents('8.499', ROUND_FLOOR)), (651, 849))
+        self.assertEqual((cents('6.50', ROUND_CEILING), cents('8.50', ROUND_FLOOR)), (650, 850))
+
+    def test_branch(self):
+        response = self.client.get(self.url, {'branch': self.branches[1].pk, 'page': 1, 'page_size': 100})
+        self.assertEqual(response.data['count'], 15)
+
+
+@skipUnless(np is not None, 'numpy is not installed')
+@override_settings(MENU_CATALOG_ENGINE=True, MENU_CATALOG_SYNC_INTERVAL=0)
+class CatalogEngineTests(MenuCatalogTestCase):
+    cases = (
+        {},
+        {'ordering': 'price'},
+        {'ordering': '-price'},
+        {'ordering': 'name'},
+        {'ordering': '-name,price'},
+        {'ordering': 'price', 'min_price': '6', 'max_price': '9.50'},
+        {'is_vegetarian': 'true', 'is_available': 'false'},
+        {'ordering': '-price', 'exclude_allergens': 'Nuts'},
+        {'exclude_allergens': 'milk, unknown', 'is_vegan': 'false'},
+    )
+
+    def orm_walk(self, params):
+        with override_settings(MENU_CATALOG_ENGINE=False):
+            return self.walk(params)
+
+    def assertMatchesOrm(self, params):
+        self.assertEqual(self.walk(params), self.orm_walk(params), params)
+
+    def test_pages_match_the_orm(self):
+        cases = self.cases + (
+            {'category': self.category.pk, 'ordering': 'price'},
+            {'cuisine': self.cuisine.pk, 'branch': self.branches[0].pk},
+        )
+        for params in cases:
+            self.assertMatchesOrm(params)
+        self.assertIsNotNone(get_catalog())
+
+    def test_pages_are_read_by_id(self):
+        self.walk({})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {'ordering': '-price', 'min_price': '7'})
+        page = [query['sql'] for query in queries if 'FROM "restaurants_menuitem"' in query['sql']][-1]
+        self.assertIn('"restaurants_menuitem"."id" IN', page)
+        self.assertNotIn('ORDER BY', page)
+        self.assertNotIn('LIMIT', page)
+
+    def test_name_orderings_use_the_database_collation_elsewhere(self):
+        self.walk({})
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'):
+            for ordering, ordered in (('-name', True), ('price', False)):
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(self.url, {'ordering': ordering})
+                page = [query['sql'] for query in queries if 'FROM "restaurants_menuitem"' in query['sql']][-1]
+                self.assertEqual('ORDER BY' in page, ordered, ordering)
+
+    def test_sub_cent_price_bounds_round_inward(self):
+        self.walk({})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'min_price': '6.501', 'max_price': '8.499'})
+        page = [query['sql'] for query in queries if 'FROM "restaurants_menuitem"' in query['sql']][-1]
+        offered = {int(pk) for pk in re.search(r'"id" IN \(([^)]*)\)', page).group(1).split(', ')}
+        self.assertEqual(offered, {item['id'] for item in response.data['results']})  # only the 7.50s
+
+    def test_feed_updates_appends_and_deletes(self):
+        self.walk({})  # loads the arrays
+        item = MenuItem.objects.order_by('pk').first()
+        item.price = '99.00'
+        item.allergens = 'nuts'
+        item.save()
+        MenuItem.objects.create(menu=self.menus[0], name='Late dish', price='1.00', category=self.category)
+        MenuItem.objects.filter(name='Zesty dish 1').first().delete()
+        self.menus[1].branch = self.branches[0]
+        self.menus[1].save()
+        self.category.delete()
+
+        self.assertTrue(MenuItemChange.objects.exists())
+        for params in self.cases + ({'branch': self.branches[1].pk},):
+            self.assertMatchesOrm(params)
+
+    def test_dropped_candidates_do_not_end_the_walk(self):
+        params = {'is_available': 'true', 'ordering': 'price'}
+        [first, *_], _ = self.walk(params)  # loads the arrays
+        # No signal or feed entry, so the engine still offers the item and the page drops it
+        MenuItemChange.objects.all().delete()
+        MenuItem.objects.filter(pk=first[0]).update(is_available=False)
+        pages, _ = self.walk(params)
+        self.assertEqual(sum(pages, []), sum(self.orm_walk(params)[0], []))
+
+    def test_unsupported_requests_fall_back_to_the_orm(self):
+        for params in ({'search': 'zesty'}, {'has_ingredient': 'tomato', 'ordering': 'price'}, {'page': 2}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 200, params)
+        self.assertMatchesOrm({'has_ingredient': 'tomato', 'ordering': 'price'})
+
+    def test_changes_are_not_recorded_with_the_engine_off(self):
+        with override_settings(MENU_CATALOG_ENGINE=False):
+            MenuItem.objects.create(menu=self.menus[0], name='Quiet', price='1.00')
+        self.assertFalse(MenuItemChange.objects.filter(item_id=MenuItem.objects.get(name='Quiet').pk).exists())
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from apps.restaurants.facets import FACET_FIELDS
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Category, Cuisine
+
+User = get_user_model()
+
+
+class MenuItemFacetTests(APITestCase):
+    url = '/api/v1/restaurants/menu-items/'
+
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        menu = Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+        self.categories = [Category.objects.create(name=name) for name in ('Pizza', 'Pasta')]
+        self.cuisines = [Cuisine.objects.create(name=name) for name in ('Italian', 'Greek', 'Thai')]
+        for n in range(36):
+            MenuItem.objects.create(
+                menu=menu, name=f'Spicy dish {n}' if n % 4 == 0 else f'Dish {n}', price='10.00',
+                category=None if n % 9 == 0 else self.categories[n % 2],
+                cuisine=self.cuisines[n % 3],
+                is_vegetarian=n % 2 == 0, is_vegan=n % 6 == 0, is_gluten_free=n % 5 == 0, is_available=n % 7 != 0,
+            )
+
+    def facets(self, params):
+        response = self.client.get(self.url, {**params, 'facets': 'true'})
+        self.assertEqual(response.status_code, 200)
+        return {
+            name: {entry['value']: entry['count'] for entry in values}
+            for name, values in response.data['facets'].items()
+        }
+
+    def expected(self, params, name):
+        """What the frontend used to do: one filtered count per facet value, the facet's own filter dropped"""
+        others = {key: value for key, value in params.items() if key != name}
+        items = MenuItem.objects.filter(**{
+            key: (value == 'true') if key.startswith('is_') else value for key, value in others.items()
+            if key in FACET_FIELDS
+        })
+        if 'search' in params:
+            items = items.filter(name__icontains=params['search'])
+        counts = {}
+        for value in items.values_list(name, flat=True):
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def test_counts_exclude_each_facets_own_filter(self):
+        for params in (
+            {},
+            {'is_vegetarian': 'true'},
+            {'category': self.categories[0].pk, 'is_available': 'false'},
+            {'cuisine': self.cuisines[1].pk, 'is_vegan': 'true', 'is_gluten_free': 'false'},
+            {'search': 'spicy', 'is_available': 'true'},
+        ):
+            facets = self.facets(params)
+            for name in FACET_FIELDS:
+                self.assertEqual(facets[name], self.expected(params, name), (params, name))
+
+    def test_one_aggregate_query_then_cached(self):
+        params = {'is_vegetarian': 'true', 'facets': 'true'}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, params)
+        grouped = [query['sql'] for query in queries if 'GROUP BY' in query['sql']]
+        self.assertEqual(len(grouped), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url, {'facets': 'true', 'is_vegetarian': 'True', 'ordering': 'price'})
+        self.assertFalse(any('GROUP BY' in query['sql'] for query in queries))
+        self.assertEqual(
+            cached.data['facets']['is_vegetarian'], [{'value': False, 'count': 18}, {'value': True, 'count': 18}]
+        )
+
+    def test_menu_writes_invalidate(self):
+        before = self.facets({})['is_vegan'][True]
+        MenuItem.objects.create(menu=Menu.objects.get(), name='Salad', price='5.00', is_vegan=True)
+        self.assertEqual(self.facets({})['is_vegan'][True], before + 1)
+
+        pasta = self.categories[1].pk
+        self.categories[1].delete()
+        self.assertNotIn(pasta, self.facets({})['category'])
+
+    def test_facets_are_opt_in(self):
+        self.assertNotIn('facets', self.client.get(self.url).data)
@@ -0,0 +1,82 @@
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, Allergen, Ingredient
+from apps.restaurants.tags import MAX_ALLERGEN_BITS, parse_tags
+
+User = get_user_model()
+
+
+class MenuItemTagTests(APITestCase):
+    url = '/api/v1/restaurants/menu-items/'
+
+    def setUp(self):
+        owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Seafood Shack', owner=owner, phone='123', email='shack@example.com', is_approved=True
+        )
+        self.menu = Menu.objects.create(branch=Branch.objects.create(restaurant=restaurant, name='Main', phone='123'))
+        self.satay = self.item('Satay', 'chicken, Peanut Sauce', 'Peanuts, soy')
+        self.prawns = self.item('Prawns', 'prawns, garlic', 'shellfish')
+        self.salad = self.item('Salad', 'lettuce,  garlic ', '')
+
+    def item(self, name, ingredients, allergens):
+        return MenuItem.objects.create(
+            menu=self.menu, name=name, price='9.00', ingredients=ingredients, allergens=allergens
+        )
+
+    def names(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['name'] for row in response.data['results'])
+
+    def test_parse_tags(self):
+        self.assertEqual(parse_tags(' Tree  Nuts, milk,,tree nuts '), ['tree nuts', 'milk'])
+
+    def test_filters(self):
+        self.assertEqual(self.names({'exclude_allergens': 'peanuts,Shellfish'}), ['Salad'])
+        self.assertEqual(self.names({'exclude_allergens': 'soy'}), ['Prawns', 'Salad'])
+        self.assertEqual(self.names({'exclude_allergens': 'celery'}), ['Prawns', 'Salad', 'Satay'])
+        self.assertEqual(self.names({'has_ingredient': 'garlic'}), ['Prawns', 'Salad'])
+        self.assertEqual(self.names({'has_ingredient': 'garlic,PRAWNS'}), ['Prawns'])
+        self.assertEqual(self.names({'has_ingredient': 'truffle'}), [])
+        self.assertEqual(
+            self.names({'has_ingredient': 'garlic', 'exclude_allergens': 'shellfish', 'facets': 'true'}), ['Salad']
+        )
+
+    def test_single_bitwise_predicate(self):
+        with self.assertNumQueries(2):  # the allergen bits, then the page
+            self.client.get(self.url, {'exclude_allergens': 'peanuts,shellfish'})
+
+    @override_settings(CACHES=settings.SHARED_CACHES)
+    def test_edits_retag(self):
+        self.salad.allergens = 'Shellfish'
+        self.salad.ingredients = 'lettuce, anchovy'
+        self.salad.save()
+        self.assertEqual(self.names({'exclude_allergens': 'shellfish'}), ['Satay'])
+        self.assertEqual(self.names({'has_ingredient': 'anchovy'}), ['Salad'])
+        self.assertEqual(self.names({'has_ingredient': 'garlic'}), ['Prawns'])
+
+        self.prawns.name = 'King prawns'
+        # The row, the menu and cart versions, and six for the catalog version's
+        # increment in the cache table; the tags are not re-parsed
+        with self.assertNumQueries(9):
+            self.prawns.save(update_fields=['name'])
+
+    def test_vocabulary_overflow_falls_back_to_text(self):
+        Allergen.objects.bulk_create([Allergen(name=f'allergen {bit}', bit=bit) for bit in range(3, MAX_ALLERGEN_BITS)])
+        lupin = self.item('Lupin bread', 'lupin flour', 'lupin')
+        self.assertIsNone(Allergen.objects.get(name='lupin').bit)
+        self.assertEqual(lupin.allergen_mask, 0)
+        self.assertEqual(self.names({'exclude_allergens': 'lupin,soy'}), ['Prawns', 'Salad'])
+
+    def test_rebuild_command(self):
+        MenuItem.objects.filter(pk=self.prawns.pk).update(allergen_mask=0)
+        self.prawns.ingredient_tags.clear()
+        call_command('rebuild_menu_item_tags', stdout=StringIO())
+        self.assertEqual(self.names({'exclude_allergens': 'shellfish'}), ['Salad', 'Satay'])
+        self.assertEqual(self.names({'has_ingredient': 'prawns'}), ['Prawns'])
+        self.assertEqual(Ingredient.objects.filter(name='garlic').count(), 1)
@@ -0,0 +1,86 @@
+import json
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from apps.common.utils import SingleFlight
+from apps.restaurants.models import Restaurant, Branch, Menu, MenuItem, MenuSnapshot, Category, Cuisine
+from apps.restaurants.serializers import MenuSerializer
+from apps.restaurants.snapshots import with_render_prefetches
+
+User = get_user_model()
+
+
+class MenuSnapshotTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        restaurant = Restaurant.objects.create(
+            name='Pizza Place', owner=self.owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        branch = Branch.objects.create(restaurant=restaurant, name='Main Branch', phone='123')
+        self.menu = Menu.objects.create(branch=branch, name='Main Menu')
+        self.category = Category.objects.create(name='Pizza')
+        self.cuisine = Cuisine.objects.create(name='Italian')
+        for n in range(30):
+            MenuItem.objects.create(
+                menu=self.menu, category=self.category, cuisine=self.cuisine, name=f'Pizza {n}', price='10.00'
+            )
+        self.url = f'/api/v1/restaurants/menus/{self.menu.pk}/'
+
+    def fresh_render(self):
+        return MenuSerializer(with_render_prefetches(Menu.objects.filter(pk=self.menu.pk)).get()).data
+
+    def test_snapshot_matches_serializer_and_is_served_in_one_query(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(first.content), json.loads(json.dumps(self.fresh_render())))
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_cold_snapshots_render_through_single_flight(self):
+        flight = SingleFlight.group('MenuViewSet')
+        computed = flight.stats()['computed']
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(flight.stats()['computed'], computed + 1)
+
+    def test_writes_are_never_served_stale(self):
+        self.client.get(self.url)
+        item = MenuItem.objects.filter(menu=self.menu).first()
+        item.name = 'Calzone'
+        item.save()
+        self.assertIn(b'Calzone', self.client.get(self.url).content)
+
+        self.cuisine.name = 'Neapolitan'
+        self.cuisine.save()
+        self.assertIn(b'Neapolitan', self.client.get(self.url).content)
+
+        self.category.delete()
+        self.assertEqual(json.loads(self.client.get(self.url).content)['items'][0]['category'], None)
+
+        self.menu.name = 'Dinner'
+        self.menu.save()
+        self.assertEqual(json.loads(self.client.get(self.url).content)['name'], 'Dinner')
+
+    def test_conditional_get_and_missing_menu(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(self.client.get('/api/v1/restaurants/menus/999999/').status_code, 404)
+
+    def test_rebuild_command(self):
+        other = Menu.objects.create(branch=self.menu.branch, name='Drinks')
+        call_command('rebuild_menu_snapshots', stdout=StringIO())
+        self.assertEqual(MenuSnapshot.objects.count(), 2)
+
+        Menu.bump_versions(pk=other.pk)
+        out = StringIO()
+        call_command('rebuild_menu_snapshots', '--stale', stdout=out)
+        self.assertIn('written: 1', out.getvalue())
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/v1/restaurants/menus/{other.pk}/')
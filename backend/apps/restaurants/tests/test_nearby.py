@@ -0,0 +1,123 @@
+import math
+import random
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.delivery.models import DeliveryPartner, DeliveryStatus
+from apps.locations import geo
+from apps.locations.models import Country, City, Address
+from apps.orders.models import OrderGroup, Order
+from apps.restaurants.models import Restaurant, Branch
+
+User = get_user_model()
+
+
+class GeohashTests(SimpleTestCase):
+    def test_encode_matches_reference(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        self.assertEqual(geo.encode(-33.8688, 151.2093, 5), 'r3gx2')
+
+    def test_covering_cells_contain_every_point_in_radius(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            lat, lng = rng.uniform(-80, 80), rng.uniform(-179.9, 179.9)
+            radius = rng.choice([0.3, 2, 5, 25, 50])
+            cells = geo.covering_cells(lat, lng, radius)
+            for _ in range(20):
+                # Random points around the centre; those outside the radius are skipped
+                spread = radius / geo.KM_PER_DEGREE
+                p_lat = lat + rng.uniform(-1, 1) * spread
+                p_lng = lng + rng.uniform(-1, 1) * spread / max(0.05, math.cos(math.radians(lat)))
+                p_lng = (p_lng + 180) % 360 - 180
+                if not -90 <= p_lat <= 90 or geo.haversine_km(lat, lng, p_lat, p_lng) > radius:
+                    continue
+                point = geo.encode(p_lat, p_lng)
+                self.assertTrue(any(point.startswith(cell) for cell in cells), (lat, lng, radius, p_lat, p_lng))
+
+    def test_nearest_orders_by_distance_and_applies_radius(self):
+        points = [('far', 0.0, 1.0), ('near', 0.0, 0.01), ('mid', 0.0, 0.05), ('none', None, None)]
+        ranked = geo.nearest(points, 0.0, 0.0, radius_km=10, limit=5)
+        self.assertEqual([key for _, key in ranked], ['near', 'mid'])
+        self.assertAlmostEqual(ranked[0][0], 1.112, places=2)
+
+
+class NearbyBranchesTests(APITestCase):
+    url = '/api/v1/restaurants/branches/nearby/'
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.restaurant = self.make_restaurant('Corner Cafe')
+        # A street of branches heading east from the origin, one every ~1.1 km
+        self.branches = [self.make_branch(self.restaurant, f'B{n}', 0, Decimal(n) / 100) for n in range(8)]
+        hidden = self.make_restaurant('Pending Place', is_approved=False)
+        self.make_branch(hidden, 'Hidden', 0, Decimal('0.001'))
+
+    def make_restaurant(self, name, is_approved=True):
+        return Restaurant.objects.create(
+            name=name, owner=self.owner, phone='123', email='r@example.com', is_approved=is_approved
+        )
+
+    def make_branch(self, restaurant, name, latitude, longitude):
+        return Branch.objects.create(
+            restaurant=restaurant, name=name, phone='123', latitude=latitude, longitude=longitude
+        )
+
+    def test_nearest_first_within_radius(self):
+        response = self.client.get(self.url, {'lat': 0, 'lng': 0.021, 'radius_km': 2.5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['name'] for row in response.data], ['B2', 'B3', 'B1', 'B4', 'B0'])
+        self.assertAlmostEqual(response.data[0]['distance_km'], 0.111, places=2)
+
+    def test_limit_and_hidden_restaurants(self):
+        response = self.client.get(self.url, {'lat': 0, 'lng': 0, 'limit': 2})
+        self.assertEqual([row['name'] for row in response.data], ['B0', 'B1'])
+
+    def test_query_count_is_bounded(self):
+        # Two narrower probes, the full radius, then the page of branches
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'lat': 0, 'lng': 0, 'radius_km': 50})
+        # The first probe already finds enough
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'lat': 0, 'lng': 0, 'radius_km': 50, 'limit': 3})
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {'lat': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'lat': 91, 'lng': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'lat': 0, 'lng': 0, 'radius_km': 5000}).status_code, 400)
+
+    def test_geohash_follows_coordinates(self):
+        branch = self.branches[0]
+        branch.latitude, branch.longitude = Decimal('51.5'), Decimal('-0.12')
+        branch.save(update_fields=['latitude', 'longitude'])
+        branch.refresh_from_db()
+        self.assertEqual(branch.geohash, geo.encode(51.5, -0.12))
+
+        country = Country.objects.create(name='Test Country', code='TC', currency='USD', timezone='UTC')
+        address = Address.objects.create(
+            street_address='1 Main St', city=City.objects.create(name='Test City', country=country),
+            state='State', postal_code='12345'
+        )
+        self.assertEqual(address.geohash, '')
+        address.latitude, address.longitude = Decimal('48.85'), Decimal('2.35')
+        address.save()
+        self.assertTrue(Address.objects.filter(geohash=geo.encode(48.85, 2.35)).exists())
+
+    def test_available_orders_near_partner(self):
+        driver = User.objects.create_user(email='driver@example.com', password='password123')
+        DeliveryPartner.objects.create(user=driver, vehicle_type='Bike')
+        pending = DeliveryStatus.objects.create(status='PENDING')
+        far = self.make_restaurant('Far Diner')
+        self.make_branch(far, 'Far', 10, 10)
+        group = OrderGroup.objects.create(customer=driver, status='PENDING', total_price='20.00')
+        for restaurant in (self.restaurant, far):
+            Order.objects.create(
+                order_group=group, restaurant=restaurant, delivery_status=pending, total_price='10.00'
+            )
+
+        self.client.force_authenticate(user=driver)
+        url = '/api/v1/delivery/partners/available_orders/'
+        self.assertEqual(len(self.client.get(url).data['data']), 2)
+        response = self.client.get(url, {'lat': 0, 'lng': 0.05, 'radius_km': 3})
+        self.assertEqual([row['restaurant'] for row in response.data['data']], ['Corner Cafe'])
+        self.assertAlmostEqual(response.data['data'][0]['distance_km'], 0.0, places=2)
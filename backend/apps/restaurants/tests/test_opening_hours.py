@@ -0,0 +1,134 @@
+from datetime import datetime, time, timezone
+from io import StringIO
+from zoneinfo import ZoneInfo
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from apps.locations.models import Country, City, Address
+from apps.restaurants.hours import weekly_intervals
+from apps.restaurants.models import Restaurant, Branch, OpeningHours, BranchOpenInterval
+
+User = get_user_model()
+MON, FRI, SAT, SUN = 0, 4, 5, 6
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class WeeklyIntervalTests(SimpleTestCase):
+    def test_overnight_span_split_at_midnight(self):
+        self.assertEqual(
+            weekly_intervals([(FRI, time(18), time(2))]),
+            [(FRI * 1440 + 1080, SAT * 1440), (SAT * 1440, SAT * 1440 + 120)],
+        )
+
+    def test_sunday_night_wraps_to_monday(self):
+        self.assertEqual(weekly_intervals([(SUN, time(22), time(1))]), [(0, 60), (SUN * 1440 + 1320, 7 * 1440)])
+
+    def test_overlaps_merge_within_a_day(self):
+        hours = [(MON, time(9), time(12)), (MON, time(11), time(15)), (MON, time(18), time(9))]
+        self.assertEqual(weekly_intervals(hours), [(540, 900), (1080, 1440), (1440, 1980)])
+
+    def test_equal_times_mean_all_day(self):
+        self.assertEqual(weekly_intervals([(MON, time(0), time(0))]), [(0, 1440)])
+
+
+class OpenNowTests(APITestCase):
+    restaurants_url = '/api/v1/restaurants/restaurants/'
+    branches_url = '/api/v1/restaurants/branches/'
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.london = Country.objects.create(name='United Kingdom', code='UK', currency='GBP', timezone='Europe/London')
+        self.tokyo = Country.objects.create(name='Japan', code='JP', currency='JPY', timezone='Asia/Tokyo')
+
+        self.cafe = self.make_branch('London Cafe', self.london)
+        OpeningHours.objects.create(branch=self.cafe, weekday=MON, opens=time(9), closes=time(17))
+        self.bar = self.make_branch('Tokyo Bar', self.tokyo)
+        OpeningHours.objects.create(branch=self.bar, weekday=FRI, opens=time(20), closes=time(3))
+        # Legacy daily hours and no address: read in the server time zone (UTC)
+        self.diner = self.make_branch('Legacy Diner', opening_time=time(8), closing_time=time(10))
+
+    def make_branch(self, name, country=None, **hours):
+        restaurant = Restaurant.objects.create(
+            name=name, owner=self.owner, phone='123', email='r@example.com', is_approved=True
+        )
+        address = None
+        if country:
+            address = Address.objects.create(
+                street_address='1 Main St', city=City.objects.create(name='City', country=country),
+                state='State', postal_code='12345'
+            )
+        return Branch.objects.create(restaurant=restaurant, name=name, phone='123', address=address, **hours)
+
+    def open_at(self, moment):
+        return set(Branch.objects.open_at(moment).values_list('name', flat=True))
+
+    def test_hours_resolved_in_country_timezone(self):
+        # 2026-07-06 is a Monday; London is on BST (UTC+1)
+        self.assertEqual(self.open_at(utc(2026, 7, 6, 8, 0)), {'London Cafe', 'Legacy Diner'})
+        self.assertEqual(self.open_at(utc(2026, 7, 6, 15, 59)), {'London Cafe'})
+        self.assertEqual(self.open_at(utc(2026, 7, 6, 16, 0)), set())
+        # In January London is on GMT, with no recompiling
+        self.assertEqual(self.open_at(utc(2026, 1, 5, 16, 30)), {'London Cafe'})
+        self.assertEqual(self.open_at(utc(2026, 1, 5, 17, 0)), set())
+
+    def test_overnight_hours(self):
+        friday_night = datetime(2026, 7, 10, 23, 30, tzinfo=ZoneInfo('Asia/Tokyo'))
+        saturday_early = datetime(2026, 7, 11, 2, 59, tzinfo=ZoneInfo('Asia/Tokyo'))
+        self.assertIn('Tokyo Bar', self.open_at(friday_night))
+        self.assertIn('Tokyo Bar', self.open_at(saturday_early))
+        self.assertNotIn('Tokyo Bar', self.open_at(saturday_early.replace(hour=3, minute=0)))
+
+    def test_filters_on_both_viewsets(self):
+        response = self.client.get(self.branches_url, {'open_at': '2026-07-06T08:00:00Z'})
+        self.assertEqual({row['name'] for row in response.data['results']}, {'London Cafe', 'Legacy Diner'})
+        response = self.client.get(self.restaurants_url, {'open_at': '2026-07-10T21:00:00+09:00'})
+        self.assertEqual([row['name'] for row in response.data['results']], ['Tokyo Bar'])
+        response = self.client.get(self.restaurants_url, {'open_at': '2026-07-10T21:00:00+09:00', 'open_now': 'false'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.branches_url, {'open_at': 'tonight'}).status_code, 400)
+
+        everything = self.client.get(self.restaurants_url).data['count']
+        open_now = self.client.get(self.restaurants_url, {'open_now': 'true'}).data['count']
+        closed_now = self.client.get(self.restaurants_url, {'open_now': 'false'}).data['count']
+        self.assertEqual(open_now + closed_now, everything)
+
+    def test_intervals_follow_writes(self):
+        monday_noon = utc(2026, 1, 5, 12, 0)
+        hours = self.cafe.opening_hours.get()
+        hours.weekday = SAT
+        hours.save()
+        self.assertNotIn('London Cafe', self.open_at(monday_noon))
+        hours.delete()
+        self.assertFalse(BranchOpenInterval.objects.filter(branch=self.cafe).exists())
+
+        # Moving the diner's legacy hours into a country re-resolves them there
+        self.diner.address = Address.objects.create(
+            street_address='2 Main St', city=City.objects.get(country=self.tokyo), state='State', postal_code='1'
+        )
+        self.diner.save()
+        self.assertEqual(self.open_at(utc(2026, 1, 5, 0, 0)), {'Legacy Diner'})  # 09:00 in Tokyo
+
+        self.tokyo.timezone = 'Europe/London'
+        self.tokyo.save()
+        self.assertEqual(self.open_at(utc(2026, 1, 5, 9, 0)), {'Legacy Diner'})
+
+    def test_deleting_a_branch_leaves_no_intervals(self):
+        # Weekly hours and legacy times: the cascaded hours deletes mustn't fall back to the legacy times
+        for branch in (self.cafe, self.bar):
+            branch.opening_time, branch.closing_time = time(8), time(22)
+            branch.save()
+        ids = [self.cafe.pk, self.bar.pk]
+        self.cafe.delete()
+        self.bar.restaurant.delete()
+        self.assertFalse(BranchOpenInterval.objects.filter(branch_id__in=ids).exists())
+        connection.check_constraints()
+
+    def test_rebuild_command(self):
+        BranchOpenInterval.objects.all().delete()
+        call_command('rebuild_opening_hours', stdout=StringIO())
+        self.assertEqual(self.open_at(utc(2026, 7, 6, 8, 0)), {'London Cafe', 'Legacy Diner'})
@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from apps.common.utils import SingleFlight
+from apps.restaurants.models import Restaurant, Branch
+
+User = get_user_model()
+
+
+class RestaurantListingCacheTests(APITestCase):
+    url = '/api/v1/restaurants/restaurants/'
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        self.admin = User.objects.create_user(email='admin@example.com', password='password123', is_staff=True)
+        self.pizza = Restaurant.objects.create(
+            name='Pizza Place', owner=self.owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        self.pending = Restaurant.objects.create(
+            name='Pending Place', owner=self.owner, phone='123', email='pending@example.com'
+        )
+
+    def names(self, params=None):
+        response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return [restaurant['name'] for restaurant in response.data['results']]
+
+    @override_settings(CACHES=settings.SHARED_CACHES)
+    def test_equivalent_requests_share_a_page(self):
+        self.assertEqual(self.names({'ordering': 'name', 'is_active': 'true'}), ['Pizza Place'])
+        with self.assertNumQueries(4):  # the listing version and the page, per request; nothing is rendered
+            self.assertEqual(self.names({'is_active': 'true', 'ordering': 'name'}), ['Pizza Place'])
+            self.names({'is_active': 'true', 'ordering': 'name'})
+
+    def test_staff_get_their_own_pages(self):
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(sorted(self.names()), ['Pending Place', 'Pizza Place'])
+
+    def test_writes_and_approval_invalidate(self):
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(f'{self.url}{self.pending.pk}/approve/', {'is_approved': True})
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(None)
+        self.assertEqual(sorted(self.names()), ['Pending Place', 'Pizza Place'])
+
+        self.assertEqual(self.names({'search': 'harbour'}), [])
+        Branch.objects.create(restaurant=self.pizza, name='Harbour', phone='1')
+        self.assertEqual(self.names({'search': 'harbour'}), ['Pizza Place'])
+
+        self.pizza.delete()
+        self.assertEqual(self.names(), ['Pending Place'])
+
+    def test_cold_pages_and_details_render_through_single_flight(self):
+        flight = SingleFlight.group('RestaurantViewSet')
+        computed = flight.stats()['computed']
+        self.names()
+        self.names()
+        self.client.get(f'{self.url}{self.pizza.pk}/')
+        self.assertEqual(flight.stats()['computed'], computed + 2)
+
+    def test_clock_dependent_filters_are_not_cached(self):
+        self.names({'open_now': 'false'})
+        with self.assertNumQueries(3):  # time zones, count and page
+            self.names({'open_now': 'false'})
+
+
+
+@override_settings(CACHES=settings.SHARED_CACHES)
+class SharedListingCacheTests(APITestCase):
+    """The listing cache with the backend production processes share (see CACHES)"""
+    url = '/api/v1/restaurants/restaurants/'
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='password123')
+        Restaurant.objects.create(
+            name='Pizza Place', owner=self.owner, phone='123', email='pizza@example.com', is_approved=True
+        )
+        self.flight = SingleFlight.group('RestaurantViewSet')
+
+    def names(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [restaurant['name'] for restaurant in response.data['results']]
+
+    def cache_keys(self, pattern):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT cache_key FROM {settings.CACHE_TABLE} WHERE cache_key LIKE %s', [pattern])
+            return [key.split(':', 2)[2] for key, in cursor.fetchall()]  # without the ":1:" version prefix
+
+    def test_version_and_pages_are_stored_in_the_shared_table(self):
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.assertEqual(self.cache_keys(':1:restaurants:listing:version'), ['restaurants:listing:version'])
+        [page_key] = self.cache_keys(':1:restaurants:listing:%:%')
+        computed = self.flight.stats()['computed']
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.assertEqual(self.flight.stats()['computed'], computed)
+
+        Restaurant.objects.create(
+            name='Burger Bar', owner=self.owner, phone='123', email='burger@example.com', is_approved=True
+        )
+        self.assertEqual(sorted(self.names()), ['Burger Bar', 'Pizza Place'])
+        # Rendered under the bumped version; the old page is never read again and expires
+        [new_key] = set(self.cache_keys(':1:restaurants:listing:%:%')) - {page_key}
+        self.assertNotEqual(new_key.split(':')[2], page_key.split(':')[2])
+
+    def test_waits_for_a_render_in_another_process(self):
+        self.names()
+        [page_key] = self.cache_keys(':1:restaurants:listing:%:%')
+        # Another process is rendering the page; its result (the one just left by this process) is waiting
+        cache.delete(page_key)
+        cache.add(f'singleflight:RestaurantViewSet:{page_key}:lock', 1)
+        self.assertTrue(cache.get(f'singleflight:RestaurantViewSet:{page_key}:result'))
+        stats = self.flight.stats()
+        self.assertEqual(self.names(), ['Pizza Place'])
+        self.assertEqual(self.flight.stats()['computed'], stats['computed'])
+        self.assertEqual(self.flight.stats()['shared'], stats['shared'] + 1)
@@ -56,12 +56,12 @@ class SearchFilterTests(APITestCase):
         # Filter vegetarian
         response = self.client.get(f"{self.menu_items_url}?is_vegetarian=True")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Veggie Pizza')
         
         # Filter non-vegetarian (implicit by exclusion or explicit False)
         response = self.client.get(f"{self.menu_items_url}?is_vegetarian=False")
-        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Meat Lover')
 
     def test_ordering_menu_items(self):
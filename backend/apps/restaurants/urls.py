@@ -2,17 +2,21 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     RestaurantViewSet, BranchViewSet, MenuViewSet, 
-    MenuItemViewSet, CuisineViewSet, CategoryViewSet
+    MenuItemViewSet, CuisineViewSet, CategoryViewSet, DeliveryZoneViewSet,
+    OpeningHoursViewSet, AutocompleteView
 )
 
 router = DefaultRouter()
 router.register(r'restaurants', RestaurantViewSet)
 router.register(r'branches', BranchViewSet)
+router.register(r'opening-hours', OpeningHoursViewSet)
+router.register(r'delivery-zones', DeliveryZoneViewSet)
 router.register(r'menus', MenuViewSet)
 router.register(r'menu-items', MenuItemViewSet)
 router.register(r'cuisines', CuisineViewSet)
 router.register(r'categories', CategoryViewSet)
 
 urlpatterns = [
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
     path('', include(router.urls)),
 ]
@@ -1,13 +1,28 @@
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.http import Http404, HttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Restaurant, Branch, Menu, MenuItem, Cuisine, Category
+from django.core.cache import cache
+from apps.common.mixins import (
+    FlexFieldsViewMixin, SingleFlightMixin, VersionETagMixin, etag_matches, not_modified, version_etag
+)
+from apps.common.serializers import EXPAND_PARAM, FIELDS_PARAM
+from apps.common.search import FullTextSearchFilter
+from .autocomplete import get_index
+from .catalog import CatalogPagination
+from .facets import FACETS_PARAM, menu_item_facets
+from .filters import BranchFilter, MenuItemFilter, RestaurantFilter
+from .listing import listing_cache_key, store_listing
+from .models import Restaurant, Branch, Menu, MenuItem, Cuisine, Category, DeliveryZone, OpeningHours
 from .serializers import (
     RestaurantSerializer, BranchSerializer, MenuSerializer, 
     MenuItemSerializer, CuisineSerializer, CategorySerializer,
-    RestaurantApprovalSerializer
+    RestaurantApprovalSerializer, NearbyBranchSerializer, NearbyQuerySerializer,
+    DeliveryZoneSerializer, OpeningHoursSerializer, AutocompleteQuerySerializer
 )
+from .snapshots import render_menu, store_snapshots
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -15,20 +30,37 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
         return obj.owner == request.user
 
-class RestaurantViewSet(viewsets.ModelViewSet):
+class RestaurantViewSet(FlexFieldsViewMixin, SingleFlightMixin, VersionETagMixin, viewsets.ModelViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'description', 'branches__address__city__name', 'branches__address__street_address']
-    filterset_fields = ['is_active', 'is_approved']
+    # ?search= matches name, description and branch names, streets and cities (see restaurants.search)
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
+    filterset_class = RestaurantFilter
     ordering_fields = ['name', 'created_at']
+    # Concurrent cold reads of a restaurant or a listing page render once
+    single_flight_actions = ('retrieve',)
+
+    def list(self, request, *args, **kwargs):
+        """Pages are cached per audience and parameters (see restaurants.listing)"""
+        key = listing_cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        render = lambda: store_listing(key, super(RestaurantViewSet, self).list(request, *args, **kwargs))
+        return self.collapse(key, render, cross_process=True)
+
+    def get_single_flight_audience(self, request):
+        return 'staff' if request.user.is_staff else 'public'
 
     def get_queryset(self):
-        # Public users only see approved and active restaurants
+        # Public users only see approved and active restaurants; branches are loaded only for ?expand=branches
+        queryset = Restaurant.objects.all()
         if self.request.user.is_staff:
-            return Restaurant.objects.all()
-        return Restaurant.objects.filter(is_approved=True, is_active=True)
+            return queryset
+        return queryset.filter(is_approved=True, is_active=True)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -42,12 +74,23 @@ class RestaurantViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class AutocompleteView(APIView):
+    """Typeahead names for ?q=: restaurants, menu items, cuisines and cities, most popular first"""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        matches = get_index().search(params.validated_data['q'], params.validated_data['limit'])
+        return Response({'results': [{'type': kind, 'id': pk, 'name': name} for kind, pk, name in matches]})
+
 class BranchViewSet(viewsets.ModelViewSet):
     queryset = Branch.objects.all()
     serializer_class = BranchSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     search_fields = ['name', 'restaurant__name', 'address__city__name']
-    filterset_fields = ['branch_type', 'restaurant']
+    filterset_class = BranchFilter
 
     def get_queryset(self):
         if self.request.user.is_staff:
@@ -56,23 +99,97 @@ class BranchViewSet(viewsets.ModelViewSet):
         # TODO: Filter based on branch manager if needed for specific views
         return Branch.objects.filter(restaurant__is_approved=True, restaurant__is_active=True)
 
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Branches within ?radius_km of ?lat/?lng, nearest first"""
+        params = NearbyQuerySerializer(data=request.query_params)
+        if not params.is_valid():
+            return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+        branches = self.get_queryset().nearby(
+            params.validated_data['lat'], params.validated_data['lng'],
+            params.validated_data['radius_km'], params.validated_data['limit'],
+        )
+        return Response(NearbyBranchSerializer(branches, many=True).data)
+
+class OpeningHoursViewSet(viewsets.ModelViewSet):
+    queryset = OpeningHours.objects.all()
+    serializer_class = OpeningHoursSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filterset_fields = ['branch', 'weekday']
+
+class DeliveryZoneViewSet(viewsets.ModelViewSet):
+    queryset = DeliveryZone.objects.all()
+    serializer_class = DeliveryZoneSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filterset_fields = ['branch', 'is_active']
+
 class CategoryViewSet(viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-class MenuViewSet(viewsets.ModelViewSet):
+class MenuViewSet(FlexFieldsViewMixin, SingleFlightMixin, VersionETagMixin, viewsets.ModelViewSet):
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    single_flight_actions = ('retrieve',)
+
+    def get_single_flight_audience(self, request):
+        return None  # every user reads the same menus
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve the menu's stored JSON snapshot in one query, rendering and
+        storing it first when a write has bumped the menu past it. The
+        snapshot is the full document, so ?fields= and ?expand= render live.
+        """
+        params = request.query_params
+        if request.accepted_renderer.format != 'json' or FIELDS_PARAM in params or EXPAND_PARAM in params:
+            return super().retrieve(request, *args, **kwargs)
+        kind = self.get_etag_kind()
+        row = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .filter(**{self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]})
+            .values_list('pk', 'version', 'snapshot__version', 'snapshot__body')
+            .first()
+        )
+        if row is None:
+            raise Http404
+        pk, version, snapshot_version, body = row
+        if etag_matches(request, version_etag(kind, pk, version, request)):
+            return not_modified(version_etag(kind, pk, version, request))
 
-class MenuItemViewSet(viewsets.ModelViewSet):
+        if snapshot_version != version:
+            # A popular menu going cold is rendered once, however many requests (and processes) miss together
+            body, version = self.single_flight(f'snapshot:{pk}:{version}', self.render_snapshot, cross_process=True)
+        response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = version_etag(kind, pk, version, request)
+        return response
+
+    def render_snapshot(self):
+        menu = self.get_object()
+        body = render_menu(menu)
+        store_snapshots([menu], [body])
+        return body, menu.version
+
+class MenuItemViewSet(FlexFieldsViewMixin, viewsets.ModelViewSet):
     queryset = MenuItem.objects.all()
     serializer_class = MenuItemSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    search_fields = ['name', 'description', 'category__name']
-    filterset_fields = ['category', 'cuisine', 'is_vegetarian', 'is_vegan', 'is_gluten_free', 'is_available']
+    # ?search= matches name, description, category, cuisine and ingredients
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
+    filterset_class = MenuItemFilter
     ordering_fields = ['price', 'name']
+    # Relevance-ranked searches fall back to page numbers; with MENU_CATALOG_ENGINE on, pages come from NumPy columns
+    pagination_class = CatalogPagination
+
+    def list(self, request, *args, **kwargs):
+        """?facets=true adds counts per filter value for the current filters and search"""
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get(FACETS_PARAM, '').lower() in ('1', 'true'):
+            response.data['facets'] = menu_item_facets(self, request)
+        return response
 
 class CuisineViewSet(viewsets.ModelViewSet):
     queryset = Cuisine.objects.all()
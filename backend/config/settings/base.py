@@ -59,10 +59,78 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
+# Shared cache: idempotency keys, version stamps, cached pages and cross-process locks
+# must be visible to every worker, so never a process-local backend outside tests.
+# The database backend works out of the box (its table is created by the common app's
+# migrations); set CACHE_REDIS_URL to use Redis instead.
+CACHE_TABLE = 'django_cache'
+CACHE_REDIS_URL = config("CACHE_REDIS_URL", default="")
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': CACHE_TABLE,
+            'OPTIONS': {'MAX_ENTRIES': 100000},  # culling drops arbitrary keys, idempotency records included
+        }
+    }
+
 # JWT Configuration
 JWT_ACCESS_TOKEN_LIFETIME = 15  # minutes
 JWT_REFRESH_TOKEN_LIFETIME = 7  # days
 
+# Authenticated user cache (process-local)
+JWT_USER_CACHE_TTL = config("JWT_USER_CACHE_TTL", default=60, cast=int)  # seconds, 0 disables
+JWT_USER_CACHE_SIZE = 10000
+JWT_DISABLED_CHECK_INTERVAL = 1  # seconds between reads of the shared deactivation stamp, per process
+JWT_CLAIMS_ONLY_AUTH = config("JWT_CLAIMS_ONLY_AUTH", default=False, cast=bool)  # GET/HEAD/OPTIONS only
+JWT_DECODE_CACHE_SIZE = 50000  # verified token payloads kept in memory
+
+# Compiled role-permission matrix; rebuilt on a version bump, and at the latest after this long
+PERMISSION_MATRIX_MAX_AGE = 60  # seconds
+PERMISSION_MATRIX_VERSION_CHECK_INTERVAL = 1  # seconds between reads of the shared version, per process
+
+# Idempotency-Key handling for retried POSTs
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24  # seconds a completed response is replayable
+IDEMPOTENCY_LOCK_TIMEOUT = 30  # seconds a duplicate waits for the first request
+IDEMPOTENCY_POLL_INTERVAL = 0.05
+
+# Proximity search (geohash prefilter + haversine)
+NEARBY_DEFAULT_RADIUS_KM = 5
+NEARBY_MAX_RADIUS_KM = 50
+NEARBY_MAX_RESULTS = 100
+DELIVERY_ZONE_CELL_PRECISION = 6  # geohash length of zone cells, about 1.2km x 0.6km
+DELIVERY_ZONE_MAX_CELLS = 4096  # larger zones fall back to coarser cells
+
+# Menu item facet counts, also invalidated by menu item writes
+MENU_FACETS_CACHE_TTL = 300  # seconds
+
+# In-process NumPy columns for menu item lists (optional; needs numpy installed)
+MENU_CATALOG_ENGINE = config("MENU_CATALOG_ENGINE", default=False, cast=bool)
+MENU_CATALOG_SYNC_INTERVAL = 1.0  # seconds between change feed polls
+MENU_CATALOG_MAX_AGE = 3600  # seconds before a full reload
+
+# In-process autocomplete index; other processes' writes are picked up by a rebuild
+AUTOCOMPLETE_REBUILD_INTERVAL = 30  # seconds, at most one rebuild per process per interval
+AUTOCOMPLETE_MAX_AGE = 3600  # seconds before a rebuild refreshes popularity
+
+# Restaurant listing pages, also invalidated by restaurant and branch writes
+RESTAURANT_LIST_CACHE_TTL = 300  # seconds
+
+# Request coalescing (apps.common.utils.singleflight)
+SINGLE_FLIGHT_WAIT = 5  # seconds a duplicate waits for the computation already running
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05  # between checks for another process's result
+SINGLE_FLIGHT_RESULT_TTL = 2  # seconds a result stays readable by other processes' waiters
+
+# Bump to invalidate every client-held ETag when a response format changes
+ETAG_NAMESPACE = config("ETAG_NAMESPACE", default="v1")
+
 
 # Logging Configuration
 LOGGING = {
@@ -11,8 +11,33 @@ DATABASES = {
     }
 }
 
+# Process-local by default; tests of cross-process behaviour and query counts
+# switch to SHARED_CACHES, the production default, so cache round trips count
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': CACHE_TABLE,
+    }
+}
+
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
 
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+SECURE_COOKIES = False
+
+# Console only: logs/ is not part of a checkout
+LOGGING = {
+    **LOGGING,
+    'handlers': {'console': LOGGING['handlers']['console']},
+    'loggers': {
+        name: {**logger, 'handlers': ['console']} for name, logger in LOGGING['loggers'].items()
+    },
+}
@@ -16,11 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from apps.common.views import HealthCheckView
+from apps.common.views import HealthCheckView, SingleFlightStatsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('health/single-flight/', SingleFlightStatsView.as_view(), name='single-flight-stats'),
     path('api/v1/auth/', include('apps.accounts.urls')),
     path('api/v1/locations/', include('apps.locations.urls')),
 